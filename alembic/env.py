@@ -17,7 +17,9 @@ if config.config_file_name is not None:
 # Import your models (ensure that Base is imported too)
 from app.database import engine, Base
 from app.models.AI.ModelDetails import ModelDetails
+from app.models.AI.training_job import TrainingJob
 from app.models.files.data_file import DataFile
+from app.models.files.person_row_index import PersonRowIndex
 from app.models.files.exam_info import ExamDetails
 from app.models.job_performance.job_performance import JobPerformance
 
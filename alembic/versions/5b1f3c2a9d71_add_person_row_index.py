@@ -0,0 +1,47 @@
+"""Add person row index for exam feature files
+
+Revision ID: 5b1f3c2a9d71
+Revises: 913157e4d498
+Create Date: 2026-10-18 10:12:31.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1f3c2a9d71'
+down_revision: Union[str, None] = '913157e4d498'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'data_files',
+        sa.Column('row_index_built', sa.Boolean(), nullable=False, server_default=sa.false())
+    )
+    op.create_table(
+        'person_row_index',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('exam_id', sa.Integer(), nullable=False),
+        sa.Column('person_id', sa.Integer(), nullable=False),
+        sa.Column('data_file_id', sa.Integer(), nullable=False),
+        sa.Column('jalali_year', sa.Integer(), nullable=False),
+        sa.Column('row_number', sa.Integer(), nullable=False),
+        sa.Column('byte_offset', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(['exam_id'], ['exam_details.id']),
+        sa.ForeignKeyConstraint(['data_file_id'], ['data_files.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('exam_id', 'person_id', name='_exam_person_uc')
+    )
+    op.create_index(op.f('ix_person_row_index_id'), 'person_row_index', ['id'], unique=False)
+    # Existing files are indexed with scripts/rebuild_person_index.py
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_person_row_index_id'), table_name='person_row_index')
+    op.drop_table('person_row_index')
+    op.drop_column('data_files', 'row_index_built')
@@ -0,0 +1,46 @@
+"""Add training jobs table
+
+Revision ID: 7c2e4d9a1b38
+Revises: 5b1f3c2a9d71
+Create Date: 2026-10-18 11:04:52.918374
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e4d9a1b38'
+down_revision: Union[str, None] = '5b1f3c2a9d71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'training_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('model_name', sa.String(), nullable=False),
+        sa.Column('name_object_predict', sa.String(), nullable=False),
+        sa.Column('performance_metric', sa.String(), nullable=False),
+        sa.Column('num_classes', sa.Integer(), nullable=False),
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('exam_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('model_details_id', sa.Integer(), nullable=True),
+        sa.Column('error', sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(['exam_id'], ['exam_details.id']),
+        sa.ForeignKeyConstraint(['model_details_id'], ['model_details.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_training_jobs_id'), 'training_jobs', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_training_jobs_id'), table_name='training_jobs')
+    op.drop_table('training_jobs')
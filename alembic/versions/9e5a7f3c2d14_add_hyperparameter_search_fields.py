@@ -0,0 +1,34 @@
+"""Add hyperparameter search fields to training jobs and model details
+
+Revision ID: 9e5a7f3c2d14
+Revises: 7c2e4d9a1b38
+Create Date: 2026-10-18 12:21:07.553190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e5a7f3c2d14'
+down_revision: Union[str, None] = '7c2e4d9a1b38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('training_jobs', sa.Column('search_strategy', sa.String(), nullable=True))
+    op.add_column('training_jobs', sa.Column('search_n_iter', sa.Integer(), nullable=False, server_default='10'))
+    op.add_column('training_jobs', sa.Column('search_time_budget', sa.Float(), nullable=True))
+    op.add_column('model_details', sa.Column('search_strategy', sa.String(), nullable=True))
+    op.add_column('model_details', sa.Column('search_n_fits', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('model_details', 'search_n_fits')
+    op.drop_column('model_details', 'search_strategy')
+    op.drop_column('training_jobs', 'search_time_budget')
+    op.drop_column('training_jobs', 'search_n_iter')
+    op.drop_column('training_jobs', 'search_strategy')
@@ -0,0 +1,29 @@
+"""Index model_details for paginated searches
+
+Revision ID: a9d4e2b7c815
+Revises: f3c8a1d5b702
+Create Date: 2026-10-18 19:12:40.517203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d4e2b7c815'
+down_revision: Union[str, None] = 'f3c8a1d5b702'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_model_details_exam_id_job_id_evaluation_date', 'model_details',
+        ['exam_id', 'job_id', 'model_evaluation_date'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_model_details_exam_id_job_id_evaluation_date', table_name='model_details')
@@ -0,0 +1,74 @@
+"""Add stored Jalali year and composite indexes to job performance and data files
+
+Revision ID: b4d81e6f0a27
+Revises: 9e5a7f3c2d14
+Create Date: 2026-10-18 13:40:18.226901
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from khayyam import JalaliDatetime
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4d81e6f0a27'
+down_revision: Union[str, None] = '9e5a7f3c2d14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+
+
+def backfill_jalali_year(table_name: str) -> None:
+    """Fill jalali_year from created_at for every existing row, in batches."""
+    connection = op.get_bind()
+    table = sa.table(
+        table_name,
+        sa.column('id', sa.Integer),
+        sa.column('created_at', sa.DateTime),
+        sa.column('jalali_year', sa.Integer),
+    )
+    update = (
+        table.update()
+        .where(table.c.id == sa.bindparam('row_id'))
+        .values(jalali_year=sa.bindparam('year'))
+    )
+
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(table.c.id, table.c.created_at)
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        connection.execute(update, [
+            {'row_id': row.id, 'year': JalaliDatetime(row.created_at).year} for row in rows
+        ])
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    for table_name in ('job_performance', 'data_files'):
+        op.add_column(table_name, sa.Column('jalali_year', sa.Integer(), nullable=True))
+        backfill_jalali_year(table_name)
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.alter_column('jalali_year', existing_type=sa.Integer(), nullable=False)
+
+    op.create_index('ix_job_performance_job_id_jalali_year', 'job_performance', ['job_id', 'jalali_year'], unique=False)
+    op.create_index('ix_job_performance_person_id_jalali_year', 'job_performance', ['person_id', 'jalali_year'], unique=False)
+    op.create_index('ix_data_files_exam_id_jalali_year', 'data_files', ['exam_id', 'jalali_year'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_data_files_exam_id_jalali_year', table_name='data_files')
+    op.drop_index('ix_job_performance_person_id_jalali_year', table_name='job_performance')
+    op.drop_index('ix_job_performance_job_id_jalali_year', table_name='job_performance')
+    with op.batch_alter_table('data_files') as batch_op:
+        batch_op.drop_column('jalali_year')
+    with op.batch_alter_table('job_performance') as batch_op:
+        batch_op.drop_column('jalali_year')
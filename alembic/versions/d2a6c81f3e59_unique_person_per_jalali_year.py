@@ -0,0 +1,41 @@
+"""Enforce one job performance record per person per Jalali year
+
+Revision ID: d2a6c81f3e59
+Revises: b4d81e6f0a27
+Create Date: 2026-10-18 15:02:47.519330
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a6c81f3e59'
+down_revision: Union[str, None] = 'b4d81e6f0a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    duplicates = op.get_bind().execute(sa.text(
+        "SELECT person_id, jalali_year, COUNT(*) FROM job_performance "
+        "GROUP BY person_id, jalali_year HAVING COUNT(*) > 1 LIMIT 10"
+    )).all()
+    if duplicates:
+        examples = ', '.join(f"person {row[0]} in {row[1]} ({row[2]} rows)" for row in duplicates)
+        raise RuntimeError(
+            f"job_performance has several records for the same person and Jalali year: {examples}. "
+            "Remove the extra records before upgrading."
+        )
+
+    op.drop_index('ix_job_performance_person_id_jalali_year', table_name='job_performance')
+    with op.batch_alter_table('job_performance') as batch_op:
+        batch_op.create_unique_constraint('_person_jalali_year_uc', ['person_id', 'jalali_year'])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('job_performance') as batch_op:
+        batch_op.drop_constraint('_person_jalali_year_uc', type_='unique')
+    op.create_index('ix_job_performance_person_id_jalali_year', 'job_performance', ['person_id', 'jalali_year'], unique=False)
@@ -0,0 +1,30 @@
+"""Add size and SHA-256 of stored data files
+
+Revision ID: e7b3f9a2c461
+Revises: d2a6c81f3e59
+Create Date: 2026-10-18 16:21:05.804113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b3f9a2c461'
+down_revision: Union[str, None] = 'd2a6c81f3e59'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Files uploaded before this revision are hashed by scripts/rebuild_person_index.py
+    op.add_column('data_files', sa.Column('size_bytes', sa.BigInteger(), nullable=True))
+    op.add_column('data_files', sa.Column('sha256', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('data_files') as batch_op:
+        batch_op.drop_column('sha256')
+        batch_op.drop_column('size_bytes')
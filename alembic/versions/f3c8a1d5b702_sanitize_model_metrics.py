@@ -0,0 +1,102 @@
+"""Store model metrics as clean JSON
+
+Revision ID: f3c8a1d5b702
+Revises: e7b3f9a2c461
+Create Date: 2026-10-18 18:04:12.310527
+
+"""
+import math
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.public_method import sanitize_value
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c8a1d5b702'
+down_revision: Union[str, None] = 'e7b3f9a2c461'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+METRIC_COLUMNS = (
+    'accuracy_results',
+    'f1_score_results',
+    'precision_results',
+    'recall_results',
+    't_test_results_accuracy',
+    't_test_results_f1_score',
+)
+CONFIDENCE_COLUMNS = ('confidence_level_accuracy', 'confidence_level_f1_score')
+
+
+def _clean_confidence(value):
+    if value is not None and (math.isnan(value) or math.isinf(value)):
+        return None
+    return value
+
+
+def sanitize_model_metrics() -> None:
+    """
+    Rewrites metrics stored before ModelDetails.add_record sanitized them: stringified dicts
+    such as "{'mean': np.float64(0.8)}" become JSON objects and NaN/inf become null.
+    Only rows that change are updated.
+    """
+    connection = op.get_bind()
+    table = sa.table(
+        'model_details',
+        sa.column('id', sa.Integer),
+        *(sa.column(name, sa.JSON) for name in METRIC_COLUMNS),
+        *(sa.column(name, sa.Float) for name in CONFIDENCE_COLUMNS),
+    )
+    update = (
+        table.update()
+        .where(table.c.id == sa.bindparam('row_id'))
+        .values({name: sa.bindparam(f'new_{name}') for name in METRIC_COLUMNS + CONFIDENCE_COLUMNS})
+    )
+
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(table)
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+
+        changed = []
+        for row in rows:
+            stored = row._asdict()
+            cleaned = {name: sanitize_value(stored[name]) for name in METRIC_COLUMNS}
+            cleaned.update({name: _clean_confidence(stored[name]) for name in CONFIDENCE_COLUMNS})
+            # NaN != NaN, so a NaN confidence level always counts as changed
+            if any(cleaned[name] != stored[name] for name in cleaned):
+                changed.append({'row_id': row.id, **{f'new_{name}': value for name, value in cleaned.items()}})
+        if changed:
+            connection.execute(update, changed)
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    # An undefined t-test (constant scores) gives a NaN confidence level, now stored as NULL
+    with op.batch_alter_table('model_details') as batch_op:
+        for name in CONFIDENCE_COLUMNS:
+            batch_op.alter_column(name, existing_type=sa.Float(), nullable=True)
+    sanitize_model_metrics()
+
+
+def downgrade() -> None:
+    # The cleaned metrics are kept: they are valid input for the previous revision too
+    op.execute(sa.text(
+        "UPDATE model_details SET "
+        "confidence_level_accuracy = COALESCE(confidence_level_accuracy, 0), "
+        "confidence_level_f1_score = COALESCE(confidence_level_f1_score, 0)"
+    ))
+    with op.batch_alter_table('model_details') as batch_op:
+        for name in CONFIDENCE_COLUMNS:
+            batch_op.alter_column(name, existing_type=sa.Float(), nullable=False)
@@ -78,10 +78,18 @@ def mock_make_dataset(monkeypatch):
 
     monkeypatch.setattr(
         # "app.services.pre_processing_data_service.make_dataset",
-        "app.api.model.make_dataset",
+        "app.services.training_job_service.make_dataset",
         fake_make_dataset
     )
 
+
+@pytest.fixture
+def run_training_inline(monkeypatch):
+    """Run submitted training jobs in the test process instead of the worker pool."""
+    from app.services.training_job_service import training_job_pool, run_training_job
+
+    monkeypatch.setattr(training_job_pool, "submit", run_training_job)
+
 # --- Test Client ---
 client = TestClient(app)
 
@@ -93,8 +101,8 @@ client = TestClient(app)
     "/model/train_job_performance",
 ])
 @pytest.mark.parametrize("model_name_enum", list(ModelName))
-def test_train_routes_success(endpoint, model_name_enum, mock_make_dataset):
-    """Ensure each train endpoint returns 200 and triggers real train_model."""
+def test_train_routes_success(endpoint, model_name_enum, mock_make_dataset, run_training_inline):
+    """Ensure each train endpoint queues a job that runs the real train_model."""
     payload = {
         "job_id": 1,
         "exam_id": 1,
@@ -102,8 +110,20 @@ def test_train_routes_success(endpoint, model_name_enum, mock_make_dataset):
         "num_classes": 3
     }
     response = client.post(endpoint, json=payload)
-    assert response.status_code == status.HTTP_200_OK
-    assert response.json() == {"message": "Model trained and saved successfully"}
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    body = response.json()
+    assert body["message"] == "Training job submitted"
+
+    job_response = client.get(f"/model/train_jobs/{body['training_job_id']}")
+    assert job_response.status_code == status.HTTP_200_OK
+    job = job_response.json()
+    assert job["status"] == "done"
+    assert job["model_details_id"] is not None
+
+
+def test_unknown_training_job():
+    response = client.get("/model/train_jobs/999999")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
 
 def test_invalid_model_name(mock_make_dataset):
     """Passing an invalid model_name should result in a 422 validation error."""
@@ -4,6 +4,7 @@ from app.models.files.data_file import DataFile
 from app.models.files.exam_info import ExamDetails
 from typing import List, Dict, Union
 from app.database import get_db
+from app.utils.executors import io_executor
 
 router = APIRouter()
 
@@ -20,7 +21,7 @@ async def upload_file(
     """
     try:
         # Call the DataFile class method to handle file upload and save
-        data_file = DataFile.add_file(db, file, exam_id, created_at)
+        data_file = await io_executor.run(DataFile.add_file, db, file, exam_id, created_at)
 
         return {"message": "File uploaded successfully", "data_file_id": data_file.id}
 
@@ -58,7 +59,7 @@ async def add_exam(
     """
     try:
         # Call the class method to add the exam
-        new_exam = ExamDetails.add_exam(db, title, creator_name, description)
+        new_exam = await io_executor.run(ExamDetails.add_exam, db, title, creator_name, description)
 
         return {
             "message": "Exam added successfully",
@@ -80,7 +81,7 @@ async def get_exam_id_name(db: Session = Depends(get_db)) -> Dict[str, Union[str
     """
     try:
         # Call the class method to retrieve the list of exams
-        exams = ExamDetails.get_exam_list(db)
+        exams = await io_executor.run(ExamDetails.get_exam_list, db)
 
     except Exception as e:
         print(str(e))
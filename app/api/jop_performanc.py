@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status,Query
+from fastapi import APIRouter, Depends, HTTPException, Request, status,Query
 from sqlalchemy.orm import Session
-from typing import List, Dict, Union
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, List, Dict, Union
 from khayyam import JalaliDatetime
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.models.job_performance.job_performance import JobPerformance
+from app.services.job_performance_ingest_service import ingest_performances, parse_performance_csv
+from app.utils.executors import io_executor
 from app.utils.public_method import number_validation
 
 router = APIRouter()
@@ -48,31 +51,60 @@ def add_job_performance(
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
+@router.post("/bulk", response_model=Dict[str, Any])
+async def bulk_add_job_performance(request: Request, db: Session = Depends(get_db)):
+    """
+    Add or update many job performance records at once.
+
+    Accepts a JSON array of records, a text/csv body or a multipart form with a CSV "file",
+    each with the fields of /add.  Valid rows are upserted in one transaction (an existing
+    record of the same person and Jalali year is replaced); invalid rows are reported by
+    their position in the input.
+    """
+    content_type = request.headers.get("content-type", "")
+    try:
+        if content_type.startswith("multipart/form-data"):
+            form = await request.form()
+            upload = form.get("file")
+            if upload is None or isinstance(upload, str):
+                raise ValueError("Multipart body must contain a CSV 'file'.")
+            records = parse_performance_csv(await upload.read())
+        elif "csv" in content_type:
+            records = parse_performance_csv(await request.body())
+        else:
+            records = await request.json()
+            if not isinstance(records, list) or not all(isinstance(record, dict) for record in records):
+                raise ValueError("JSON body must be an array of records.")
+
+        return await io_executor.run(ingest_performances, db, records)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
 @router.get("/performance/{job_id}/{metric}", response_model=Dict[int, List[Dict[str, Union[int, float]]]])
-def get_performance_by_job(
-    job_id: int, metric: str, db: Session = Depends(get_db)
+async def get_performance_by_job(
+    job_id: int, metric: str, db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get job performance data by job ID, grouped by Persian calendar year.
     """
     try:
-        return JobPerformance.get_performance_by_job_and_date(db, job_id, metric)
+        return await JobPerformance.get_performance_by_job_and_date_async(db, job_id, metric)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.get("/performance_jobs", response_model=Dict[int, List[Dict[str, Union[int, float]]]])
-def get_performance_by_jobs(
+async def get_performance_by_jobs(
     performance_metric: str, 
     job_ids: Dict[str, List[int]], 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get job performance data by multiple job IDs, grouped by Persian calendar year.
     """
     try:
         list_job_ids = job_ids.get("list_job_ids", [])
-        return JobPerformance.get_performance_by_jobs_and_date(db, list_job_ids, performance_metric)
+        return await JobPerformance.get_performance_by_jobs_and_date_async(db, list_job_ids, performance_metric)
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -1,14 +1,18 @@
 from fastapi import APIRouter, HTTPException, status, Depends
-from app.database import get_db
+from app.database import get_db, get_async_db
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.models.AI import svm, xgboost_model, LSTM, MLP, decision_tree
-from app.services.prediction_service import predict_job_utils
-from app.services.pre_processing_data_service import make_dataset
-from app.services.train_service import train_model
-from app.utils.train_helper_method import ModelName
+from app.models.AI.training_job import TrainingJob
+from app.services.prediction_service import predict_job_utils, predict_job_batch_utils
+from app.services.training_job_service import training_job_pool
+from app.utils.train_helper_method import ModelName, SearchStrategy
 from app.models.files.data_file import DataFile
-from app.utils.predict_helper_method import find_person_feature_last_exam
-from pydantic import BaseModel
+from app.utils.predict_helper_method import find_person_feature_in_exam, find_persons_feature_last_exam, model_loads, person_lookups
+from app.utils.model_cache import model_cache
+from app.utils.prediction_batcher import prediction_batcher
+from app.utils.executors import io_executor, cpu_executor
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
 from app.logger import logger  # ✅ اضافه کردن لاگر
 import os
 
@@ -23,92 +27,95 @@ class TrainRequest(BaseModel):
     exam_id: int
     model_name: ModelName
     num_classes: int
+    search_strategy: Optional[SearchStrategy] = None  # None trains with default parameters
+    search_n_iter: int = Field(10, ge=1)  # Candidates tried by the randomized search
+    search_time_budget: Optional[float] = Field(None, ge=0)  # Seconds per search, 0 = no limit
 
-@router.post("/train_job_satisfaction", status_code=status.HTTP_200_OK)
-async def train_job_satisfaction(request: TrainRequest, db: Session = Depends(get_db)):    
-    logger.info(f"Start training job satisfaction model: {request.model_name}")
-    job_id, exam_id, model_name, num_classes = request.job_id, request.exam_id, request.model_name, request.num_classes
-
-    X, Y = make_dataset(job_id, exam_id, 'satisfaction_score', db)
-    base_directory_model = UPLOAD_DIR
-
-    if model_name == ModelName.SVM:
-        model = svm.SVMModel
-    elif model_name == ModelName.XgBoost:
-        model = xgboost_model.XGBoostModel
-    elif model_name == ModelName.MLP:
-        model = MLP.MLPModel
-    elif model_name == ModelName.DecisionTree:
-        model = decision_tree.DecisionTreeModel
-    else:
-        raise HTTPException(status_code=400, detail="Unsupported model")
-
-    train_model(model, X, Y, job_id, exam_id, base_directory_model, num_classes, "satisfaction_score", db)
-    logger.info("Training complete for job satisfaction.")
-    return {"message": "Model trained and saved successfully"}
-
-
-@router.post("/train_job_improvement", status_code=status.HTTP_200_OK)
-async def train_job_improvement(request: TrainRequest, db: Session = Depends(get_db)):    
-    logger.info(f"Start training job improvement model: {request.model_name}")
-    job_id, exam_id, model_name, num_classes = request.job_id, request.exam_id, request.model_name, request.num_classes
-
-    X, Y = make_dataset(job_id, exam_id, 'improvement_rank', db)
-    base_directory_model = UPLOAD_DIR
-
-    if model_name == ModelName.SVM:
-        model = svm.SVMModel
-    elif model_name == ModelName.XgBoost:
-        model = xgboost_model.XGBoostModel
-    elif model_name == ModelName.MLP:
-        model = MLP.MLPModel
-    elif model_name == ModelName.DecisionTree:
-        model = decision_tree.DecisionTreeModel
-    else:
-        raise HTTPException(status_code=400, detail="Unsupported model")
-
-    train_model(model, X, Y, job_id, exam_id, base_directory_model, num_classes, "job_improvement", db)
-    logger.info("Training complete for job improvement.")
-    return {"message": "Model trained and saved successfully"}
-
-
-@router.post("/train_job_performance", status_code=status.HTTP_200_OK)
-async def train_job_performance(request: TrainRequest, db: Session = Depends(get_db)):  
-    logger.info(f"Start training job performance model: {request.model_name}")
-    job_id, exam_id, model_name, num_classes = request.job_id, request.exam_id, request.model_name, request.num_classes
-
-    X, Y = make_dataset(job_id, exam_id, 'job_efficiency_rank', db)
-    base_directory_model = UPLOAD_DIR
-
-    if model_name == ModelName.SVM:
-        model = svm.SVMModel
-    elif model_name == ModelName.XgBoost:
-        model = xgboost_model.XGBoostModel
-    elif model_name == ModelName.MLP:
-        model = MLP.MLPModel
-    elif model_name == ModelName.DecisionTree:
-        model = decision_tree.DecisionTreeModel
-    else:
-        raise HTTPException(status_code=400, detail="Unsupported model")
-
-    train_model(model, X, Y, job_id, exam_id, base_directory_model, num_classes, "job_performance", db)
-    logger.info("Training complete for job performance.")
-    return {"message": "Model trained and saved successfully"}
+
+class BatchPredictRequest(BaseModel):
+    model_id: int
+    exam_id: int
+    object_predict: Literal["satisfaction_score", "job_improvement", "job_performance"]
+    person_ids: Optional[List[int]] = None  # None scores every person in the exam
+
+async def predict_one_person(name_object_predict: str, person_data: dict, model_id: int, db: Session) -> str:
+    """
+    Runs a single-person prediction, grouped with concurrent ones for the same model when
+    PREDICTION_BATCHING is on.
+    """
+    if prediction_batcher.enabled:
+        return await prediction_batcher.predict(name_object_predict, person_data, model_id)
+    return await cpu_executor.run(predict_job_utils, name_object_predict, person_data, model_id, db)
+
+
+def submit_training_job(request: TrainRequest, name_object_predict: str, performance_metric: str, db: Session) -> dict:
+    """
+    Registers a queued TrainingJob and hands it to the training worker pool.
+    """
+    training_job = TrainingJob.create(
+        db, request.model_name.value, name_object_predict, performance_metric,
+        request.num_classes, request.job_id, request.exam_id,
+        search_strategy=request.search_strategy.value if request.search_strategy else None,
+        search_n_iter=request.search_n_iter,
+        search_time_budget=request.search_time_budget
+    )
+    if not training_job_pool.submit(training_job.id, UPLOAD_DIR):
+        logger.error("Training job %s could not be queued", training_job.id)
+        return {"message": "Training job failed to start", "training_job_id": training_job.id, "status": TrainingJob.STATUS_FAILED}
+    logger.info("Training job %s queued for %s (%s)", training_job.id, name_object_predict, request.model_name)
+    return {"message": "Training job submitted", "training_job_id": training_job.id, "status": training_job.status}
+
+
+@router.post("/train_job_satisfaction", status_code=status.HTTP_202_ACCEPTED)
+async def train_job_satisfaction(request: TrainRequest, db: Session = Depends(get_db)):
+    logger.info("Start training job satisfaction model: %s", request.model_name)
+    return await io_executor.run(submit_training_job, request, "satisfaction_score", "satisfaction_score", db)
+
+
+@router.post("/train_job_improvement", status_code=status.HTTP_202_ACCEPTED)
+async def train_job_improvement(request: TrainRequest, db: Session = Depends(get_db)):
+    logger.info("Start training job improvement model: %s", request.model_name)
+    return await io_executor.run(submit_training_job, request, "job_improvement", "improvement_rank", db)
+
+
+@router.post("/train_job_performance", status_code=status.HTTP_202_ACCEPTED)
+async def train_job_performance(request: TrainRequest, db: Session = Depends(get_db)):
+    logger.info("Start training job performance model: %s", request.model_name)
+    return await io_executor.run(submit_training_job, request, "job_performance", "job_efficiency_rank", db)
+
+
+@router.get("/train_jobs/{training_job_id}", status_code=status.HTTP_200_OK)
+async def get_training_job_status(training_job_id: int, db: Session = Depends(get_db)):
+    """
+    Report the state of a background training job and, once done, the ID of its model.
+    """
+    training_job = await io_executor.run(TrainingJob.find_by_id, db, training_job_id)
+    if not training_job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Training job not found")
+
+    return {
+        "training_job_id": training_job.id,
+        "status": training_job.status,
+        "model_name": training_job.model_name,
+        "object_predict": training_job.name_object_predict,
+        "elapsed_seconds": training_job.elapsed_seconds(),
+        "model_details_id": training_job.model_details_id,
+        "error": training_job.error,
+    }
 
 
 @router.get("/predict_job_satisfaction", status_code=status.HTTP_200_OK)
 async def predict_one_person_job_satisfaction(person_id: int, model_id: int, exam_id: int, db: Session = Depends(get_db)):
-    files_by_year = DataFile.get_files_by_exam_id(db, exam_id)
-    person_data, found = find_person_feature_last_exam(person_id, files_by_year)
+    person_data, found = await io_executor.run(find_person_feature_in_exam, db, exam_id, person_id)
 
     if not found:
-        logger.warning(f"Person {person_id} not found in exam {exam_id}")
+        logger.warning("Person %s not found in exam %s", person_id, exam_id)
         return {"message": "Prediction failed", "result": "This person didn't participate in this exam before."}
 
     try:
-        result = predict_job_utils("satisfaction_score", person_data, model_id, db)
+        result = await predict_one_person("satisfaction_score", person_data, model_id, db)
     except ValueError as ve:
-        logger.error(f"Validation error: {ve}")
+        logger.error("Validation error: %s", ve)
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"Validation error: {str(ve)}")
     except Exception:
         logger.exception("Prediction error in predict_job_satisfaction")
@@ -119,17 +126,16 @@ async def predict_one_person_job_satisfaction(person_id: int, model_id: int, exa
 
 @router.get("/predict_job_improvement", status_code=status.HTTP_200_OK)
 async def predict_one_person_job_improvement(person_id: int, model_id: int, exam_id: int, db: Session = Depends(get_db)):
-    files_by_year = DataFile.get_files_by_exam_id(db, exam_id)
-    person_data, found = find_person_feature_last_exam(person_id, files_by_year)
+    person_data, found = await io_executor.run(find_person_feature_in_exam, db, exam_id, person_id)
 
     if not found:
-        logger.warning(f"Person {person_id} not found in exam {exam_id}")
+        logger.warning("Person %s not found in exam %s", person_id, exam_id)
         return {"message": "Prediction failed", "result": "This person didn't participate in this exam before."}
 
     try:
-        result = predict_job_utils("job_improvement", person_data, model_id, db)
+        result = await predict_one_person("job_improvement", person_data, model_id, db)
     except ValueError as ve:
-        logger.error(f"Validation error: {ve}")
+        logger.error("Validation error: %s", ve)
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"Validation error: {str(ve)}")
     except Exception:
         logger.exception("Prediction error in predict_job_improvement")
@@ -140,20 +146,68 @@ async def predict_one_person_job_improvement(person_id: int, model_id: int, exam
 
 @router.get("/predict_job_performance", status_code=status.HTTP_200_OK)
 async def predict_one_person_job_performance(person_id: int, model_id: int, exam_id: int, db: Session = Depends(get_db)):
-    files_by_year = DataFile.get_files_by_exam_id(db, exam_id)
-    person_data, found = find_person_feature_last_exam(person_id, files_by_year)
+    person_data, found = await io_executor.run(find_person_feature_in_exam, db, exam_id, person_id)
 
     if not found:
-        logger.warning(f"Person {person_id} not found in exam {exam_id}")
+        logger.warning("Person %s not found in exam %s", person_id, exam_id)
         return {"message": "Prediction failed", "result": "This person didn't participate in this exam before."}
 
     try:
-        result = predict_job_utils("job_performance", person_data, model_id, db)
+        result = await predict_one_person("job_performance", person_data, model_id, db)
     except ValueError as ve:
-        logger.error(f"Validation error: {ve}")
+        logger.error("Validation error: %s", ve)
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"Validation error: {str(ve)}")
     except Exception:
         logger.exception("Prediction error in predict_job_performance")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Prediction error occurred.")
 
     return {"message": "Prediction successful", "result": result}
+
+
+@router.post("/predict_batch", status_code=status.HTTP_200_OK)
+async def predict_batch(
+    request: BatchPredictRequest,
+    db: Session = Depends(get_db),
+    async_db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Predict for many persons (or every person in the exam) with a single model call.
+    """
+    files_by_year = await DataFile.get_files_by_exam_id_async(async_db, request.exam_id)
+    persons_df, not_found = await io_executor.run(find_persons_feature_last_exam, request.person_ids, files_by_year)
+
+    if persons_df.empty:
+        logger.warning("No requested person found in exam %s", request.exam_id)
+        return {"message": "Prediction failed", "results": {}, "not_found": not_found}
+
+    try:
+        results = await cpu_executor.run(predict_job_batch_utils, request.object_predict, persons_df, request.model_id, db)
+    except ValueError as ve:
+        logger.error("Validation error: %s", ve)
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"Validation error: {str(ve)}")
+    except Exception:
+        logger.exception("Prediction error in predict_batch")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Prediction error occurred.")
+
+    return {"message": "Prediction successful", "results": results, "not_found": not_found}
+
+
+@router.get("/cache_stats", status_code=status.HTTP_200_OK)
+async def get_model_cache_stats():
+    """
+    Report hit/miss counters and memory usage of the in-process model cache, and how many
+    model loads and person lookups were shared by concurrent requests.
+    """
+    return {
+        **model_cache.stats(),
+        "single_flight": {"model_loads": model_loads.stats(), "person_lookups": person_lookups.stats()},
+    }
+
+
+@router.get("/batching_stats", status_code=status.HTTP_200_OK)
+async def get_prediction_batching_stats():
+    """
+    Report the micro-batching settings of single predictions and the batch size and
+    queue wait histograms.
+    """
+    return prediction_batcher.stats()
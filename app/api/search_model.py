@@ -1,34 +1,52 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.models.AI.ModelDetails import ModelDetails
-from app.utils.public_method import clean_all_values
-from typing import List, Dict, Optional
+import base64
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
+from app.models.AI.ModelDetails import ModelDetails, ModelSortField
+from typing import Any, List, Dict, Optional, Tuple
 from datetime import datetime
 
 
 router = APIRouter()
 
+# Fields the model list endpoints can return, by response name
+LIST_FIELDS = {
+    "model_id": ModelDetails.id,
+    "version": ModelDetails.version,
+    "object_predict": ModelDetails.name_object_predict,
+    "architecture": ModelDetails.architecture,
+    "accuracy_result": ModelDetails.accuracy_results,
+    "f1_score_result": ModelDetails.f1_score_results,
+    "precision_result": ModelDetails.precision_results,
+    "recall_result": ModelDetails.recall_results,
+    "model_evaluation_date": ModelDetails.model_evaluation_date,
+    "exam_id": ModelDetails.exam_id,
+    "job_id": ModelDetails.job_id,
+}
+DEFAULT_LIST_FIELDS = "model_id,version,object_predict,accuracy_result"
+# Page size when a cursor is given without a limit; without either, every model is returned
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 
 @router.get("/details_by_id", status_code=status.HTTP_200_OK)
 async def find_model_details_by_id(
     query_id: int,
-    db: Session = Depends(get_db)
-) -> Dict[str, str | int | float | None | Dict[str, float] | datetime]:
+    db: AsyncSession = Depends(get_async_db)
+) -> Dict[str, str | int | float | None | Dict[str, Optional[float]] | datetime]:
     """
     Fetch model details by its unique ID.
 
     Args:
         query_id (int): The unique ID of the model.
-        db (Session): SQLAlchemy session (provided by Depends).
+        db (AsyncSession): SQLAlchemy async session (provided by Depends).
     Returns:
         dict: Model details in JSON format.
     """
 
-    model_details = ModelDetails.find_model_by_id(db, query_id)
-
-
-    print(f"res: {model_details}")
+    model_details = await ModelDetails.find_model_by_id_async(db, query_id)
 
     if not model_details:
         raise HTTPException(
@@ -36,94 +54,152 @@ async def find_model_details_by_id(
             detail=f"Model with ID {query_id} not found."
         )
 
-    raw_data = {
+    # Metrics are sanitized when the record is added, so the row is returned as stored
+    return {
         "model_id": model_details.id,
         "object_predict": model_details.name_object_predict,
         "architecture": model_details.architecture,
-        "accuracy_results": clean_all_values(model_details.accuracy_results),
-        "f1_score_results": clean_all_values(model_details.f1_score_results),
-        "precision_results": clean_all_values(model_details.precision_results),
-        "recall_results": clean_all_values(model_details.recall_results),
-        "t_test_results_accuracy": clean_all_values(model_details.t_test_results_accuracy),
-        "t_test_results_f1_score": clean_all_values(model_details.t_test_results_f1_score),
-        "confidence_level_accuracy": clean_all_values(model_details.confidence_level_accuracy),
-        "confidence_level_f1_score": clean_all_values(model_details.confidence_level_f1_score),
-        "num_all_samples": clean_all_values(model_details.num_all_samples),
+        "accuracy_results": model_details.accuracy_results,
+        "f1_score_results": model_details.f1_score_results,
+        "precision_results": model_details.precision_results,
+        "recall_results": model_details.recall_results,
+        "t_test_results_accuracy": model_details.t_test_results_accuracy,
+        "t_test_results_f1_score": model_details.t_test_results_f1_score,
+        "confidence_level_accuracy": model_details.confidence_level_accuracy,
+        "confidence_level_f1_score": model_details.confidence_level_f1_score,
+        "num_all_samples": model_details.num_all_samples,
         "num_features": model_details.num_features,
         "split_test": model_details.split_test,
         "n_splits_t_test": model_details.n_splits_t_test,
         "number_of_labels": model_details.number_of_labels,
         "model_evaluation_date": model_details.model_evaluation_date,
         "version": model_details.version,
+        "search_strategy": model_details.search_strategy,
+        "search_n_fits": model_details.search_n_fits,
         "job_id": model_details.job_id,
         "exam_id": model_details.exam_id,
     }
-    
-    return clean_all_values(raw_data)
 
 
+def _parse_fields(fields: str) -> List[str]:
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in LIST_FIELDS]
+    if not names or unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown) or repr(fields)}. Allowed: {', '.join(LIST_FIELDS)}"
+        )
+    return list(dict.fromkeys(names))
+
 
+def encode_cursor(order_by: ModelSortField, sort_key: Any, model_id: int) -> str:
+    if isinstance(sort_key, datetime):
+        sort_key = sort_key.isoformat()
+    raw = json.dumps([order_by.value, sort_key, model_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str, order_by: ModelSortField) -> Tuple[Any, int]:
+    """
+    Returns the (sort key, id) a cursor points after.  A cursor only continues the ordering
+    it was issued for.
+    """
+    try:
+        cursor_order, sort_key, model_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if cursor_order != order_by.value:
+            raise ValueError(f"cursor was issued for order_by={cursor_order}")
+        if order_by == ModelSortField.EVALUATION_DATE:
+            sort_key = datetime.fromisoformat(sort_key)
+        return sort_key, int(model_id)
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid cursor: {e}")
+
+
+async def search_models_page(
+    db: AsyncSession,
+    response: Response,
+    fields: str,
+    limit: Optional[int],
+    order_by: ModelSortField,
+    descending: bool,
+    cursor: Optional[str],
+    **filters
+) -> List[Dict[str, Any]]:
+    """
+    Loads the models with only the requested fields.  Paging is opt-in: with a limit or a
+    cursor one page is returned and, when more models may follow, the cursor of the next
+    page is sent in the X-Next-Cursor header; with neither, every matching model is.
+    """
+    names = _parse_fields(fields)
+    after = decode_cursor(cursor, order_by) if cursor else None
+    if cursor and limit is None:
+        limit = DEFAULT_PAGE_SIZE
+
+    rows = await ModelDetails.search_models_async(
+        db, [LIST_FIELDS[name].label(name) for name in names],
+        order_by=order_by, descending=descending, after=after, limit=limit, **filters
+    )
+
+    if limit is not None and len(rows) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(order_by, rows[-1].sort_key, rows[-1].id)
+    return [{name: row._mapping[name] for name in names} for row in rows]
 
 
 @router.get("/details_by_exam_and_job", status_code=status.HTTP_200_OK)
 async def find_models_by_exam_and_job(
+    response: Response,
     exam_id: Optional[int] = None,
     job_id: Optional[int] = None,
-    db: Session = Depends(get_db)
-) -> List[Dict[str, Optional[str] | int | Dict[str, float]]]:
+    fields: str = DEFAULT_LIST_FIELDS,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    order_by: ModelSortField = ModelSortField.ID,
+    descending: bool = False,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+) -> List[Dict[str, Optional[str] | int | datetime | Dict[str, Optional[float]]]]:
     """
-    Fetches model details based on exam_id and job_id.
+    Fetches model details based on exam_id and job_id, optionally one page at a time.
 
     Args:
         exam_id (int, optional): The exam ID to filter models. Defaults to None.
         job_id (int, optional): The job ID to filter models. Defaults to None.
-        db (Session): SQLAlchemy database session.
+        fields (str): Comma-separated LIST_FIELDS to return; only these columns are loaded.
+        limit (int, optional): Page size.  Without a limit or cursor every model is returned.
+        order_by (ModelSortField): id, evaluation date or the mean of a metric.
+        descending (bool): Sort from the highest value down.
+        cursor (str, optional): X-Next-Cursor header of the previous page.
+        db (AsyncSession): SQLAlchemy async database session.
 
     Returns:
         list[dict]: List of dictionaries with model details.
     """
-    models = ModelDetails.find_models_by_exam_and_job_id(db, exam_id, job_id)
-
-    result = [
-        clean_all_values({
-            "model_id": model.id,
-            "version": model.version,
-            "object_predict": model.name_object_predict,
-            "accuracy_result": clean_all_values(model.accuracy_results)
-        })
-        for model in models
-    ]
-    return result
+    return await search_models_page(
+        db, response, fields, limit, order_by, descending, cursor, exam_id=exam_id, job_id=job_id
+    )
 
 
 
 @router.get("/details_by_exam_and_job_object_predict", status_code=status.HTTP_200_OK)
 async def find_models_by_exam_and_job(
+    response: Response,
     exam_id: Optional[int] = None,
     job_id: Optional[int] = None,
     name_object_predict: Optional[str] = None,
-    db: Session = Depends(get_db)
-) -> List[Dict[str, Optional[str] | int | Dict[str, float]]]:
+    fields: str = DEFAULT_LIST_FIELDS,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    order_by: ModelSortField = ModelSortField.ID,
+    descending: bool = False,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+) -> List[Dict[str, Optional[str] | int | datetime | Dict[str, Optional[float]]]]:
     """
-    Fetches model details based on exam_id and job_id.
-
-    Args:
-        exam_id (int, optional): The exam ID to filter models. Defaults to None.
-        job_id (int, optional): The job ID to filter models. Defaults to None.
-        db (Session): SQLAlchemy database session.
+    Fetches model details based on exam_id, job_id and the predicted object, optionally one
+    page at a time.  Paging, fields and ordering work as in /details_by_exam_and_job.
 
     Returns:
         list[dict]: List of dictionaries with model details.
     """
-    models = ModelDetails.find_models_by_exam_and_job_id_object_predict(db, exam_id, job_id, name_object_predict)
-
-    result = [
-        clean_all_values({
-            "model_id": model.id,
-            "version": model.version,
-            "object_predict": clean_all_values(model.name_object_predict),
-            "accuracy_result": clean_all_values(model.accuracy_results)
-        })
-        for model in models
-    ]
-    return result
\ No newline at end of file
+    return await search_models_page(
+        db, response, fields, limit, order_by, descending, cursor,
+        exam_id=exam_id, job_id=job_id, name_object_predict=name_object_predict
+    )
\ No newline at end of file
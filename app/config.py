@@ -6,5 +6,59 @@ load_dotenv()
 
 class Settings:
     UPLOAD_DIR = os.getenv("UPLOAD_DIR", "uploaded_files")  # Default to 'uploaded_files'
+    # Bytes copied per read when an uploaded file is streamed to disk
+    UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", 1024 * 1024))  # 1 MB
+
+    # Logging (see app/logger.py)
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()  # Level of the app_logger logger
+    # Per-logger levels as name=LEVEL pairs, e.g. "app_logger.requests=WARNING,sqlalchemy.engine=INFO"
+    LOG_LEVELS = {
+        name.strip(): level.strip().upper()
+        for name, _, level in (pair.partition("=") for pair in os.getenv("LOG_LEVELS", "").split(","))
+        if name.strip() and level.strip()
+    }
+    # Share of requests logged by the request middleware (1 = all); 5xx responses are always logged
+    LOG_REQUEST_SAMPLE_RATE = float(os.getenv("LOG_REQUEST_SAMPLE_RATE", 1.0))
+
+    # In-process cache of loaded models (see app/utils/model_cache.py)
+    MODEL_CACHE_MAX_BYTES = int(os.getenv("MODEL_CACHE_MAX_BYTES", 512 * 1024 * 1024))  # 512 MB
+    MODEL_CACHE_MAX_ENTRIES = int(os.getenv("MODEL_CACHE_MAX_ENTRIES", 32))
+
+    # Cache of built training datasets (see app/utils/dataset_cache.py)
+    DATASET_CACHE_DIR = os.getenv("DATASET_CACHE_DIR", "")  # Empty = app/services/dataset_cache
+    DATASET_CACHE_MAX_BYTES = int(os.getenv("DATASET_CACHE_MAX_BYTES", 256 * 1024 * 1024))  # 256 MB
+    DATASET_CACHE_MAX_ENTRIES = int(os.getenv("DATASET_CACHE_MAX_ENTRIES", 8))
+
+    # Database connection pool (see app/database.py)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))  # Connections kept open
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))  # Extra connections opened under load
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))  # Reopen connections older than this (seconds, -1 = never)
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+    # Longest a single SQL statement may run before it is cancelled (milliseconds, 0 = no limit)
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 30000))
+
+    # Worker budgets for blocking work run from async routes (see app/utils/executors.py)
+    IO_EXECUTOR_WORKERS = int(os.getenv("IO_EXECUTOR_WORKERS", 16))
+    CPU_EXECUTOR_WORKERS = int(os.getenv("CPU_EXECUTOR_WORKERS", 0))  # 0 = number of CPUs
+
+    # Micro-batching of concurrent single-person predictions (see app/utils/prediction_batcher.py)
+    PREDICTION_BATCHING = os.getenv("PREDICTION_BATCHING", "false").lower() in ("1", "true", "yes")
+    PREDICTION_BATCH_WINDOW_MS = float(os.getenv("PREDICTION_BATCH_WINDOW_MS", 5))  # Longest a request waits for others
+    PREDICTION_BATCH_MAX_SIZE = int(os.getenv("PREDICTION_BATCH_MAX_SIZE", 64))  # A full batch runs at once
+
+    # Models loaded and warmed up in the background at startup (see app/services/model_warmup_service.py)
+    WARMUP_RECENT_MODELS = int(os.getenv("WARMUP_RECENT_MODELS", 0))  # Most recently evaluated models to load
+    WARMUP_MODEL_IDS = [int(i) for i in os.getenv("WARMUP_MODEL_IDS", "").split(",") if i.strip()]  # Pinned model IDs
+    WARMUP_CONCURRENCY = int(os.getenv("WARMUP_CONCURRENCY", 4))  # Models loaded in parallel
+
+    # Training jobs run concurrently in worker processes (see app/services/training_job_service.py)
+    TRAINING_MAX_CONCURRENCY = int(os.getenv("TRAINING_MAX_CONCURRENCY", 2))
+    # Worker budget of one training job, shared by its evaluation iterations and CV folds
+    TRAINING_N_JOBS = int(os.getenv("TRAINING_N_JOBS", 0))  # 0 = CPUs / TRAINING_MAX_CONCURRENCY
+    # Default wall-clock limit of one hyperparameter search, in seconds (0 = no limit)
+    SEARCH_TIME_BUDGET = float(os.getenv("SEARCH_TIME_BUDGET", 900))
+    # Persist the fitted model of the best evaluation iteration instead of fitting a final one
+    TRAINING_REUSE_BEST_ITERATION = os.getenv("TRAINING_REUSE_BEST_ITERATION", "true").lower() in ("1", "true", "yes")
 
 settings = Settings()
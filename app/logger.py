@@ -1,7 +1,11 @@
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import os
 
+from app.config import settings
+
 # Log directory and file config
 LOG_DIR = "logs"
 LOG_FILE = "app.log"
@@ -10,7 +14,10 @@ LOG_PATH = os.path.join(LOG_DIR, LOG_FILE)
 
 # Create logger
 logger = logging.getLogger("app_logger")
-logger.setLevel(logging.DEBUG)  # تنظیم سطح پایه به DEBUG (همه لاگ‌ها ثبت می‌شن)
+logger.setLevel(settings.LOG_LEVEL)  # پیش‌فرض INFO؛ با LOG_LEVEL=DEBUG همه لاگ‌ها ثبت می‌شن
+
+# One line per request, sampled by LOG_REQUEST_SAMPLE_RATE (see log_requests in app/main.py)
+request_logger = logging.getLogger("app_logger.requests")
 
 # Format for log messages
 formatter = logging.Formatter(
@@ -32,10 +39,20 @@ console_handler = logging.StreamHandler()
 console_handler.setFormatter(formatter)
 console_handler.setLevel(logging.DEBUG)
 
+# Callers only put records on a queue; the file and console handlers run on the listener's
+# thread, so slow disks or terminals never block a request
+log_queue = queue.SimpleQueue()
+queue_listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+
 # Avoid adding handlers multiple times in development (e.g., FastAPI reload)
 if not logger.handlers:
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    logger.addHandler(QueueHandler(log_queue))
+    queue_listener.start()
+    atexit.register(queue_listener.stop)  # Flushes the records still queued at exit
+
+# Per-logger levels, e.g. LOG_LEVELS="app_logger.requests=WARNING,sqlalchemy.engine=INFO"
+for name, level in settings.LOG_LEVELS.items():
+    logging.getLogger(name).setLevel(level)
 
 # Optional shortcut if you want to use: from app.logger import get_logger
 def get_logger(name: str = "app_logger") -> logging.Logger:
@@ -1,10 +1,20 @@
-from fastapi import FastAPI, Request
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 
 from app.api.endpoints import router as api_router
-from app.database import engine, Base  # Make sure this is the correct import
-from app.logger import logger  # 👈 import the logger
+from app.database import engine, Base, pool_stats, async_pool_stats, dispose_async_engine  # Make sure this is the correct import
+from app.config import settings
+from app.logger import logger, request_logger  # 👈 import the logger
+from app.utils.executors import io_executor, cpu_executor, executor_stats
+from app.services.training_job_service import training_job_pool, fail_interrupted_training_jobs
+from app.services.model_warmup_service import model_warmup
 
 
 @asynccontextmanager
@@ -15,8 +25,21 @@ async def lifespan(app: FastAPI):
         logger.info("✅ Tables created successfully.")
     except Exception as e:
         logger.exception("❌ Failed to create tables:")
+    try:
+        interrupted = fail_interrupted_training_jobs(datetime.now())
+        if interrupted:
+            logger.warning("Marked %s training job(s) interrupted by the last shutdown as failed", interrupted)
+    except Exception:
+        logger.exception("Failed to reconcile interrupted training jobs")
+    # Warm-up runs in the background: the app is live now and ready once it finishes
+    warmup_task = asyncio.create_task(model_warmup.run())
     yield
     logger.info("🛑 Application shutdown initiated.")
+    warmup_task.cancel()
+    io_executor.shutdown(wait=False)
+    cpu_executor.shutdown(wait=False)
+    training_job_pool.shutdown(wait=False)
+    await dispose_async_engine()
 
 
 # Create FastAPI instance with lifespan
@@ -34,17 +57,25 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Cursor of the next page of model searches
 )
 
 # Include API routes
 app.include_router(api_router)
 
-# Optional: Middleware to log every request
+# Optional: Middleware to log a sample of requests, one line each
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    logger.info(f"➡️ {request.method} {request.url}")
+    started = time.perf_counter()
     response = await call_next(request)
-    logger.info(f"⬅️ Response {response.status_code} for {request.method} {request.url}")
+    level = logging.WARNING if response.status_code >= 500 else logging.INFO
+    if level == logging.WARNING or (
+        request_logger.isEnabledFor(level) and random.random() < settings.LOG_REQUEST_SAMPLE_RATE
+    ):
+        request_logger.log(
+            level, "%s %s -> %s in %.1fms",
+            request.method, request.url.path, response.status_code, (time.perf_counter() - started) * 1000
+        )
     return response
 
 
@@ -53,3 +84,28 @@ async def log_requests(request: Request, call_next):
 def read_root():
     logger.info("📥 Root endpoint hit.")
     return {"message": "Welcome to the Job Prediction API"}
+
+
+# Liveness: the process is up and serving requests
+@app.get("/health/live")
+def read_liveness():
+    return {"status": "alive"}
+
+
+# Readiness: startup model warm-up has finished, so traffic can be routed here
+@app.get("/health/ready")
+def read_readiness():
+    status_code = status.HTTP_200_OK if model_warmup.ready else status.HTTP_503_SERVICE_UNAVAILABLE
+    return JSONResponse(status_code=status_code, content={"ready": model_warmup.ready, "warmup": model_warmup.stats()})
+
+
+# Queue depth and worker usage of the blocking-work executors
+@app.get("/executor_stats")
+def read_executor_stats():
+    return executor_stats()
+
+
+# Connection pool usage and checkout latency
+@app.get("/db_pool_stats")
+def read_db_pool_stats():
+    return {**pool_stats(), "async": async_pool_stats()}
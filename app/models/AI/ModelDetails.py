@@ -1,12 +1,24 @@
-from sqlalchemy import Column, String, Integer, Float, DateTime, JSON,ForeignKey
+from sqlalchemy import Column, String, Integer, Float, DateTime, JSON,ForeignKey, Index, bindparam, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session
 from sqlalchemy.orm import relationship
 from app.database import Base
+from app.utils.public_method import sanitize_value
 from datetime import datetime
+from enum import Enum
 import numpy as np
 import pandas as pd
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+
+class ModelSortField(str, Enum):
+    ID = "id"
+    EVALUATION_DATE = "model_evaluation_date"
+    ACCURACY = "accuracy"
+    F1_SCORE = "f1_score"
+    PRECISION = "precision"
+    RECALL = "recall"
 
 
 
@@ -24,8 +36,8 @@ class ModelDetails(Base):
     recall_results = Column(JSON, nullable=False)  # JSON data for recall metrics
     t_test_results_accuracy = Column(JSON, nullable=False)  # JSON data for T-test on accuracy
     t_test_results_f1_score = Column(JSON, nullable=False)  # JSON data for T-test on F1 scores
-    confidence_level_accuracy = Column(Float, nullable=False)  # Confidence level for accuracy
-    confidence_level_f1_score = Column(Float, nullable=False)  # Confidence level for F1 score
+    confidence_level_accuracy = Column(Float, nullable=True)  # Confidence level for accuracy, None if undefined (NaN)
+    confidence_level_f1_score = Column(Float, nullable=True)  # Confidence level for F1 score, None if undefined (NaN)
     num_all_samples = Column(Integer, nullable=False)  # Total number of samples used
     num_features = Column(Integer, nullable=False)  # Number of features in the dataset
     split_test = Column(Float, nullable=False)  # Test dataset split ratio
@@ -33,23 +45,27 @@ class ModelDetails(Base):
     number_of_labels = Column(Integer, nullable=False)  # Number of labels in the dataset
     model_evaluation_date = Column(DateTime, nullable=False)  # Date of model evaluation
     version = Column(String, nullable=False)  # Model version
+    search_strategy = Column(String, nullable=True)  # Hyperparameter search used, None if untuned
+    search_n_fits = Column(Integer, nullable=True)  # Model fits performed by the searches
     exam_id = Column(Integer, ForeignKey("exam_details.id"), nullable=False)  # Associated exam ID
 
     job_id = Column(Integer, nullable=False)  # Associated job ID
-    
+
+    __table_args__ = (
+        # Serves the keyset-paginated searches filtered by exam/job and ordered by date
+        Index('ix_model_details_exam_id_job_id_evaluation_date', 'exam_id', 'job_id', 'model_evaluation_date'),
+    )
 
     @staticmethod
     def _clean_card_info(input_dict: dict) -> dict:
+        """
+        Normalizes card_info once, before it is stored: numpy values become Python numbers and
+        lists, NaN/inf become None and metric dicts stay JSON (recursively cleaned) instead of
+        being stringified, so stored rows can be returned by the API as they are.
+        """
         def convert(value):
-            if isinstance(value, (np.integer, np.int64, np.int32)):
-                return int(value)
-            elif isinstance(value, (np.floating, np.float64, np.float32)):
-                return float(value)
-            elif isinstance(value, np.ndarray):
-                return value.tolist()
-            elif isinstance(value, np.bool_):
-                return bool(value)
-            elif isinstance(value, (datetime, str, float, int, bool, type(None))):
+            value = sanitize_value(value)
+            if isinstance(value, (dict, list, datetime, str, float, int, bool, type(None))):
                 return value
             return str(value)  # fallback
 
@@ -95,7 +111,22 @@ class ModelDetails(Base):
         """
         
         return db.query(cls).filter(cls.id == model_id).first()
+
+    @classmethod
+    async def find_model_by_id_async(cls, db: AsyncSession, model_id: int):
+        """
+        Async version of find_model_by_id.
+        """
+        return await db.get(cls, model_id)
     
+    @classmethod
+    def find_recent_model_ids(cls, db: Session, limit: int):
+        """
+        IDs of the most recently evaluated models, newest first.
+        """
+        rows = db.query(cls.id).order_by(cls.model_evaluation_date.desc(), cls.id.desc()).limit(limit).all()
+        return [row.id for row in rows]
+
     @classmethod
     def find_models_by_exam_id(cls, db: Session, exam_id: int):
         """
@@ -145,6 +176,13 @@ class ModelDetails(Base):
             query = query.filter(cls.job_id == job_id)
         return query.all()
 
+    @classmethod
+    async def find_models_by_exam_and_job_id_async(cls, db: AsyncSession, exam_id: int = None, job_id: int = None):
+        """
+        Async version of find_models_by_exam_and_job_id.
+        """
+        return await cls.find_models_by_exam_and_job_id_object_predict_async(db, exam_id, job_id)
+
     @classmethod
     def find_models_by_exam_and_job_id_object_predict(cls, db: Session, exam_id: int = None, job_id: int = None, name_object_predict:str = None):
 
@@ -157,6 +195,81 @@ class ModelDetails(Base):
             query = query.filter(cls.name_object_predict == name_object_predict)
         return query.all()
 
+    @classmethod
+    async def find_models_by_exam_and_job_id_object_predict_async(cls, db: AsyncSession, exam_id: int = None, job_id: int = None, name_object_predict: str = None):
+        """
+        Async version of find_models_by_exam_and_job_id_object_predict.
+        """
+        statement = select(cls)
+        if exam_id:
+            statement = statement.where(cls.exam_id == exam_id)
+        if job_id:
+            statement = statement.where(cls.job_id == job_id)
+        if name_object_predict:
+            statement = statement.where(cls.name_object_predict == name_object_predict)
+        result = await db.execute(statement)
+        return result.scalars().all()
+
+    @classmethod
+    def sort_expression(cls, order_by: ModelSortField):
+        """
+        SQL expression a search is ordered by.  Metrics sort by their stored mean; models whose
+        mean is missing (NaN at training time) sort as the lowest score.
+        """
+        if order_by == ModelSortField.ID:
+            return cls.id
+        if order_by == ModelSortField.EVALUATION_DATE:
+            return cls.model_evaluation_date
+        metric_column = getattr(cls, f"{order_by.value}_results")
+        return func.coalesce(metric_column['mean'].as_float(), -1.0)
+
+    @classmethod
+    async def search_models_async(
+        cls,
+        db: AsyncSession,
+        columns: Sequence[Any],
+        exam_id: int = None,
+        job_id: int = None,
+        name_object_predict: str = None,
+        order_by: ModelSortField = ModelSortField.ID,
+        descending: bool = False,
+        after: Optional[Tuple[Any, int]] = None,
+        limit: Optional[int] = None
+    ):
+        """
+        One page of models matching the filters, loading only the given columns; every
+        matching model when limit is None.
+
+        Pages use keyset pagination on (sort key, id): pass the sort_key and id of the last
+        row of a page as after to get the next one.
+
+        Returns:
+            list[Row]: Rows with the requested columns plus id and sort_key.
+        """
+        sort_key = cls.sort_expression(order_by)
+        statement = select(*columns, cls.id.label('id'), sort_key.label('sort_key'))
+        if exam_id:
+            statement = statement.where(cls.exam_id == exam_id)
+        if job_id:
+            statement = statement.where(cls.job_id == job_id)
+        if name_object_predict:
+            statement = statement.where(cls.name_object_predict == name_object_predict)
+
+        if after is not None:
+            after_key, after_id = after
+            position = tuple_(sort_key, cls.id)
+            boundary = tuple_(bindparam('after_key', after_key, type_=sort_key.type), bindparam('after_id', after_id))
+            statement = statement.where(position < boundary if descending else position > boundary)
+
+        if descending:
+            statement = statement.order_by(sort_key.desc(), cls.id.desc())
+        else:
+            statement = statement.order_by(sort_key, cls.id)
+        if limit is not None:
+            statement = statement.limit(limit)
+        result = await db.execute(statement)
+        return result.all()
+
 
 
     @classmethod
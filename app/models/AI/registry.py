@@ -0,0 +1,56 @@
+import importlib
+from functools import lru_cache
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+
+class ModelFamily(NamedTuple):
+    module: str
+    class_name: str
+    # Other names of the family: ModelName values, model card architectures
+    aliases: Tuple[str, ...] = ()
+    # Constructor arguments read from a model card, for families that need them to load
+    card_kwargs: Optional[Callable[[dict], Dict[str, Any]]] = None
+
+
+# Modules are only imported when a family is first used, so a worker serving DecisionTree
+# models never imports torch or xgboost
+MODEL_FAMILIES = {
+    "DecisionTree": ModelFamily("app.models.AI.decision_tree", "DecisionTreeModel"),
+    "SVM": ModelFamily("app.models.AI.svm", "SVMModel"),
+    "XgBoost": ModelFamily("app.models.AI.xgboost_model", "XGBoostModel", aliases=("XGB",)),
+    "MLP": ModelFamily("app.models.AI.MLP", "MLPModel"),
+    "LSTM": ModelFamily(
+        "app.models.AI.LSTM", "LSTMModel",
+        card_kwargs=lambda card: {"input_size": card["num_features"], "output_size": card["number_of_labels"]}
+    ),
+}
+
+_FAMILY_BY_NAME = {
+    name: family
+    for family_name, family in MODEL_FAMILIES.items()
+    for name in (family_name, family.class_name, *family.aliases)
+}
+
+
+def get_model_family(name: str) -> ModelFamily:
+    """
+    Finds a family by its ModelName value, model class name (the architecture train_model
+    stores on model cards) or alias.
+    """
+    family = _FAMILY_BY_NAME.get(getattr(name, "value", name))
+    if family is None:
+        raise ValueError(f"Unsupported model: {name}")
+    return family
+
+
+@lru_cache(maxsize=None)
+def _import_class(module: str, class_name: str) -> type:
+    return getattr(importlib.import_module(module), class_name)
+
+
+def resolve_model_class(name: str) -> type:
+    """
+    Returns the model class of a family, importing its module on first use.
+    """
+    family = get_model_family(name)
+    return _import_class(family.module, family.class_name)
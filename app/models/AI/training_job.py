@@ -0,0 +1,120 @@
+from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey
+from sqlalchemy.orm import Session
+from app.database import Base
+from datetime import datetime
+from typing import Optional
+
+
+class TrainingJob(Base):
+    """
+    A training request executed in the background; its row is the source of truth for the
+    job's state, so any API worker can answer status polls.
+    """
+    __tablename__ = "training_jobs"
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+
+    id = Column(Integer, primary_key=True, index=True)
+    status = Column(String, nullable=False, default=STATUS_QUEUED)
+    model_name = Column(String, nullable=False)  # Architecture requested (ModelName value)
+    name_object_predict = Column(String, nullable=False)
+    performance_metric = Column(String, nullable=False)  # JobPerformance column used as label
+    num_classes = Column(Integer, nullable=False)
+    job_id = Column(Integer, nullable=False)
+    exam_id = Column(Integer, ForeignKey("exam_details.id"), nullable=False)
+    search_strategy = Column(String, nullable=True)  # SearchStrategy value, None trains without tuning
+    search_n_iter = Column(Integer, nullable=False, default=10)  # Candidates sampled by the randomized search
+    search_time_budget = Column(Float, nullable=True)  # Seconds per search, None for the configured default
+    created_at = Column(DateTime, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    model_details_id = Column(Integer, ForeignKey("model_details.id"), nullable=True)  # Result of a finished job
+    error = Column(String, nullable=True)
+
+    @classmethod
+    def create(cls, db: Session, model_name: str, name_object_predict: str, performance_metric: str,
+               num_classes: int, job_id: int, exam_id: int, search_strategy: Optional[str] = None,
+               search_n_iter: int = 10, search_time_budget: Optional[float] = None) -> "TrainingJob":
+        """
+        Registers a new queued training job.
+
+        Returns:
+            TrainingJob: The newly created job.
+        """
+        training_job = cls(
+            status=cls.STATUS_QUEUED,
+            model_name=model_name,
+            name_object_predict=name_object_predict,
+            performance_metric=performance_metric,
+            num_classes=num_classes,
+            job_id=job_id,
+            exam_id=exam_id,
+            search_strategy=search_strategy,
+            search_n_iter=search_n_iter,
+            search_time_budget=search_time_budget,
+            created_at=datetime.now()
+        )
+        db.add(training_job)
+        db.commit()
+        db.refresh(training_job)
+        return training_job
+
+    @classmethod
+    def find_by_id(cls, db: Session, training_job_id: int) -> Optional["TrainingJob"]:
+        return db.query(cls).filter(cls.id == training_job_id).first()
+
+    @classmethod
+    def mark_running(cls, db: Session, training_job_id: int) -> "TrainingJob":
+        training_job = cls.find_by_id(db, training_job_id)
+        if not training_job:
+            raise ValueError(f"Training job with ID {training_job_id} not found.")
+        training_job.status = cls.STATUS_RUNNING
+        training_job.started_at = datetime.now()
+        db.commit()
+        return training_job
+
+    @classmethod
+    def mark_done(cls, db: Session, training_job_id: int, model_details_id: int) -> None:
+        training_job = cls.find_by_id(db, training_job_id)
+        training_job.status = cls.STATUS_DONE
+        training_job.model_details_id = model_details_id
+        training_job.finished_at = datetime.now()
+        db.commit()
+
+    @classmethod
+    def mark_failed(cls, db: Session, training_job_id: int, error: str) -> None:
+        training_job = cls.find_by_id(db, training_job_id)
+        if not training_job:
+            return
+        training_job.status = cls.STATUS_FAILED
+        training_job.error = error
+        training_job.finished_at = datetime.now()
+        db.commit()
+
+    @classmethod
+    def fail_unfinished(cls, db: Session, created_before: datetime, error: str) -> int:
+        """
+        Marks failed every queued or running job submitted before created_before.
+
+        Returns:
+            int: Number of jobs marked failed.
+        """
+        count = db.query(cls).filter(
+            cls.status.in_([cls.STATUS_QUEUED, cls.STATUS_RUNNING]),
+            cls.created_at < created_before
+        ).update(
+            {cls.status: cls.STATUS_FAILED, cls.error: error, cls.finished_at: datetime.now()},
+            synchronize_session=False
+        )
+        db.commit()
+        return count
+
+    def elapsed_seconds(self) -> float:
+        """
+        Seconds since the job was submitted, up to its end for finished jobs.
+        """
+        end = self.finished_at or datetime.now()
+        return (end - self.created_at).total_seconds()
@@ -1,5 +1,7 @@
 from .files.exam_info import ExamDetails
 from .files.data_file import DataFile
+from .files.person_row_index import PersonRowIndex
 from .AI.ModelDetails import ModelDetails
+from .AI.training_job import TrainingJob
 from .class_b import ClassB
 from .class_a import ClassA
\ No newline at end of file
@@ -1,25 +1,50 @@
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey
-from sqlalchemy.orm import relationship,Session
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, ForeignKey, Boolean, Index, false, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import relationship,Session, validates
 from app.database import Base
-from typing import Any
+from typing import Any, Dict
 from fastapi import UploadFile
 from khayyam import JalaliDatetime
-from app.services.file_service import save_file_to_disk
+from app.services.file_service import (
+    store_blob, file_sha256, is_blob_path, load_person_row_offsets, ROW_OFFSETS_SUFFIX
+)
+from app.services.columnar_file_service import write_columnar, load_schema, get_sidecar_path
 from app.models.files.exam_info import ExamDetails
+from app.models.files.person_row_index import PersonRowIndex
+from app.logger import logger
+from itertools import groupby
 import os
+import shutil
 
 
 class DataFile(Base):
     __tablename__ = "data_files"
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, nullable=False)
-    path = Column(String, nullable=False)
+    name = Column(String, nullable=False)  # Name the file was uploaded under
+    path = Column(String, nullable=False)  # Content-addressed blob, shared by uploads of the same content
     created_at = Column(DateTime, nullable=False)
 
     # Foreign key to link with ExamDetails
     exam_id = Column(Integer, ForeignKey('exam_details.id'), nullable=False)
 
+    # Whether the rows of this file are in PersonRowIndex
+    row_index_built = Column(Boolean, nullable=False, default=False, server_default=false())
+
+    # Persian year of created_at, kept in sync by set_jalali_year
+    jalali_year = Column(Integer, nullable=False)
+
+    # Size and SHA-256 of the stored content, computed while the upload is written
+    size_bytes = Column(BigInteger, nullable=True)
+    sha256 = Column(String(64), nullable=True)
+
+    __table_args__ = (Index('ix_data_files_exam_id_jalali_year', 'exam_id', 'jalali_year'),)
+
+    @validates('created_at')
+    def set_jalali_year(self, key, created_at):
+        self.jalali_year = JalaliDatetime(created_at).year if created_at is not None else None
+        return created_at
+
 
     @classmethod
     def add_file(
@@ -32,6 +57,10 @@ class DataFile(Base):
         """
         Adds a file to the database after saving it to disk with proper validation.
 
+        The content is stored once in the blob store: uploading bytes that are already
+        stored (for another exam, or again for the same one) reuses the blob together with
+        its columnar copy and row offsets.
+
         Args:
             db: SQLAlchemy database session
             file: The uploaded file
@@ -58,34 +87,233 @@ class DataFile(Base):
             raise ValueError("Invalid Persian calendar datetime format. Use YYYY/MM/DD") from e
 
         try:
-            # Save file to disk
-            file_path = save_file_to_disk(file, f"exam_{exam_id}")
+            # Stream file to the blob store
+            file_path, size_bytes, sha256 = store_blob(file.file)
 
             # Create and save record
             data_file = cls(
                 name=file.filename,
                 path=file_path,
                 created_at=gregorian_datetime,
-                exam_id=exam_id
+                exam_id=exam_id,
+                size_bytes=size_bytes,
+                sha256=sha256
             )
             
             db.add(data_file)
             db.commit()
             db.refresh(data_file)
-            
-            return data_file
 
         except Exception as e:
             db.rollback()
-            # Clean up file if it was saved but DB operation failed
-            if 'file_path' in locals():
-                try:
-                    os.remove(file_path)
-                except OSError:
-                    pass  # Don't mask original error
-            
+            # The blob may be shared with other records, so it is kept; the next upload of the
+            # same content reuses it
             raise RuntimeError(f"Failed to add file: {str(e)}") from e
 
+        # The upload is already stored; readers fall back to the CSV for anything below that fails
+        try:
+            if load_schema(data_file.path) is None:
+                write_columnar(data_file.path)
+        except Exception as e:
+            logger.warning("Could not write columnar copy of %s: %s", data_file.path, e)
+
+        try:
+            cls.build_row_index(db, data_file)
+        except Exception as e:
+            db.rollback()
+            logger.warning("Could not index rows of %s: %s", data_file.path, e)
+
+        return data_file
+
+    @classmethod
+    def build_row_index(cls, db: Session, data_file: "DataFile") -> int:
+        """
+        Adds the rows of a stored file to PersonRowIndex and marks the file as indexed.
+
+        Args:
+            db (Session): SQLAlchemy database session.
+            data_file (DataFile): The stored file to index.
+
+        Returns:
+            int: Number of index entries created or updated.
+        """
+        offsets = load_person_row_offsets(data_file.path)
+        changed = PersonRowIndex.index_file(
+            db,
+            exam_id=data_file.exam_id,
+            data_file_id=data_file.id,
+            jalali_year=data_file.jalali_year,
+            offsets=offsets
+        )
+        data_file.row_index_built = True
+        db.commit()
+        return changed
+
+    @classmethod
+    def rebuild_row_index(cls, db: Session, exam_id: int = None, full: bool = False) -> int:
+        """
+        Indexes files that are already on disk.
+
+        By default only files that are not indexed yet are processed (incremental).  With
+        full=True the index of the selected exams is dropped and every file is indexed again.
+
+        Args:
+            db (Session): SQLAlchemy database session.
+            exam_id (int, optional): Restrict the rebuild to one exam.
+            full (bool): Rebuild from scratch instead of incrementally.
+
+        Returns:
+            int: Number of files indexed.
+        """
+        query = db.query(cls)
+        if exam_id is not None:
+            query = query.filter(cls.exam_id == exam_id)
+
+        if full:
+            for selected_exam_id in {record.exam_id for record in query.all()}:
+                PersonRowIndex.delete_by_exam_id(db, selected_exam_id)
+            query.update({cls.row_index_built: False}, synchronize_session=False)
+            db.commit()
+
+        indexed = 0
+        for data_file in query.filter(cls.row_index_built == False).order_by(cls.id).all():
+            try:
+                cls.build_row_index(db, data_file)
+                indexed += 1
+            except Exception as e:
+                db.rollback()
+                logger.warning("Could not index rows of %s: %s", data_file.path, e)
+
+        return indexed
+
+    @classmethod
+    def rebuild_columnar(cls, db: Session, exam_id: int = None, full: bool = False) -> int:
+        """
+        Writes the columnar sidecar of files that are already on disk.
+
+        Args:
+            db (Session): SQLAlchemy database session.
+            exam_id (int, optional): Restrict the conversion to one exam.
+            full (bool): Rewrite every sidecar instead of only missing or stale ones.
+
+        Returns:
+            int: Number of files converted.
+        """
+        query = db.query(cls)
+        if exam_id is not None:
+            query = query.filter(cls.exam_id == exam_id)
+
+        converted = 0
+        for data_file in query.order_by(cls.id).all():
+            if not full and load_schema(data_file.path) is not None:
+                continue
+            try:
+                write_columnar(data_file.path)
+                converted += 1
+            except Exception as e:
+                logger.warning("Could not write columnar copy of %s: %s", data_file.path, e)
+
+        return converted
+
+    @classmethod
+    def move_to_blob_store(cls, db: Session, exam_id: int = None) -> int:
+        """
+        Moves files stored per exam (uploaded_files/exam_<id>/<name>) into the blob store,
+        so identical files share one copy.  A per-exam file and its derived artifacts are
+        deleted once no record refers to it any more.
+
+        Args:
+            db (Session): SQLAlchemy database session.
+            exam_id (int, optional): Restrict the move to one exam.
+
+        Returns:
+            int: Number of records moved.
+        """
+        query = db.query(cls)
+        if exam_id is not None:
+            query = query.filter(cls.exam_id == exam_id)
+
+        moved = 0
+        for data_file in query.order_by(cls.id).all():
+            old_path = data_file.path
+            if is_blob_path(old_path):
+                continue
+            try:
+                with open(old_path, "rb") as f:
+                    blob_path, size_bytes, sha256 = store_blob(f)
+                data_file.path = blob_path
+                data_file.size_bytes = size_bytes
+                data_file.sha256 = sha256
+                db.commit()
+                moved += 1
+            except Exception as e:
+                db.rollback()
+                logger.warning("Could not move %s to the blob store: %s", old_path, e)
+                continue
+
+            if db.query(cls.id).filter(cls.path == old_path).first() is None:
+                os.remove(old_path)
+                shutil.rmtree(get_sidecar_path(old_path), ignore_errors=True)
+                if os.path.exists(old_path + ROW_OFFSETS_SUFFIX):
+                    os.remove(old_path + ROW_OFFSETS_SUFFIX)
+
+        return moved
+
+    @classmethod
+    def rebuild_checksums(cls, db: Session, exam_id: int = None, full: bool = False) -> int:
+        """
+        Records size and SHA-256 of files that are already on disk.
+
+        Args:
+            db (Session): SQLAlchemy database session.
+            exam_id (int, optional): Restrict the update to one exam.
+            full (bool): Hash every file instead of only those without a checksum.
+
+        Returns:
+            int: Number of files hashed.
+        """
+        query = db.query(cls)
+        if exam_id is not None:
+            query = query.filter(cls.exam_id == exam_id)
+        if not full:
+            query = query.filter(cls.sha256.is_(None))
+
+        hashed = 0
+        for data_file in query.order_by(cls.id).all():
+            try:
+                data_file.sha256 = file_sha256(data_file.path)
+                data_file.size_bytes = os.path.getsize(data_file.path)
+                db.commit()
+                hashed += 1
+            except Exception as e:
+                db.rollback()
+                logger.warning("Could not hash %s: %s", data_file.path, e)
+
+        return hashed
+
+    @classmethod
+    def get_checksums_by_exam_id(cls, db: Session, exam_id: int) -> Dict[str, str]:
+        """
+        Maps the path of every hashed file of the exam to its SHA-256.  When a path was
+        uploaded more than once the latest record wins, as its content is the one on disk.
+        """
+        rows = db.query(cls.path, cls.sha256).filter(
+            cls.exam_id == exam_id,
+            cls.sha256.isnot(None)
+        ).order_by(cls.id).all()
+        return {row.path: row.sha256 for row in rows}
+
+    @classmethod
+    def is_exam_fully_indexed(cls, db: Session, exam_id: int) -> bool:
+        """
+        True if every file of the exam is in PersonRowIndex, so a missing entry means the
+        person did not take the exam.
+        """
+        return db.query(cls.id).filter(
+            cls.exam_id == exam_id,
+            cls.row_index_built == False
+        ).first() is None
+
 
     @classmethod
     def get_files_by_exam_id(cls, db: Session, exam_id: int) -> dict:
@@ -100,21 +328,29 @@ class DataFile(Base):
             dict: A dictionary where the keys are creation years (in the Persian calendar)
                 and the values are lists of file paths for that year.
         """
-        # Query the database for all files related to the given exam_id
-        records = db.query(cls).filter(cls.exam_id == exam_id).all()
-
-        # Organize results into the desired dictionary format
-        files_by_year = {}
+        # Only year and path, already ordered by year (served by the (exam_id, jalali_year) index)
+        rows = db.query(cls.jalali_year, cls.path).filter(
+            cls.exam_id == exam_id
+        ).order_by(cls.jalali_year, cls.id).all()
 
-        for record in records:
-            # Extract the creation date and convert to Persian calendar year
-            persian_year = JalaliDatetime(record.created_at).year
+        return cls._group_paths_by_year(rows)
 
-            # Initialize the year's entry in the dictionary if it doesn't exist
-            if persian_year not in files_by_year:
-                files_by_year[persian_year] = []
-
-            # Append the file path to the corresponding year
-            files_by_year[persian_year].append(record.path)
+    @classmethod
+    async def get_files_by_exam_id_async(cls, db: AsyncSession, exam_id: int) -> dict:
+        """
+        Async version of get_files_by_exam_id.
+        """
+        result = await db.execute(
+            select(cls.jalali_year, cls.path)
+            .where(cls.exam_id == exam_id)
+            .order_by(cls.jalali_year, cls.id)
+        )
+        return cls._group_paths_by_year(result.all())
 
-        return files_by_year
+    @staticmethod
+    def _group_paths_by_year(rows) -> dict:
+        # Organize results into the desired dictionary format
+        return {
+            persian_year: [row.path for row in year_rows]
+            for persian_year, year_rows in groupby(rows, key=lambda row: row.jalali_year)
+        }
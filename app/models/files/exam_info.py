@@ -1,4 +1,5 @@
-from sqlalchemy import Column, String, Integer,UniqueConstraint
+from sqlalchemy import Column, String, Integer,UniqueConstraint, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import relationship,Session
 from app.database import Base
 from sqlalchemy.exc import IntegrityError
@@ -65,4 +66,12 @@ class ExamDetails(Base):
         Returns:
             list[dict]: List of dictionaries with exam ID and name.
         """
-        return db.query(cls.id, cls.title).all()
\ No newline at end of file
+        return db.query(cls.id, cls.title).all()
+
+    @classmethod
+    async def get_exam_list_async(cls, db: AsyncSession):
+        """
+        Async version of get_exam_list.
+        """
+        result = await db.execute(select(cls.id, cls.title))
+        return result.all()
@@ -0,0 +1,106 @@
+from sqlalchemy import Column, Integer, BigInteger, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship, Session, joinedload
+from app.database import Base
+from typing import Dict, Optional, Tuple
+
+
+class PersonRowIndex(Base):
+    """
+    Maps (exam_id, person_id) to the newest row of that person among the exam's feature files,
+    so a prediction reads a single row instead of scanning every CSV of the exam.
+    """
+    __tablename__ = "person_row_index"
+
+    id = Column(Integer, primary_key=True, index=True)
+    exam_id = Column(Integer, ForeignKey('exam_details.id'), nullable=False)
+    person_id = Column(Integer, nullable=False)
+    data_file_id = Column(Integer, ForeignKey('data_files.id', ondelete="CASCADE"), nullable=False)
+    jalali_year = Column(Integer, nullable=False)  # Persian year of the file, used to keep the newest row
+    row_number = Column(Integer, nullable=False)
+    byte_offset = Column(BigInteger, nullable=False)
+
+    __table_args__ = (UniqueConstraint('exam_id', 'person_id', name='_exam_person_uc'),)
+
+    data_file = relationship("DataFile")
+
+    @classmethod
+    def index_file(
+        cls,
+        db: Session,
+        exam_id: int,
+        data_file_id: int,
+        jalali_year: int,
+        offsets: Dict[int, Tuple[int, int]],
+        chunk_size: int = 500
+    ) -> int:
+        """
+        Adds the rows of one file to the index, keeping for every person the newest file:
+        the latest Persian year, and within a year the file that was stored first.
+
+        Args:
+            db (Session): SQLAlchemy database session.
+            exam_id (int): The exam the file belongs to.
+            data_file_id (int): ID of the DataFile being indexed.
+            jalali_year (int): Persian calendar year of the file.
+            offsets (dict): person_id -> (row number, byte offset) of the person's row in the file.
+
+        Returns:
+            int: Number of index entries created or updated (flushed, not committed).
+        """
+        person_ids = list(offsets.keys())
+        changed = 0
+
+        for start in range(0, len(person_ids), chunk_size):
+            chunk = person_ids[start:start + chunk_size]
+            existing = {
+                entry.person_id: entry
+                for entry in db.query(cls).filter(cls.exam_id == exam_id, cls.person_id.in_(chunk)).all()
+            }
+
+            for person_id in chunk:
+                row_number, byte_offset = offsets[person_id]
+                entry = existing.get(person_id)
+
+                if entry is None:
+                    db.add(cls(
+                        exam_id=exam_id,
+                        person_id=person_id,
+                        data_file_id=data_file_id,
+                        jalali_year=jalali_year,
+                        row_number=row_number,
+                        byte_offset=byte_offset
+                    ))
+                elif (jalali_year, -data_file_id) > (entry.jalali_year, -entry.data_file_id):
+                    entry.data_file_id = data_file_id
+                    entry.jalali_year = jalali_year
+                    entry.row_number = row_number
+                    entry.byte_offset = byte_offset
+                else:
+                    continue
+                changed += 1
+
+        db.flush()
+        return changed
+
+    @classmethod
+    def find_row(cls, db: Session, exam_id: int, person_id: int) -> Optional[Tuple[str, int, int]]:
+        """
+        Finds where the newest row of a person is stored.
+
+        Returns:
+            Optional[Tuple[str, int, int]]: (file path, row number, byte offset),
+                or None if the person is not indexed.
+        """
+        entry = (
+            db.query(cls)
+            .options(joinedload(cls.data_file))
+            .filter(cls.exam_id == exam_id, cls.person_id == person_id)
+            .first()
+        )
+        if entry is None:
+            return None
+        return entry.data_file.path, entry.row_number, entry.byte_offset
+
+    @classmethod
+    def delete_by_exam_id(cls, db: Session, exam_id: int) -> None:
+        db.query(cls).filter(cls.exam_id == exam_id).delete(synchronize_session=False)
@@ -1,7 +1,10 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime
-from sqlalchemy.orm import Session
+from sqlalchemy import Column, Integer, String, Float, DateTime, Index, UniqueConstraint, tuple_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, validates
 from khayyam import JalaliDatetime
 from datetime import datetime
+from itertools import groupby
+from typing import Dict, List, Tuple
 from app.database import Base
 
 class JobPerformance(Base):
@@ -14,6 +17,18 @@ class JobPerformance(Base):
     satisfaction_score = Column(Float, nullable=False)
     job_id = Column(Integer, nullable=False)  # The ID of the job
     created_at = Column(DateTime, nullable=False)  # Timestamp for when the record was created
+    jalali_year = Column(Integer, nullable=False)  # Persian year of created_at, kept in sync by set_jalali_year
+
+    __table_args__ = (
+        Index('ix_job_performance_job_id_jalali_year', 'job_id', 'jalali_year'),
+        # One record per person per Persian year; also serves (person_id, jalali_year) lookups
+        UniqueConstraint('person_id', 'jalali_year', name='_person_jalali_year_uc'),
+    )
+
+    @validates('created_at')
+    def set_jalali_year(self, key, created_at):
+        self.jalali_year = JalaliDatetime(created_at).year if created_at is not None else None
+        return created_at
 
     @classmethod
     def add_performance(cls, db: Session, person_id: int, job_efficiency_rank: float, 
@@ -48,15 +63,10 @@ class JobPerformance(Base):
             # Extract Jalali year from the provided date
             jalali_year = jalali_datetime.year
             
-            # Convert start and end of the Jalali year to Gregorian
-            start_of_year = JalaliDatetime(jalali_year, 1, 1).todatetime()
-            end_of_year = JalaliDatetime(jalali_year, 12, 29).todatetime()
-            
             # Check if a record for the same person_id already exists in the same Jalali year
-            existing_record = db.query(cls).filter(
+            existing_record = db.query(cls.id).filter(
                 cls.person_id == person_id,
-                cls.created_at >= start_of_year,
-                cls.created_at <= end_of_year
+                cls.jalali_year == jalali_year
             ).first()
 
             if existing_record:
@@ -130,17 +140,11 @@ class JobPerformance(Base):
             # Extract Jalali year
             jalali_year = jalali_datetime.year
 
-            # Convert start and end of the Jalali year to Gregorian
-            start_of_year = JalaliDatetime(jalali_year, 1, 1).todatetime()
-            # Handle Esfand (last month) dynamically to avoid day errors
-            end_of_year = JalaliDatetime(jalali_year, 12, 29).todatetime()
-
             # Query for the existing record within the same Jalali year
             record = db.query(cls).filter(
                 cls.person_id == person_id,
                 cls.job_id == job_id,
-                cls.created_at >= start_of_year,
-                cls.created_at <= end_of_year
+                cls.jalali_year == jalali_year
             ).first()
 
             if not record:
@@ -160,6 +164,70 @@ class JobPerformance(Base):
             raise ValueError(f"Error updating job performance: {e}")
 
 
+    @classmethod
+    def bulk_upsert(cls, db: Session, rows: List[Dict], chunk_size: int = 1000) -> Tuple[int, int]:
+        """
+        Inserts or updates many records in a single transaction.  A row whose (person_id,
+        jalali_year) already exists replaces that record's job, date and metrics.
+
+        Args:
+            db (Session): SQLAlchemy database session.
+            rows (list): Validated rows with person_id, job_id, created_at (Gregorian datetime),
+                jalali_year, job_efficiency_rank, improvement_rank and satisfaction_score.
+            chunk_size (int): Rows per INSERT statement.
+
+        Returns:
+            Tuple[int, int]: Number of inserted and of updated records.
+        """
+        update_columns = ['job_id', 'created_at', 'job_efficiency_rank', 'improvement_rank', 'satisfaction_score']
+        dialect = db.get_bind().dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            insert = None
+
+        inserted = updated = 0
+        try:
+            for start in range(0, len(rows), chunk_size):
+                chunk = rows[start:start + chunk_size]
+                keys = [(row['person_id'], row['jalali_year']) for row in chunk]
+                existing = {
+                    (person_id, jalali_year): record_id
+                    for record_id, person_id, jalali_year in db.query(cls.id, cls.person_id, cls.jalali_year)
+                    .filter(tuple_(cls.person_id, cls.jalali_year).in_(keys)).all()
+                }
+
+                if insert is not None:
+                    statement = insert(cls.__table__).values(chunk)
+                    statement = statement.on_conflict_do_update(
+                        index_elements=['person_id', 'jalali_year'],
+                        set_={column: statement.excluded[column] for column in update_columns}
+                    )
+                    db.execute(statement)
+                else:
+                    new_rows = [row for row in chunk if (row['person_id'], row['jalali_year']) not in existing]
+                    if new_rows:
+                        db.execute(cls.__table__.insert(), new_rows)
+                    for row in chunk:
+                        record_id = existing.get((row['person_id'], row['jalali_year']))
+                        if record_id is not None:
+                            db.query(cls).filter(cls.id == record_id).update(
+                                {column: row[column] for column in update_columns}, synchronize_session=False
+                            )
+
+                updated += len(existing)
+                inserted += len(chunk) - len(existing)
+
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        return inserted, updated
+
+
     @classmethod
     def get_performance_by_job_and_date(cls, db: Session, job_id: int, performance_metric: str):
         """
@@ -179,32 +247,27 @@ class JobPerformance(Base):
             ValueError: If the performance_metric is not valid.
         """
         # Validate the requested performance metric
-        if performance_metric not in ['job_efficiency_rank', 'improvement_rank', 'satisfaction_score']:
-            raise ValueError(
-                "Invalid performance_metric. Choose from 'job_efficiency_rank', 'improvement_rank', 'satisfaction_score'."
-            )
-
-        # Query the database for all records with the given job_id
-        records = db.query(cls).filter(cls.job_id == job_id).all()
+        cls._check_performance_metric(performance_metric)
 
-        # Organize results into the desired dictionary format
-        performance_by_year = {}
+        # Only the needed columns, already ordered by year (served by the (job_id, jalali_year) index)
+        rows = db.query(
+            cls.jalali_year, cls.person_id, getattr(cls, performance_metric).label('performance_value')
+        ).filter(cls.job_id == job_id).order_by(cls.jalali_year, cls.id).all()
 
-        for record in records:
-            # Extract the Persian calendar year from the created_at field
-            persian_year = JalaliDatetime(record.created_at).year
+        return cls._group_by_year(rows, ('person_id', 'performance_value'))
 
-            # Initialize the year's entry in the dictionary if it doesn't exist
-            if persian_year not in performance_by_year:
-                performance_by_year[persian_year] = []
-
-            # Append the person's data with the requested performance metric
-            performance_by_year[persian_year].append({
-                'person_id': record.person_id,
-                'performance_value': getattr(record, performance_metric)
-            })
-
-        return performance_by_year
+    @classmethod
+    async def get_performance_by_job_and_date_async(cls, db: AsyncSession, job_id: int, performance_metric: str):
+        """
+        Async version of get_performance_by_job_and_date.
+        """
+        cls._check_performance_metric(performance_metric)
+        result = await db.execute(
+            select(cls.jalali_year, cls.person_id, getattr(cls, performance_metric).label('performance_value'))
+            .where(cls.job_id == job_id)
+            .order_by(cls.jalali_year, cls.id)
+        )
+        return cls._group_by_year(result.all(), ('person_id', 'performance_value'))
 
 
     @classmethod
@@ -226,48 +289,67 @@ class JobPerformance(Base):
             ValueError: If the performance_metric is not valid.
         """
         # Validate the requested performance metric
+        cls._check_performance_metric(performance_metric)
+
+        # Only the needed columns, already ordered by year (served by the (job_id, jalali_year) index)
+        rows = db.query(
+            cls.jalali_year, cls.job_id, cls.person_id, getattr(cls, performance_metric).label('performance_value')
+        ).filter(cls.job_id.in_(job_ids)).order_by(cls.jalali_year, cls.id).all()
+
+        return cls._group_by_year(rows, ('job_id', 'person_id', 'performance_value'))
+
+    @classmethod
+    async def get_performance_by_jobs_and_date_async(cls, db: AsyncSession, job_ids: list, performance_metric: str):
+        """
+        Async version of get_performance_by_jobs_and_date.
+        """
+        cls._check_performance_metric(performance_metric)
+        result = await db.execute(
+            select(cls.jalali_year, cls.job_id, cls.person_id, getattr(cls, performance_metric).label('performance_value'))
+            .where(cls.job_id.in_(job_ids))
+            .order_by(cls.jalali_year, cls.id)
+        )
+        return cls._group_by_year(result.all(), ('job_id', 'person_id', 'performance_value'))
+
+    @staticmethod
+    def _check_performance_metric(performance_metric: str) -> None:
         if performance_metric not in ['job_efficiency_rank', 'improvement_rank', 'satisfaction_score']:
             raise ValueError(
                 "Invalid performance_metric. Choose from 'job_efficiency_rank', 'improvement_rank', 'satisfaction_score'."
             )
 
-        # Query the database for all records with the given job_ids
-        records = db.query(cls).filter(cls.job_id.in_(job_ids)).all()
-
-        # Organize results into the desired dictionary format
-        performance_by_year = {}
-
-        for record in records:
-            # Extract the Persian calendar year from the created_at field
-            persian_year = JalaliDatetime(record.created_at).year
-
-            # Initialize the year's entry in the dictionary if it doesn't exist
-            if persian_year not in performance_by_year:
-                performance_by_year[persian_year] = []
-
-            # Append the job_id, person's data, and the requested performance metric
-            performance_by_year[persian_year].append({
-                'job_id': record.job_id,
-                'person_id': record.person_id,
-                'performance_value': getattr(record, performance_metric)
-            })
-
-        return performance_by_year
+    @staticmethod
+    def _group_by_year(rows, fields: Tuple[str, ...]) -> Dict[int, List[Dict]]:
+        # Organize rows ordered by jalali_year into {year: [{field: value}]}
+        return {
+            persian_year: [{field: getattr(row, field) for field in fields} for row in year_rows]
+            for persian_year, year_rows in groupby(rows, key=lambda row: row.jalali_year)
+        }
     
     @classmethod
     def get_performance_by_person_and_year(cls, db: Session, person_id: int, year: int):
         """
         Retrieves the performance records of a specific person for a given Jalali year.
         """
-        start_of_year = JalaliDatetime(year, 1, 1).todatetime()
-        end_of_year = JalaliDatetime(year, 12, 29).todatetime()
-
         records = db.query(cls).filter(
             cls.person_id == person_id,
-            cls.created_at >= start_of_year,
-            cls.created_at <= end_of_year
+            cls.jalali_year == year
         ).all()
 
+        return cls._records_to_dicts(records)
+
+    @classmethod
+    async def get_performance_by_person_and_year_async(cls, db: AsyncSession, person_id: int, year: int):
+        """
+        Async version of get_performance_by_person_and_year.
+        """
+        result = await db.execute(
+            select(cls).where(cls.person_id == person_id, cls.jalali_year == year)
+        )
+        return cls._records_to_dicts(result.scalars().all())
+
+    @staticmethod
+    def _records_to_dicts(records) -> List[Dict]:
         return [
             {
                 'job_id': record.job_id,
@@ -0,0 +1,216 @@
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Sequence, Tuple
+
+# Name of the sidecar directory written next to every uploaded feature file
+SIDECAR_SUFFIX = ".columns"
+SCHEMA_FILENAME = "schema.json"
+
+
+def get_sidecar_path(csv_path: str) -> str:
+    """
+    Return the directory holding the columnar copy of a CSV file.
+    """
+    return csv_path + SIDECAR_SUFFIX
+
+
+def encode_column(name: str, values: pd.Series) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Convert a column to a fixed-dtype array that can be saved and memory-mapped.
+
+    Numerical and boolean columns keep their pandas dtype. Text columns become fixed-width
+    unicode arrays with nulls stored as "" and returned separately as a null mask.
+
+    Returns:
+        Tuple[np.ndarray, Optional[np.ndarray]]: The values and the null mask (None for non-text columns).
+
+    Raises:
+        ValueError: If the column holds values that cannot be stored with a fixed dtype.
+    """
+    if values.dtype == object:
+        null_mask = values.isna().to_numpy()
+        present = values[~null_mask]
+        if not all(isinstance(value, str) for value in present):
+            raise ValueError(f"Column '{name}' mixes text and non-text values.")
+        return values.where(~null_mask, "").to_numpy(dtype=str), null_mask
+
+    array = values.to_numpy()
+    if array.dtype.kind not in "biuf":
+        raise ValueError(f"Column '{name}' has unsupported dtype {array.dtype}.")
+    return array, None
+
+
+def decode_column(values: np.ndarray, null_mask: Optional[np.ndarray]) -> np.ndarray:
+    """
+    Inverse of encode_column: text columns come back as object arrays with NaN for nulls.
+    """
+    if null_mask is None:
+        return values
+    values = values.astype(object)
+    values[null_mask] = np.nan
+    return values
+
+
+def write_columnar(csv_path: str) -> str:
+    """
+    Convert a feature CSV into a typed columnar sidecar: one .npy file per column plus a
+    schema.json describing names, dtypes and the source file it was built from.
+
+    Numerical and boolean columns keep their pandas dtype. Text columns are stored as
+    fixed-width unicode arrays with a separate null mask, so every column can be memory-mapped.
+
+    Concurrent writers each build their own copy; a writer that finds an up-to-date
+    sidecar already in place keeps it, so readers never see it removed.
+
+    Returns:
+        str: Path of the sidecar directory.
+
+    Raises:
+        ValueError: If a column holds values that cannot be stored with a fixed dtype.
+    """
+    df = pd.read_csv(csv_path)
+    source = os.stat(csv_path)
+
+    sidecar_path = get_sidecar_path(csv_path)
+    tmp_path = tempfile.mkdtemp(
+        prefix=os.path.basename(sidecar_path) + ".", suffix=".tmp", dir=os.path.dirname(sidecar_path)
+    )
+
+    try:
+        schema_columns = []
+        for idx, name in enumerate(df.columns):
+            column = {"name": name, "file": f"{idx}.npy", "null_file": None}
+
+            array, null_mask = encode_column(name, df[name])
+            if null_mask is not None:
+                column["null_file"] = f"{idx}.null.npy"
+                np.save(os.path.join(tmp_path, column["null_file"]), null_mask)
+
+            column["dtype"] = array.dtype.str
+            np.save(os.path.join(tmp_path, column["file"]), array)
+            schema_columns.append(column)
+
+        schema = {
+            "n_rows": len(df),
+            "columns": schema_columns,
+            "source_size": source.st_size,
+            "source_mtime_ns": source.st_mtime_ns,
+        }
+        # The schema is written last: a sidecar without one is never read
+        with open(os.path.join(tmp_path, SCHEMA_FILENAME), "w") as f:
+            json.dump(schema, f)
+
+        _install_sidecar(csv_path, tmp_path, sidecar_path)
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+    return sidecar_path
+
+
+def _install_sidecar(csv_path: str, tmp_path: str, sidecar_path: str) -> None:
+    while True:
+        try:
+            # Renaming onto an existing (non-empty) directory fails, so only one writer wins
+            os.rename(tmp_path, sidecar_path)
+            return
+        except OSError:
+            if not os.path.isdir(sidecar_path):
+                raise
+        if load_schema(csv_path) is not None:
+            return  # Another writer already stored an up-to-date copy
+        # A stale sidecar: move it aside so the rename can succeed
+        stale_path = tempfile.mkdtemp(
+            prefix=os.path.basename(sidecar_path) + ".", suffix=".old", dir=os.path.dirname(sidecar_path)
+        )
+        try:
+            os.replace(sidecar_path, os.path.join(stale_path, "sidecar"))
+        except FileNotFoundError:
+            pass  # Another writer moved it already
+        shutil.rmtree(stale_path, ignore_errors=True)
+
+
+def load_schema(csv_path: str) -> Optional[Dict]:
+    """
+    Return the sidecar schema of a CSV file, or None if it has no up-to-date sidecar.
+    """
+    schema_path = os.path.join(get_sidecar_path(csv_path), SCHEMA_FILENAME)
+    try:
+        with open(schema_path, "r") as f:
+            schema = json.load(f)
+        source = os.stat(csv_path)
+    except (OSError, ValueError):
+        return None
+
+    # A replaced CSV makes its old sidecar stale
+    if schema.get("source_size") != source.st_size or schema.get("source_mtime_ns") != source.st_mtime_ns:
+        return None
+    return schema
+
+
+def open_columns(csv_path: str, columns: Sequence[str] = None) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Memory-map the stored columns of a CSV file without copying them.
+
+    Text columns are returned as raw unicode arrays (nulls stored as ""); use read_rows to
+    get pandas-compatible values.
+
+    Returns:
+        Optional[Dict[str, np.ndarray]]: Column name -> read-only memory-mapped array,
+            or None if the file has no up-to-date sidecar.
+    """
+    schema = load_schema(csv_path)
+    if schema is None:
+        return None
+
+    sidecar_path = get_sidecar_path(csv_path)
+    try:
+        return {
+            column["name"]: np.load(os.path.join(sidecar_path, column["file"]), mmap_mode="r")
+            for column in schema["columns"]
+            if columns is None or column["name"] in columns
+        }
+    except FileNotFoundError:
+        return None  # A stale sidecar being replaced
+
+
+def read_rows(csv_path: str, row_numbers: Sequence[int] = None) -> Optional[pd.DataFrame]:
+    """
+    Read selected rows (or the whole table) from the sidecar as a DataFrame with the same
+    columns and dtypes pd.read_csv produces.
+
+    Returns:
+        Optional[pd.DataFrame]: The rows, or None if the file has no up-to-date sidecar.
+    """
+    schema = load_schema(csv_path)
+    if schema is None:
+        return None
+
+    sidecar_path = get_sidecar_path(csv_path)
+    rows = slice(None) if row_numbers is None else np.asarray(row_numbers, dtype=np.intp)
+
+    data = {}
+    try:
+        for column in schema["columns"]:
+            values = np.load(os.path.join(sidecar_path, column["file"]), mmap_mode="r")[rows]
+            null_mask = None
+            if column["null_file"] is not None:
+                null_mask = np.load(os.path.join(sidecar_path, column["null_file"]), mmap_mode="r")[rows]
+            data[column["name"]] = decode_column(values, null_mask)
+    except FileNotFoundError:
+        return None  # A stale sidecar being replaced
+
+    return pd.DataFrame(data, columns=[column["name"] for column in schema["columns"]])
+
+
+def load_feature_frame(csv_path: str) -> pd.DataFrame:
+    """
+    Load a whole feature file, from its sidecar when available and from the CSV otherwise.
+    """
+    df = read_rows(csv_path)
+    if df is None:
+        df = pd.read_csv(csv_path)
+    return df
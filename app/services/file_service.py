@@ -1,5 +1,13 @@
+import hashlib
+import io
 import os
+import threading
+import numpy as np
+import pandas as pd
+from typing import Any, BinaryIO, Dict, NamedTuple, Tuple
 from fastapi import UploadFile
+from app.config import settings
+from app.logger import logger
 
 # تعیین مسیر اصلی برنامه (دایرکتوری جاری فایل پایتون)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -10,6 +18,12 @@ UPLOAD_DIR_NAME = "uploaded_files"
 # مسیر کامل برای ذخیره‌سازی فایل‌ها
 UPLOAD_DIR = os.path.join(BASE_DIR, UPLOAD_DIR_NAME)
 
+# Uploads are stored once per content, as blobs/<first 2 hex digits>/<sha256>
+BLOB_DIR_NAME = "blobs"
+
+# Person row offsets of a file are cached next to it under this suffix
+ROW_OFFSETS_SUFFIX = ".rows.npz"
+
 
 def ensure_directory_exists(directory: str) -> None:
     """
@@ -23,18 +37,206 @@ def get_upload_path(title: str) -> str:
     """
     return os.path.join(UPLOAD_DIR, title)
 
-def save_file_to_disk(file: UploadFile, title: str) -> str:
+class StoredFile(NamedTuple):
+    path: str
+    size: int  # Bytes
+    sha256: str  # Hex digest of the content
+
+
+def get_blob_path(sha256: str) -> str:
     """
-    Save the uploaded file to the disk inside a designated directory and return the file path.
+    Generate the path of the blob storing content with the given SHA-256.
+    """
+    return os.path.join(UPLOAD_DIR, BLOB_DIR_NAME, sha256[:2], sha256)
+
+
+def is_blob_path(file_path: str) -> bool:
+    """
+    True if file_path is a content-addressed blob rather than a per-exam upload.
+    """
+    blob_root = os.path.join(UPLOAD_DIR, BLOB_DIR_NAME)
+    return os.path.dirname(os.path.dirname(os.path.abspath(file_path))) == os.path.abspath(blob_root)
+
+
+def _temp_path(file_path: str) -> str:
+    return f"{file_path}.{os.getpid()}.{threading.get_ident()}.part"
+
+
+def _copy_hashing(source: BinaryIO, tmp_path: str, chunk_size: int = None) -> Tuple[int, str]:
+    chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE
+    digest = hashlib.sha256()
+    size = 0
+    with open(tmp_path, "wb") as f:
+        for chunk in iter(lambda: source.read(chunk_size), b""):
+            digest.update(chunk)
+            f.write(chunk)
+            size += len(chunk)
+        f.flush()
+        os.fsync(f.fileno())
+    return size, digest.hexdigest()
+
+
+def stream_to_file(source: BinaryIO, file_path: str, chunk_size: int = None) -> Tuple[int, str]:
+    """
+    Copy source to file_path in chunks of chunk_size bytes, hashing the data as it passes.
+
+    The data is written to a temporary file next to file_path that is renamed into place once
+    complete, so readers never see a partially written file.  Blocking: call it from a worker
+    thread, not from the event loop.
+
+    Returns:
+        Tuple[int, str]: Number of bytes written and their SHA-256 hex digest.
+    """
+    tmp_path = _temp_path(file_path)
+    try:
+        size, sha256 = _copy_hashing(source, tmp_path, chunk_size)
+        os.replace(tmp_path, file_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return size, sha256
+
+
+def store_blob(source: BinaryIO, chunk_size: int = None) -> StoredFile:
+    """
+    Stream source into the content-addressed blob store, like stream_to_file.  Content that is
+    already stored is not written again, so every upload of the same bytes (and everything
+    derived from them, such as the columnar sidecar) shares one blob.
+
+    Returns:
+        StoredFile: Path, size and SHA-256 of the blob.
+    """
+    blob_root = os.path.join(UPLOAD_DIR, BLOB_DIR_NAME)
+    ensure_directory_exists(blob_root)
+
+    tmp_path = _temp_path(os.path.join(blob_root, "upload"))
+    try:
+        size, sha256 = _copy_hashing(source, tmp_path, chunk_size)
+        blob_path = get_blob_path(sha256)
+        if os.path.exists(blob_path) and os.path.getsize(blob_path) == size:
+            logger.info("Upload matches stored blob %s", sha256)
+        else:
+            ensure_directory_exists(os.path.dirname(blob_path))
+            os.replace(tmp_path, blob_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return StoredFile(blob_path, size, sha256)
+
+
+def store_upload(file: UploadFile, title: str) -> StoredFile:
+    """
+    Stream the uploaded file to disk inside a designated directory.
+
+    Returns:
+        StoredFile: Path, size and SHA-256 of the stored file.
     """
     try:
         upload_path = get_upload_path(title)
         ensure_directory_exists(upload_path)
 
         file_path = os.path.join(upload_path, file.filename)
-        with open(file_path, "wb") as f:
-            f.write(file.file.read())
+        size, sha256 = stream_to_file(file.file, file_path)
 
-        return file_path
+        return StoredFile(file_path, size, sha256)
     except Exception as e:
         raise RuntimeError(f"Failed to save file: {str(e)}")
+
+
+def save_file_to_disk(file: UploadFile, title: str) -> str:
+    """
+    Save the uploaded file to the disk inside a designated directory and return the file path.
+    """
+    return store_upload(file, title).path
+
+
+def file_sha256(file_path: str, chunk_size: int = None) -> str:
+    """
+    SHA-256 hex digest of a file on disk, read in chunks.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size or settings.UPLOAD_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_person_row_offsets(file_path: str) -> Dict[int, Tuple[int, int]]:
+    """
+    Map every person_id of a feature CSV to the (row number, byte offset) of its first row.
+
+    Raises:
+        ValueError: If the file has no person_id column or its rows cannot be located by
+            line (e.g. quoted values spanning several lines).
+    """
+    person_ids = pd.read_csv(file_path, usecols=['person_id'])['person_id'].tolist()
+
+    line_offsets = []
+    with open(file_path, "rb") as f:
+        f.readline()  # header
+        offset = f.tell()
+        for line in iter(f.readline, b""):
+            if line.strip():
+                line_offsets.append(offset)
+            offset += len(line)
+
+    if len(line_offsets) != len(person_ids):
+        raise ValueError(f"Rows of {file_path} cannot be indexed by line offset.")
+
+    offsets = {}
+    for row_number, (person_id, byte_offset) in enumerate(zip(person_ids, line_offsets)):
+        offsets.setdefault(int(person_id), (row_number, byte_offset))
+    return offsets
+
+
+def load_person_row_offsets(file_path: str) -> Dict[int, Tuple[int, int]]:
+    """
+    build_person_row_offsets, cached in a file next to file_path so files that share a blob
+    are scanned once.  The cache is ignored once the file's size or mtime changes.
+    """
+    cache_path = file_path + ROW_OFFSETS_SUFFIX
+    source = os.stat(file_path)
+    signature = [source.st_size, source.st_mtime_ns]
+
+    try:
+        with np.load(cache_path, allow_pickle=False) as stored:
+            if stored["source"].tolist() == signature:
+                return {
+                    int(person_id): (int(row_number), int(byte_offset))
+                    for person_id, row_number, byte_offset in stored["offsets"].tolist()
+                }
+    except (OSError, ValueError, KeyError):
+        pass
+
+    offsets = build_person_row_offsets(file_path)
+    table = np.array(
+        [(person_id, row_number, byte_offset) for person_id, (row_number, byte_offset) in offsets.items()],
+        dtype=np.int64
+    ).reshape(-1, 3)
+
+    # np.savez appends .npz to names without it; write the temp file under its final suffix
+    tmp_path = _temp_path(cache_path) + ".npz"
+    try:
+        np.savez(tmp_path, source=np.array(signature, dtype=np.int64), offsets=table)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning("Could not cache row offsets of %s: %s", file_path, e)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return offsets
+
+
+def read_row_at_offset(file_path: str, byte_offset: int) -> Dict[str, Any]:
+    """
+    Read a single CSV row starting at byte_offset, parsed with the file's header.
+    """
+    with open(file_path, "rb") as f:
+        header = f.readline()
+        f.seek(byte_offset)
+        line = f.readline()
+
+    return pd.read_csv(io.BytesIO(header + line)).to_dict(orient='records')[0]
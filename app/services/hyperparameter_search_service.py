@@ -0,0 +1,143 @@
+import math
+import time
+import numpy as np
+from typing import Any, Dict, List, Optional, Tuple
+from sklearn.model_selection import GridSearchCV, ParameterGrid, ParameterSampler
+from app.utils.train_helper_method import SearchStrategy
+
+# Number of surviving candidates is divided by this factor at every successive-halving rung
+HALVING_FACTOR = 3
+
+
+class _Deadline:
+    def __init__(self, time_budget: Optional[float]):
+        self.end = time.monotonic() + time_budget if time_budget else None
+
+    def passed(self) -> bool:
+        return self.end is not None and time.monotonic() >= self.end
+
+
+def _evaluate_candidates(
+    estimator, X, Y, candidates: List[Dict[str, Any]], cv: int, n_jobs: int, deadline: _Deadline
+) -> Tuple[List[Tuple[Dict[str, Any], float]], int]:
+    """
+    Cross-validates candidates in batches of n_jobs, stopping early once the deadline passes.
+
+    Returns:
+        Tuple: ([(params, mean CV accuracy)] for the evaluated candidates, number of fits performed)
+    """
+    scores, n_fits = [], 0
+    batch_size = max(1, n_jobs)
+
+    for start in range(0, len(candidates), batch_size):
+        if deadline.passed():
+            break
+        batch = candidates[start:start + batch_size]
+        search = GridSearchCV(
+            estimator=estimator,
+            param_grid=[{key: [value] for key, value in params.items()} for params in batch],
+            cv=cv,
+            scoring='accuracy',
+            n_jobs=n_jobs,
+            refit=False
+        )
+        search.fit(X, Y)
+        n_fits += len(batch) * search.n_splits_
+
+        for params, score in zip(search.cv_results_['params'], search.cv_results_['mean_test_score']):
+            # Failed fits score NaN and must never be picked
+            scores.append((params, -np.inf if np.isnan(score) else float(score)))
+
+    return scores, n_fits
+
+
+def _best(scores: List[Tuple[Dict[str, Any], float]]) -> Dict[str, Any]:
+    # max() keeps the first of equal scores, matching GridSearchCV's tie-breaking
+    return max(scores, key=lambda item: item[1])[0] if scores else {}
+
+
+def _stratified_rows(class_orders: List[np.ndarray], n_samples: int, n_resources: int, cv: int) -> np.ndarray:
+    """
+    The first rows of every class's random order, in proportion to the class's share of the
+    data but at least cv of them, so every CV split of the subsample sees every class.  Growing
+    n_resources only adds rows, so each rung's subsample contains the previous one.
+    """
+    rows = [order[:max(cv, round(n_resources * len(order) / n_samples))] for order in class_orders]
+    return np.sort(np.concatenate(rows))
+
+
+def _successive_halving(estimator, X, Y, candidates, cv, n_jobs, num_classes, deadline):
+    """
+    Evaluates every candidate on a small random subsample, stratified by Y, then keeps the best
+    1/HALVING_FACTOR and triples the subsample, so the last few candidates are compared on the
+    whole training set.
+    """
+    n_samples = len(X)
+    # Rungs needed to narrow the candidates down; the last one is fitted on every row
+    n_rungs = 1
+    while HALVING_FACTOR ** n_rungs < len(candidates):
+        n_rungs += 1
+    min_resources = max(n_samples // HALVING_FACTOR ** (n_rungs - 1), cv * max(num_classes or 2, 2))
+    labels = np.asarray(Y)
+    class_orders = [np.random.permutation(np.flatnonzero(labels == label)) for label in np.unique(labels)]
+
+    best_params, n_fits = {}, 0
+    for rung in range(n_rungs):
+        n_resources = n_samples if rung == n_rungs - 1 else min(n_samples, min_resources * HALVING_FACTOR ** rung)
+        rows = _stratified_rows(class_orders, n_samples, n_resources, cv)
+        scores, rung_fits = _evaluate_candidates(
+            estimator, X.iloc[rows], Y.iloc[rows], candidates, cv, n_jobs, deadline
+        )
+        n_fits += rung_fits
+        if scores:
+            best_params = _best(scores)
+
+        if deadline.passed() or len(candidates) == 1 or n_resources == n_samples:
+            break
+        ranked = sorted(scores, key=lambda item: item[1], reverse=True)
+        candidates = [params for params, _ in ranked[:math.ceil(len(ranked) / HALVING_FACTOR)]]
+
+    return best_params, n_fits
+
+
+def search_hyperparameters(
+    estimator,
+    X,
+    Y,
+    param_grid: Dict[str, List[Any]],
+    strategy: SearchStrategy = SearchStrategy.EXHAUSTIVE,
+    n_iter: int = 10,
+    time_budget: Optional[float] = None,
+    n_jobs: int = 1,
+    num_classes: Optional[int] = None,
+    cv: int = 5
+) -> Tuple[Dict[str, Any], int]:
+    """
+    Searches param_grid for the parameters with the best cross-validated accuracy.
+
+    Parameters:
+        estimator: Unfitted sklearn-compatible estimator.
+        param_grid (dict): Parameter name -> list of values to try.
+        strategy (SearchStrategy): exhaustive (every combination), randomized (n_iter sampled
+            combinations) or successive_halving (every combination, pruned on growing subsamples).
+        time_budget (float): Wall-clock seconds after which no new batch of candidates is started;
+            the best candidate evaluated so far is returned.  None means no limit.
+        n_jobs (int): Workers fitting the CV folds.
+
+    Returns:
+        Tuple[dict, int]: Best parameters and the number of model fits performed.
+    """
+    deadline = _Deadline(time_budget)
+    candidates = list(ParameterGrid(param_grid))
+
+    if strategy == SearchStrategy.RANDOMIZED:
+        # Seeded from the global RNG, so train_model's per-iteration seeds fix the sample
+        n_iter = min(n_iter, len(candidates))
+        candidates = list(ParameterSampler(
+            param_grid, n_iter=n_iter, random_state=np.random.randint(np.iinfo(np.int32).max)
+        ))
+    elif strategy == SearchStrategy.SUCCESSIVE_HALVING:
+        return _successive_halving(estimator, X, Y, candidates, cv, n_jobs, num_classes, deadline)
+
+    scores, n_fits = _evaluate_candidates(estimator, X, Y, candidates, cv, n_jobs, deadline)
+    return _best(scores), n_fits
@@ -0,0 +1,123 @@
+import io
+import numpy as np
+import pandas as pd
+from khayyam import JalaliDatetime
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional, Union
+from app.models.job_performance.job_performance import JobPerformance
+
+METRIC_COLUMNS = ['job_efficiency_rank', 'improvement_rank', 'satisfaction_score']
+ID_COLUMNS = ['person_id', 'job_id']
+REQUIRED_COLUMNS = ID_COLUMNS + METRIC_COLUMNS + ['created_at']
+
+# Same inclusive bounds as the single-record /add endpoint
+LOWER_BOUND = 0
+UPPER_BOUND = 100
+
+
+def parse_performance_csv(content: Union[bytes, str]) -> pd.DataFrame:
+    """
+    Reads a CSV of performance records whose header uses the REQUIRED_COLUMNS names.
+    Every value is kept as text; validate_performance_rows does the type checks.
+    """
+    if isinstance(content, bytes):
+        content = content.decode('utf-8-sig')
+    return pd.read_csv(io.StringIO(content), dtype=str, keep_default_na=False)
+
+
+def _parse_jalali_date(value: Any) -> Optional[JalaliDatetime]:
+    for date_format in ("%Y/%m/%d", "%Y-%m-%d"):
+        try:
+            return JalaliDatetime.strptime(str(value).strip(), date_format)
+        except ValueError:
+            continue
+    return None
+
+
+def validate_performance_rows(df: pd.DataFrame):
+    """
+    Checks every row at once: IDs are integers, metrics are numbers within
+    [LOWER_BOUND, UPPER_BOUND], created_at is a Jalali date and no person appears twice for
+    the same Jalali year.
+
+    Returns:
+        tuple: (rows ready for JobPerformance.bulk_upsert,
+                [{'row': position in the input, 'errors': [...]}] for rejected rows)
+    """
+    missing = [column for column in REQUIRED_COLUMNS if column not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+    df = df.reset_index(drop=True)
+    errors = pd.DataFrame('', index=df.index, columns=REQUIRED_COLUMNS + ['duplicate'])
+    values = {}
+
+    for column in ID_COLUMNS + METRIC_COLUMNS:
+        raw = df[column].replace('', np.nan)
+        numbers = pd.to_numeric(raw, errors='coerce')
+        errors.loc[numbers.isna(), column] = f"{column} is missing or not a number"
+        if column in ID_COLUMNS:
+            not_integer = numbers.notna() & (numbers % 1 != 0)
+            errors.loc[not_integer, column] = f"{column} must be an integer"
+        else:
+            out_of_bounds = numbers.notna() & ((numbers < LOWER_BOUND) | (numbers > UPPER_BOUND))
+            errors.loc[out_of_bounds, column] = f"{column} must be between {LOWER_BOUND} and {UPPER_BOUND}"
+        values[column] = numbers
+
+    # Dates repeat heavily (usually one per year), so each distinct string is parsed once
+    dates = df['created_at'].map({value: _parse_jalali_date(value) for value in df['created_at'].unique()})
+    errors.loc[dates.isna(), 'created_at'] = "created_at must be a Jalali date (YYYY/MM/DD)"
+    jalali_years = dates.map(lambda date: date.year if date is not None else None)
+
+    valid = (errors == '').all(axis=1)
+    duplicated = valid & pd.Series(
+        list(zip(values['person_id'], jalali_years)), index=df.index
+    ).duplicated(keep='first')
+    errors.loc[duplicated, 'duplicate'] = "person_id already appears in this batch for the same Jalali year"
+    valid &= ~duplicated
+
+    rows = [
+        {
+            'person_id': int(values['person_id'][i]),
+            'job_id': int(values['job_id'][i]),
+            'job_efficiency_rank': float(values['job_efficiency_rank'][i]),
+            'improvement_rank': float(values['improvement_rank'][i]),
+            'satisfaction_score': float(values['satisfaction_score'][i]),
+            'created_at': dates[i].todatetime(),
+            'jalali_year': int(jalali_years[i]),
+        }
+        for i in df.index[valid]
+    ]
+    rejected = [
+        {'row': int(i), 'errors': [message for message in errors.loc[i] if message]}
+        for i in df.index[~valid]
+    ]
+    return rows, rejected
+
+
+def ingest_performances(db: Session, records: Union[pd.DataFrame, List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Validates job performance records and upserts the valid ones in one transaction.
+
+    Args:
+        db (Session): SQLAlchemy database session.
+        records: A DataFrame or a list of dicts with the REQUIRED_COLUMNS fields.
+
+    Returns:
+        dict: Counts of received, inserted, updated and rejected rows, and the rejects.
+    """
+    df = records if isinstance(records, pd.DataFrame) else pd.DataFrame(list(records))
+    if df.empty:
+        return {"received": 0, "inserted": 0, "updated": 0, "rejected": 0, "rejects": []}
+
+    df = df.astype(object).where(df.notna(), '').astype(str)
+    rows, rejected = validate_performance_rows(df)
+    inserted, updated = JobPerformance.bulk_upsert(db, rows) if rows else (0, 0)
+
+    return {
+        "received": len(df),
+        "inserted": inserted,
+        "updated": updated,
+        "rejected": len(rejected),
+        "rejects": rejected,
+    }
@@ -0,0 +1,128 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+from app.database import SessionLocal
+from app.logger import logger
+from app.models.AI.ModelDetails import ModelDetails
+from app.services.prediction_service import build_model_input
+from app.utils.executors import BoundedExecutor, cpu_executor
+from app.utils.predict_helper_method import find_essential_parameter
+
+
+def synthetic_person(result: dict) -> Dict[str, Any]:
+    """
+    A made-up person with every base feature of a model: the minimum of normalized columns,
+    the first known category of one-hot columns and 0 for anything else.
+    """
+    normalization_params = result["normalization_params"] or {}
+    one_hot_mappings = result["one_hot_mappings"] or {}
+    person = {}
+    for feature in result["base_feature"] or []:
+        if feature in normalization_params:
+            person[feature] = normalization_params[feature]["min"]
+        elif one_hot_mappings.get(feature):
+            person[feature] = one_hot_mappings[feature][0]
+        else:
+            person[feature] = 0
+    return person
+
+
+def warm_up_model(model_id: int) -> None:
+    """
+    Loads a model into the model cache and runs one predict on a synthetic person, so the
+    first real request finds the model unpickled, its transformer compiled and the predict
+    code paths initialized.
+    """
+    db = SessionLocal()
+    try:
+        result = find_essential_parameter(model_id, db)
+    finally:
+        db.close()
+
+    model_input = build_model_input(result["name_object_predict_in_card"], synthetic_person(result), result)
+    result["model"].predict(model_input)
+
+
+class ModelWarmup:
+    """
+    Startup phase that loads the pinned models and the most recently evaluated ones in
+    parallel.  The application is live as soon as it starts and ready once this phase has
+    finished; a model that fails to warm up is reported but does not block readiness.
+    """
+
+    def __init__(self, executor: BoundedExecutor, recent_models: int, pinned_model_ids: List[int], concurrency: int):
+        self.executor = executor
+        self.recent_models = recent_models
+        self.pinned_model_ids = list(pinned_model_ids)
+        self.concurrency = max(1, concurrency)
+        self.status = "pending"
+        self.models: Dict[int, Dict[str, Any]] = {}
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "done"
+
+    def select_model_ids(self) -> List[int]:
+        """
+        Pinned models first, then the most recent ones not already pinned.
+        """
+        model_ids = list(dict.fromkeys(self.pinned_model_ids))
+        if self.recent_models > 0:
+            db = SessionLocal()
+            try:
+                recent = ModelDetails.find_recent_model_ids(db, self.recent_models)
+            finally:
+                db.close()
+            model_ids += [model_id for model_id in recent if model_id not in model_ids]
+        return model_ids
+
+    async def run(self) -> None:
+        self.status = "running"
+        self.started_at = time.time()
+        try:
+            model_ids = await self.executor.run(self.select_model_ids)
+        except Exception:
+            logger.exception("Could not select the models to warm up")
+            model_ids = []
+
+        if model_ids:
+            logger.info("Warming up %s model(s): %s", len(model_ids), model_ids)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        await asyncio.gather(*(self._warm_up(model_id, semaphore) for model_id in model_ids))
+
+        self.finished_at = time.time()
+        self.status = "done"
+        failed = [model_id for model_id, state in self.models.items() if state["status"] == "failed"]
+        logger.info("Model warm-up finished in %.2fs, %s failed", self.finished_at - self.started_at, len(failed))
+
+    async def _warm_up(self, model_id: int, semaphore: asyncio.Semaphore) -> None:
+        self.models[model_id] = {"status": "pending", "seconds": None, "error": None}
+        async with semaphore:
+            self.models[model_id]["status"] = "loading"
+            started = time.perf_counter()
+            try:
+                await self.executor.run(warm_up_model, model_id)
+                self.models[model_id]["status"] = "ready"
+            except Exception as e:
+                logger.warning("Warm-up of model %s failed: %s", model_id, e)
+                self.models[model_id].update(status="failed", error=str(e))
+            self.models[model_id]["seconds"] = time.perf_counter() - started
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "seconds": (self.finished_at or time.time()) - self.started_at if self.started_at else None,
+            "models": {str(model_id): dict(state) for model_id, state in self.models.items()},
+        }
+
+
+model_warmup = ModelWarmup(
+    cpu_executor,
+    recent_models=settings.WARMUP_RECENT_MODELS,
+    pinned_model_ids=settings.WARMUP_MODEL_IDS,
+    concurrency=settings.WARMUP_CONCURRENCY,
+)
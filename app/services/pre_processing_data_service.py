@@ -1,20 +1,26 @@
 from app.models.job_performance.job_performance import JobPerformance
 from app.models.files.data_file import DataFile
 from app.schemas import data_loader
+from app.services.columnar_file_service import load_feature_frame
+from app.utils.dataset_cache import dataset_cache
 import pandas as pd
 import numpy as np
 
 
-def make_dataset(job_id: str, exam_id: str, performance_metric: str, db):
+def make_dataset(job_id: str, exam_id: str, performance_metric: str, db, use_cache: bool = True):
     """
     Creates a dataset by finding similar job IDs and aggregating performance and file data.
 
+    The result is cached per (job IDs, exam, metric); a cached dataset is reused as long as
+    the performance records and feature files it was built from are unchanged.
+
     Args:
         job_id (str): The ID of the base job to find similar jobs for.
         exam_id (str): The ID of the exam to retrieve file data for.
         performance_metric (str): The performance metric to retrieve for each job.
             Accepted values: 'job_efficiency_rank', 'improvement_rank', 'satisfaction_score'.
         db (Session): SQLAlchemy database session to interact with the database.
+        use_cache (bool): Look up and store the dataset in the dataset cache.
 
     Returns:
         tuple: A tuple containing:
@@ -47,9 +53,20 @@ def make_dataset(job_id: str, exam_id: str, performance_metric: str, db):
     #]
     #}
 
+    if use_cache:
+        cache_key = dataset_cache.make_key(list_of_job_id, exam_id, performance_metric)
+        checksums = fetch_file_checksums(db, exam_id)
+        fingerprint = dataset_cache.fingerprint(performance_data, date_files_dict, checksums)
+        cached = dataset_cache.get(cache_key, fingerprint)
+        if cached is not None:
+            return cached
+
     # Step 4: Process and combine features and labels
     X, Y = process_data(performance_data, date_files_dict, performance_metric)
 
+    if use_cache:
+        dataset_cache.put(cache_key, fingerprint, X, Y)
+
     return X,Y
 
 
@@ -69,10 +86,15 @@ def fetch_file_data(db, exam_id):
     return DataFile.get_files_by_exam_id(db=db, exam_id=exam_id)
 
 
+def fetch_file_checksums(db, exam_id):
+    """Retrieve the stored SHA-256 of the exam's files, keyed by path."""
+    return DataFile.get_checksums_by_exam_id(db=db, exam_id=exam_id)
+
+
 def process_data(performance_data, date_files_dict, performance_metric:str):
     """Process and combine features and labels from performance and file data."""
-    combined_features = []
-    combined_labels = []
+    feature_frames = []
+    label_series = []
     # {1378:
     #[
     #  {
@@ -92,45 +114,48 @@ def process_data(performance_data, date_files_dict, performance_metric:str):
         if year in date_files_dict:
             for file_path in date_files_dict[year]:
                 try:
-                    combined_features, combined_labels = process_file(
-                        file_path, records, combined_features, combined_labels
-                    )
+                    features, labels = process_file(file_path, records)
+                    feature_frames.append(features)
+                    label_series.append(labels)
                 except Exception as e:
                     print(f"Error loading file {file_path}: {e}")
 
-    # Convert to pandas DataFrame and Series
-    X = pd.DataFrame(combined_features)
-    Y = pd.Series(combined_labels, name=performance_metric)
+    if not feature_frames:
+        return pd.DataFrame(), pd.Series([], name=performance_metric, dtype=float)
+
+    # Columns missing from some files are filled with NaN
+    X = pd.concat(feature_frames, ignore_index=True, sort=False)
+    Y = pd.concat(label_series, ignore_index=True).rename(performance_metric)
 
     return X, Y
 
 
-def process_file(file_path, records, combined_features, combined_labels):
-    """Process a single file and update combined features and labels."""
-    # Load the CSV file
-    data_df = pd.read_csv(file_path)
+def process_file(file_path, records):
+    """
+    Join the performance records of one year with the rows of one feature file.
+
+    Every record whose person appears in the file yields that person's first row, in record
+    order; records of persons missing from the file are skipped.
+
+    Returns:
+        tuple: (features without person_id as a DataFrame, performance values as a Series)
+    """
+    # Load the file (columnar sidecar when available, CSV otherwise)
+    data_df = load_feature_frame(file_path)
 
-    # Filter the data for person IDs present in the performance records
-    person_ids = {record['person_id'] for record in records}
-    filtered_data = data_df[data_df['person_id'].isin(person_ids)]
+    # Keyed by person, keeping the first row of persons listed more than once
+    first_rows = data_df.drop_duplicates(subset='person_id', keep='first').set_index('person_id')
 
-    # Combine the filtered data with performance values
-    for record in records:
-        person_id = record['person_id']
-        performance_value = record['performance_value']
+    person_ids = [record['person_id'] for record in records]
+    performance_values = np.array([record['performance_value'] for record in records])
 
-        # Extract relevant features for the person
-        person_features = filtered_data[filtered_data['person_id'] == person_id]
-        if not person_features.empty:
-            # Append features and label
+    positions = first_rows.index.get_indexer(person_ids)
+    found = positions >= 0
 
-            row = person_features.drop(columns=['person_id']).iloc[0]
-            # append as a dictionary so column names are retained
-            combined_features.append(row.to_dict())
-            # combined_features.append(person_features.drop(columns=['person_id']).values.flatten())
-            combined_labels.append(performance_value)
+    features = first_rows.iloc[positions[found]].reset_index(drop=True)
+    labels = pd.Series(performance_values[found])
 
-    return combined_features, combined_labels
+    return features, labels
 
 
 
@@ -1,88 +1,10 @@
-# from app.utils.model_loader import get_prediction_range
-# # from app.schemas import data_loader
-# from app.utils.predict_helper_method import find_essential_parameter
-# import pandas as pd
-
-
-
-# def predict_job_utils(name_object_predict:str,data_person: dict, model_id: int, db) -> str:
-#     """
-#     Predicts job utility metrics for a given person's data using a pre-trained model.
-
-#     Parameters:
-#         data_person (dict): Dictionary containing the person's data.
-#         model_id (int): The ID of the model to use for prediction.
-#         db: Database connection or handler to fetch model parameters.
-    
-#     Returns:
-#         str: The prediction result.
-    
-#     Raises:
-#         ValueError: If `data_person_df` has no columns or is missing required features.
-#     """
-#     # Convert data_person to a DataFrame for easier processing
-#     data_person_df = pd.DataFrame([data_person])
-    
-#     # Check if the DataFrame has no columns
-#     if data_person_df.empty or len(data_person_df.columns) == 0:
-#         raise ValueError("The input data contains no columns.")
-    
-#     # Retrieve essential parameters for the model from the database
-#     result = find_essential_parameter(model_id, db)
-#     name_object_predict_in_card = result["name_object_predict_in_card"]
-#     base_feature = result["base_feature"]
-#     normalization_params = result["normalization_params"]
-#     one_hot_mappings = result["one_hot_mappings"]
-#     feature_order = result["feature_order"]
-#     model = result["model"]
-#     number_of_label = result["number_of_labels"]
-
-#     if name_object_predict_in_card != name_object_predict:
-#         print(name_object_predict_in_card)
-#         raise ValueError(f"The Object you want to predict :{name_object_predict} is not learn by this model.")
-
-
-
-#     # Ensure all base features are present in data_person, raise error if not
-#     for feature in base_feature:
-#         if feature not in data_person_df.columns:
-#             raise ValueError(f"The input data is missing the required feature: {feature}")
-    
-#     # Normalize numerical columns using normalization parameters
-#     for col, params in normalization_params.items():
-#         data_person_df[col] = (data_person_df[col] - params['min']) / (params['max'] - params['min'])
-#         data_person_df[col].fillna(0, inplace=True)  # Fill missing values with 0 after normalization
-    
-#     # One-hot encode categorical columns using the provided mappings
-#     encoded_columns = []
-#     for col, categories in one_hot_mappings.items():
-#         for category in categories:
-#             encoded_col = f"{col}_{category}"
-#             data_person_df[encoded_col] = (data_person_df[col] == category).astype(int)
-#             encoded_columns.append(encoded_col)
-    
-#     # Drop original categorical columns
-#     # data_person_df.drop(columns=one_hot_mappings.keys(), inplace=True)
-#     data_person_df.drop(columns=list(one_hot_mappings.keys()), inplace=True)
-    
-#     # Reindex columns to match the feature order expected by the model
-#     data_person_df = data_person_df.reindex(columns=feature_order, fill_value=0)
-    
-#     # Convert the DataFrame to a NumPy array for model input
-#     data_person_numpy = data_person_df.to_numpy()
-    
-#     # Make prediction using the model
-#     prediction = model.predict(data_person_numpy)
-#     print("Prediction is :")
-#     print(prediction)
-#     # Get the prediction range from the model loader
-#     result = get_prediction_range(num_classes=number_of_label, prediction=prediction)
-    
-#     return result
 from app.utils.model_loader import get_prediction_range
 from app.utils.predict_helper_method import find_essential_parameter
+from app.utils.feature_transformer import FeatureTransformer
 from app.logger import logger
+from typing import Dict, List, Union
 import pandas as pd
+import numpy as np
 
 
 def predict_job_utils(name_object_predict: str, data_person: dict, model_id: int, db) -> str:
@@ -90,87 +12,148 @@ def predict_job_utils(name_object_predict: str, data_person: dict, model_id: int
     Predicts job utility metrics for a given person's data using a pre-trained model.
     """
     try:
-        logger.info(f"Starting prediction for model ID: {model_id}")
+        logger.debug("Starting prediction for model ID: %s", model_id)
         
-        # Convert to DataFrame
-        data_person_df = pd.DataFrame([data_person])
-        logger.debug(f"Input data converted to DataFrame:\n{data_person_df}")
-
-        if data_person_df.empty or len(data_person_df.columns) == 0:
+        if not data_person:
             logger.error("The input data contains no columns.")
             raise ValueError("The input data contains no columns.")
 
         # Load model and metadata
         result = find_essential_parameter(model_id, db)
 
-        logger.info(f"resualt all: {result}")
-
-        name_object_predict_in_card = result["name_object_predict_in_card"]
-        base_feature = result["base_feature"]
-        normalization_params = result["normalization_params"]
-        one_hot_mappings = result["one_hot_mappings"]
-        feature_order = result["feature_order"]
         model = result["model"]
         number_of_label = result["number_of_labels"]
 
-
-        logger.info(f"one_hot_mappings loaded: {one_hot_mappings}")
-
-        if name_object_predict_in_card != name_object_predict:
-            logger.error(f"Mismatched prediction target: requested '{name_object_predict}', model supports '{name_object_predict_in_card}'")
-            raise ValueError(f"The Object you want to predict :{name_object_predict} is not learned by this model.")
-
-        # Ensure all base features are present
-        for feature in base_feature:
-            if feature not in data_person_df.columns:
-                logger.error(f"Missing required feature: {feature}")
-                raise ValueError(f"The input data is missing the required feature: {feature}")
-
-        # Normalize numerical features
-        for col, params in normalization_params.items():
-            try:
-                data_person_df[col] = (data_person_df[col] - params['min']) / (params['max'] - params['min'])
-                data_person_df[col].fillna(0, inplace=True)
-            except Exception as e:
-                logger.exception(f"Normalization failed for column '{col}': {e}")
-                raise
-
-        # One-hot encode categorical features
-        try:
-            # Ensure one_hot_mappings is a proper dictionary
-            if isinstance(one_hot_mappings, dict):
-                mappings = one_hot_mappings
-            else:
-                mappings = dict(one_hot_mappings)  # در صورتی که مثلاً dict_items باشه یا به اشتباه چیزی شبیه این
-            
-            for col, categories in mappings.items():
-                for category in categories:
-                    encoded_col = f"{col}_{category}"
-                    data_person_df[encoded_col] = (data_person_df[col] == category).astype(int)
-        except Exception as e:
-            logger.info(f"one_hot_mappings: {one_hot_mappings}")
-            logger.info(f"type(one_hot_mappings): {type(one_hot_mappings)}")
-            logger.exception("One-hot encoding failed")
-            raise
-
-        # Drop the original categorical columns
-        data_person_df.drop(columns=list(mappings.keys()), inplace=True)
-
-
-        # Align features
-        data_person_df = data_person_df.reindex(columns=feature_order, fill_value=0)
-        logger.debug(f"Final input for prediction:\n{data_person_df}")
+        model_input = build_model_input(name_object_predict, data_person, result)
 
         # Predict
-        prediction = model.predict(data_person_df.to_numpy())
-        logger.info(f"Prediction completed: {prediction}")
+        prediction = model.predict(model_input)
+        logger.debug("Prediction completed: %s", prediction)
 
         # Post-process result
         result = get_prediction_range(num_classes=number_of_label, prediction=prediction)
-        logger.info(f"Final result: {result}")
+        logger.debug("Final result: %s", result)
 
         return result
 
     except Exception as e:
         logger.exception("Prediction process failed.")
         raise
+
+
+def predict_job_batch_utils(name_object_predict: str, persons_df: pd.DataFrame, model_id: int, db) -> Dict[int, str]:
+    """
+    Predicts job utility metrics for many persons with a single call to the model.
+
+    Args:
+        name_object_predict (str): The object the model is expected to predict.
+        persons_df (pd.DataFrame): One row of raw features per person, including a 'person_id' column.
+        model_id (int): The ID of the model to use for prediction.
+        db: Database session used to fetch the model card.
+
+    Returns:
+        Dict[int, str]: Mapping of person_id to the predicted range.
+    """
+    try:
+        logger.info("Starting batch prediction of %s persons for model ID: %s", len(persons_df), model_id)
+
+        if persons_df.empty or len(persons_df.columns) == 0:
+            logger.error("The input data contains no rows.")
+            raise ValueError("The input data contains no rows.")
+
+        result = find_essential_parameter(model_id, db)
+        model = result["model"]
+        number_of_label = result["number_of_labels"]
+
+        person_ids = persons_df["person_id"].tolist()
+        model_input = build_model_input(name_object_predict, persons_df.reset_index(drop=True), result)
+
+        # One vectorized predict for the whole batch
+        predictions = np.asarray(model.predict(model_input)).reshape(len(person_ids), -1)
+        logger.info("Batch prediction completed for %s persons.", len(person_ids))
+
+        return {
+            int(person_id): get_prediction_range(num_classes=number_of_label, prediction=prediction)
+            for person_id, prediction in zip(person_ids, predictions)
+        }
+
+    except Exception as e:
+        logger.exception("Batch prediction process failed.")
+        raise
+
+
+def predict_job_many_utils(name_object_predict: str, data_persons: List[dict], model_id: int, db) -> List[str]:
+    """
+    Predicts several single-person requests for the same model with one call to the model.
+    Used by the prediction batcher (app/utils/prediction_batcher.py).
+
+    Args:
+        name_object_predict (str): The object the model is expected to predict.
+        data_persons (List[dict]): Raw features of one person per request.
+        model_id (int): The ID of the model to use for prediction.
+        db: Database session used to fetch the model card.
+
+    Returns:
+        List[str]: The predicted range of each request, in the order of data_persons.
+    """
+    if any(not data_person for data_person in data_persons):
+        raise ValueError("The input data contains no columns.")
+
+    result = find_essential_parameter(model_id, db)
+
+    # The frame holds the union of the requests' columns, so each request is checked on its own
+    for data_person in data_persons:
+        for feature in result["base_feature"]:
+            if feature not in data_person:
+                raise ValueError(f"The input data is missing the required feature: {feature}")
+
+    model_input = build_model_input(name_object_predict, pd.DataFrame(data_persons), result)
+
+    predictions = np.asarray(result["model"].predict(model_input)).reshape(len(data_persons), -1)
+    logger.info("Micro-batch prediction of %s requests completed for model ID: %s", len(data_persons), model_id)
+
+    return [
+        get_prediction_range(num_classes=result["number_of_labels"], prediction=prediction)
+        for prediction in predictions
+    ]
+
+
+def build_model_input(name_object_predict: str, data: Union[dict, pd.DataFrame], result: dict) -> np.ndarray:
+    """
+    Applies the stored feature engineering (normalization, one-hot encoding and
+    feature ordering) of a model to raw feature rows.
+
+    Args:
+        name_object_predict (str): The object the caller wants to predict.
+        data (dict | pd.DataFrame): Raw features of one person, or one row per person.
+        result (dict): Output of find_essential_parameter for the model.
+
+    Returns:
+        np.ndarray: The model input matrix, one row per input row.
+    """
+    name_object_predict_in_card = result["name_object_predict_in_card"]
+    base_feature = result["base_feature"]
+
+    if name_object_predict_in_card != name_object_predict:
+        logger.error("Mismatched prediction target: requested '%s', model supports '%s'", name_object_predict, name_object_predict_in_card)
+        raise ValueError(f"The Object you want to predict :{name_object_predict} is not learned by this model.")
+
+    # Ensure all base features are present
+    columns = data.columns if isinstance(data, pd.DataFrame) else data.keys()
+    for feature in base_feature:
+        if feature not in columns:
+            logger.error("Missing required feature: %s", feature)
+            raise ValueError(f"The input data is missing the required feature: {feature}")
+
+    # The transformer is compiled once per loaded model; build one for callers that pass plain details
+    transformer = result.get("feature_transformer") or FeatureTransformer.from_details({
+        "base_feature": base_feature,
+        "normalization_params": result["normalization_params"],
+        "one_hot_mappings": result["one_hot_mappings"],
+        "feature_order": result["feature_order"],
+    })
+
+    model_input = transformer.transform(data)
+    logger.debug("Final input for prediction:\n%s", model_input)
+
+    return model_input
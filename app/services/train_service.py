@@ -2,37 +2,56 @@ import os
 import json
 import joblib
 import numpy as np
+from joblib import Parallel, delayed, parallel_config
 from datetime import datetime
 from fastapi import Depends
 from sqlalchemy.orm import Session
-from sklearn.model_selection import GridSearchCV, train_test_split
+from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
 from scipy.stats import ttest_rel
+from app.config import settings
 from app.database import get_db
 from .enhance_training_data_service import enhance_dataset
+from .hyperparameter_search_service import search_hyperparameters
 from app.models.AI.ModelDetails import ModelDetails  # Assuming ModelDetails is in app.models
-from app.utils.train_helper_method import calculate_confidence_level, manage_model_directory
+from app.utils.train_helper_method import calculate_confidence_level, manage_model_directory, SearchStrategy
 
 
 
-def tune_hyperparameters(model, X_train, Y_train, param_grid,num_classes=None):
+def tune_hyperparameters(model, X_train, Y_train, param_grid,num_classes=None, n_jobs=1,
+                         strategy=SearchStrategy.EXHAUSTIVE, n_iter=10, time_budget=None):
     """
-    Tune hyperparameters using GridSearchCV.
+    Tune hyperparameters with the given search strategy, fitting the CV folds on n_jobs workers.
+
+    Returns:
+        tuple: (best parameters, number of model fits performed)
     """
     if not param_grid:
         print("No hyperparameter grid provided. Skipping hyperparameter tuning.")
-        return {}
+        return {}, 0
 
     base_model = model(num_classes=num_classes)
 
-    grid_search = GridSearchCV(
-        estimator=base_model.model,      # خود شیء sklearn underneath
-        param_grid=param_grid,
-        cv=5,
-        scoring='accuracy'
+    # An estimator without a random_state draws from the global RNG, which run_iteration
+    # seeds.  Its folds are fitted in order in this process, as the sequential search did,
+    # since folds on other workers would draw from their own RNGs.
+    uses_global_rng = base_model.model.get_params().get('random_state', 0) is None
+    if uses_global_rng:
+        n_jobs = 1
+
+    best_params, n_fits = search_hyperparameters(
+        base_model.model,      # خود شیء sklearn underneath
+        X_train, Y_train, param_grid,
+        strategy=strategy, n_iter=n_iter, time_budget=time_budget,
+        n_jobs=n_jobs, num_classes=num_classes
     )
-    grid_search.fit(X_train, Y_train)
-    return grid_search.best_params_
+
+    # GridSearchCV refitted the best candidate on the whole training set; the exhaustive
+    # search keeps that fit so the global RNG draws of the rest of the iteration stay the same
+    if strategy == SearchStrategy.EXHAUSTIVE and uses_global_rng:
+        base_model.model.set_params(**best_params).fit(X_train, Y_train)
+
+    return best_params, n_fits
 
 
 
@@ -41,6 +60,9 @@ def train_and_evaluate(model_class, best_params, X_train, Y_train, X_test, Y_tes
                        num_classes=None):
     """
     Train the model with the best parameters and evaluate it.
+
+    Returns:
+        tuple: (accuracy, f1, precision, recall, fitted model)
     """
     # model = model_class(**best_params) if best_params else model_class()
     init_kwargs = {}
@@ -57,39 +79,109 @@ def train_and_evaluate(model_class, best_params, X_train, Y_train, X_test, Y_tes
     precision = precision_score(Y_test, Y_pred, average='macro')
     recall = recall_score(Y_test, Y_pred, average='macro')
     
-    return accuracy, f1, precision, recall
+    return accuracy, f1, precision, recall, model
+
+
+def resolve_training_n_jobs(n_jobs=None):
+    """
+    Worker budget of one training run: n_jobs if given, else TRAINING_N_JOBS, where 0 splits
+    the machine's CPUs evenly between the TRAINING_MAX_CONCURRENCY concurrent jobs.
+    """
+    if n_jobs is None:
+        n_jobs = settings.TRAINING_N_JOBS
+    if n_jobs <= 0:
+        n_jobs = (os.cpu_count() or 1) // max(settings.TRAINING_MAX_CONCURRENCY, 1)
+    return max(n_jobs, 1)
+
+
+def split_worker_budget(n_jobs, n_iterations):
+    """
+    Split a worker budget between the evaluation iterations and the CV folds of each one.
+
+    Returns:
+        tuple: (workers running iterations, workers per iteration for the CV folds)
+    """
+    iteration_jobs = max(1, min(n_jobs, n_iterations))
+    return iteration_jobs, max(1, n_jobs // iteration_jobs)
+
+
+def run_iteration(i, model_class, X, Y, num_classes, test_size, param_grid, cv_n_jobs, search=None):
+    """
+    One evaluation round of train_model: split and encode the data with seed 42 + i, tune and
+    evaluate the model.  Rounds only depend on their own seed, so they can run in any worker.
+    """
+    np.random.seed(42 + i)
+    X_train, X_test, Y_train, Y_test,feature_engineering_details = enhance_dataset(X,Y,num_classes,test_size)
+
+    best_params, n_fits = tune_hyperparameters(
+        model_class, X_train, Y_train, param_grid,num_classes, cv_n_jobs, **(search or {})
+    )
+
+    accuracy, f1, precision, recall, model = train_and_evaluate(
+        model_class, best_params, X_train, Y_train, X_test, Y_test,num_classes
+    )
+
+    return {
+        'best_params': best_params,
+        'accuracy': accuracy,
+        'f1': f1,
+        'precision': precision,
+        'recall': recall,
+        'n_fits': n_fits,
+        'model': model,
+        'feature_engineering_details': feature_engineering_details,
+        'split_test': len(X_test),
+        'random_state': np.random.get_state(),
+    }
 
 
 def train_model(
     model_class, X, Y, job_id, exam_id, base_directory_model,
     num_classes,name_object_predict,db: Session,n_iterations=5,test_size=0.2, param_grid=None,
-    name_position=None
+    name_position=None, n_jobs=None, search_strategy=None, search_n_iter=10, search_time_budget=None,
+    reuse_best_iteration=None
 ):
     """
     Train the model, evaluate it, and save details to the database.
+
+    A search_strategy (exhaustive, randomized or successive_halving) tunes the model on its
+    default grid unless param_grid is given; every search stops starting new candidates after
+    search_time_budget seconds (settings.SEARCH_TIME_BUDGET when None, 0 for no limit).
+
+    With reuse_best_iteration (settings.TRAINING_REUSE_BEST_ITERATION when None) the saved model
+    and feature-engineering details are those of the most accurate iteration trained with the
+    chosen parameters; otherwise the data is encoded and the model fitted once more.
+
+    Returns:
+        ModelDetails: The record created for the trained model.
     """
-    np.random.seed(42)
-    best_params_list = []
-    accuracies, f1_scores, precisions, recalls = [], [], [], []
-    
-    for i in range(n_iterations):
-        np.random.seed(42 + i)
-        X_train, X_test, Y_train, Y_test,feature_engineering_details = enhance_dataset(X,Y,num_classes,test_size)
-        
-        best_params = tune_hyperparameters(model_class, X_train, Y_train, param_grid,num_classes)
-        best_params_list.append(best_params)
-        
-        accuracy, f1, precision, recall = train_and_evaluate(
-            model_class, best_params, X_train, Y_train, X_test, Y_test,num_classes
+    n_jobs = resolve_training_n_jobs(n_jobs)
+
+    if search_strategy is not None and param_grid is None:
+        param_grid = model_class(num_classes=num_classes).param_grid
+    search_strategy = SearchStrategy(search_strategy or SearchStrategy.EXHAUSTIVE) if param_grid else None
+    if search_time_budget is None:
+        search_time_budget = settings.SEARCH_TIME_BUDGET
+    search = {'strategy': search_strategy, 'n_iter': search_n_iter, 'time_budget': search_time_budget or None}
+    iteration_jobs, cv_jobs = split_worker_budget(n_jobs, n_iterations)
+
+    # Every worker gets a single BLAS/OpenMP thread, so iterations x folds stays within n_jobs
+    with parallel_config(backend="loky", inner_max_num_threads=1):
+        results = Parallel(n_jobs=iteration_jobs)(
+            delayed(run_iteration)(i, model_class, X, Y, num_classes, test_size, param_grid, cv_jobs, search)
+            for i in range(n_iterations)
         )
-        
-        accuracies.append(accuracy)
-        f1_scores.append(f1)
-        precisions.append(precision)
-        recalls.append(recall)
-        
+
+    best_params_list = [result['best_params'] for result in results]
+    accuracies = [result['accuracy'] for result in results]
+    f1_scores = [result['f1'] for result in results]
+    precisions = [result['precision'] for result in results]
+    recalls = [result['recall'] for result in results]
+    search_n_fits = sum(result['n_fits'] for result in results)
+
+    for i, (accuracy, f1) in enumerate(zip(accuracies, f1_scores)):
         print(f"Iteration {i+1}: Accuracy = {accuracy:.4f}, F1 = {f1:.4f}")
-    
+
     t_stat_acc, p_value_acc = ttest_rel(accuracies, f1_scores)
     t_stat_f1, p_value_f1 = ttest_rel(f1_scores, precisions)
     
@@ -102,9 +194,25 @@ def train_model(
         avg_accuracy_per_param.append((param_dict, mean_acc))
     
     best_final_params = max(avg_accuracy_per_param, key=lambda x: x[1])[0]
-    final_model = model_class(num_classes=num_classes,**best_final_params)
-    X_train, X_test, Y_train, Y_test,feature_engineering_details = enhance_dataset(X,Y,num_classes,test_size)
-    final_model.fit(X_train, Y_train)
+
+    if reuse_best_iteration is None:
+        reuse_best_iteration = settings.TRAINING_REUSE_BEST_ITERATION
+
+    if reuse_best_iteration:
+        best_iteration = max(
+            (result for result in results if result['best_params'] == best_final_params),
+            key=lambda result: result['accuracy']
+        )
+        final_model = best_iteration['model']
+        feature_engineering_details = best_iteration['feature_engineering_details']
+        split_test = best_iteration['split_test']
+    else:
+        # Continue from the random state the last iteration ended with, as the sequential loop did
+        np.random.set_state(results[-1]['random_state'])
+        final_model = model_class(num_classes=num_classes,**best_final_params)
+        X_train, X_test, Y_train, Y_test,feature_engineering_details = enhance_dataset(X,Y,num_classes,test_size)
+        final_model.fit(X_train, Y_train)
+        split_test = len(X_test)
     # print("Hi mehdi")
     # print(X_train[1])
     # print("Bye mehdi")
@@ -140,11 +248,13 @@ def train_model(
         'confidence_level_f1_score': confidence_level_f1_score,
         'num_all_samples': len(X),
         'num_features': X.shape[1],
-        'split_test': len(X_test),
+        'split_test': split_test,
         'n_splits_t_test': n_iterations,
         'number_of_labels': num_classes,
         'model_evaluation_date': datetime.now(),
         'version': f"v{next_version}",
+        'search_strategy': search_strategy.value if search_strategy else None,
+        'search_n_fits': search_n_fits,
         'exam_id': exam_id,
         'job_id': job_id
     }
@@ -164,11 +274,13 @@ def train_model(
         'confidence_level_f1_score': confidence_level_f1_score,
         'num_all_samples': len(X),
         'num_features': X.shape[1],
-        'split_test': len(X_test),
+        'split_test': split_test,
         'n_splits_t_test': n_iterations,
         'number_of_labels': num_classes,
         'model_evaluation_date': datetime.now().isoformat(),
         'version': f"v{next_version}",
+        'search_strategy': search_strategy.value if search_strategy else None,
+        'search_n_fits': search_n_fits,
         'exam_id': exam_id,
         'job_id': job_id
     }
@@ -177,7 +289,8 @@ def train_model(
     with open(card_path, 'w') as f:
         json.dump(card_info_json, f, indent=4)
     
-    ModelDetails.add_record(db, card_info)
+    model_details = ModelDetails.add_record(db, card_info)
     print(f"Final model and metadata saved to {model_directory}")
+    return model_details
 
 
@@ -0,0 +1,141 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Optional
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.AI.training_job import TrainingJob
+from app.services.pre_processing_data_service import make_dataset
+from app.services.train_service import train_model
+from app.models.AI.registry import resolve_model_class
+from app.logger import logger
+
+
+def run_training_job(training_job_id: int, base_directory_model: str) -> Optional[int]:
+    """
+    Builds the dataset and trains the model of a queued TrainingJob.  Runs in a worker
+    process with its own database session and records the outcome on the job row.
+
+    Returns:
+        Optional[int]: ID of the created ModelDetails record, or None if training failed.
+    """
+    db = SessionLocal()
+    try:
+        training_job = TrainingJob.mark_running(db, training_job_id)
+        model_class = resolve_model_class(training_job.model_name)
+
+        X, Y = make_dataset(training_job.job_id, training_job.exam_id, training_job.performance_metric, db)
+        model_details = train_model(
+            model_class, X, Y, training_job.job_id, training_job.exam_id, base_directory_model,
+            training_job.num_classes, training_job.name_object_predict, db,
+            search_strategy=training_job.search_strategy,
+            search_n_iter=training_job.search_n_iter,
+            search_time_budget=training_job.search_time_budget
+        )
+
+        TrainingJob.mark_done(db, training_job_id, model_details.id)
+        return model_details.id
+
+    except Exception as e:
+        db.rollback()
+        logger.exception("Training job %s failed: %s", training_job_id, e)
+        TrainingJob.mark_failed(db, training_job_id, str(e))
+        return None
+
+    finally:
+        db.close()
+
+
+class TrainingJobPool:
+    """
+    Process pool running TrainingJobs, at most TRAINING_MAX_CONCURRENCY at a time per API
+    process; further jobs wait in the queue with status 'queued'.
+
+    A worker that dies (e.g. killed for running out of memory) breaks the whole pool: its
+    jobs are marked failed and the next submit starts a new pool.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: workers must not inherit the API's threads and pooled DB connections
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            # Another submit may already have replaced the broken pool
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, training_job_id: int, base_directory_model: str) -> bool:
+        """
+        Queues a TrainingJob, retrying once on a new pool if the current one is broken.
+
+        Returns:
+            bool: False if the job could not be queued; it is then marked failed.
+        """
+        for _ in range(2):
+            executor = self._get_executor()
+            try:
+                future = executor.submit(run_training_job, training_job_id, base_directory_model)
+            except BrokenProcessPool as e:
+                logger.warning("Training pool is broken, starting a new one: %s", e)
+                self._discard_executor(executor)
+                continue
+            future.add_done_callback(lambda f: self._on_done(training_job_id, f))
+            return True
+
+        db = SessionLocal()
+        try:
+            TrainingJob.mark_failed(db, training_job_id, "Training worker failed: the worker pool could not be started")
+        finally:
+            db.close()
+        return False
+
+    @staticmethod
+    def _on_done(training_job_id: int, future) -> None:
+        # The worker records its own failures; this catches workers that died or never ran
+        if future.cancelled() or future.exception() is not None:
+            error = "cancelled" if future.cancelled() else str(future.exception())
+            db = SessionLocal()
+            try:
+                TrainingJob.mark_failed(db, training_job_id, f"Training worker failed: {error}")
+            finally:
+                db.close()
+
+    def shutdown(self, wait: bool = False) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait, cancel_futures=True)
+                self._executor = None
+
+
+def fail_interrupted_training_jobs(started_before: datetime) -> int:
+    """
+    Marks failed the jobs a previous run of the API left queued or running: their worker
+    pool went away with it.  Only jobs submitted before started_before are touched.
+
+    Returns:
+        int: Number of jobs marked failed.
+    """
+    db = SessionLocal()
+    try:
+        return TrainingJob.fail_unfinished(db, started_before, "Interrupted by an API restart")
+    finally:
+        db.close()
+
+
+training_job_pool = TrainingJobPool(settings.TRAINING_MAX_CONCURRENCY)
@@ -0,0 +1,215 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+from app.logger import logger
+from app.services.columnar_file_service import encode_column, decode_column
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATASET_CACHE_DIR_NAME = "dataset_cache"
+
+
+class DatasetCache:
+    """
+    Two-tier cache of materialized training datasets (X, Y).
+
+    Entries are keyed by (job_ids, exam_id, metric) and validated against a fingerprint of
+    the performance rows and feature files they were built from, so new or changed data
+    rebuilds the dataset.  A bounded in-memory LRU sits in front of a directory of .npz
+    files that is shared by every process training on this machine.
+    """
+
+    def __init__(self, directory: Optional[str], max_bytes: int, max_entries: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, int, pd.DataFrame, pd.Series]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(job_ids: List[int], exam_id: int, performance_metric: str) -> str:
+        raw = json.dumps([sorted(job_ids), exam_id, performance_metric], default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+    @staticmethod
+    def fingerprint(
+        performance_data: Dict[Any, List[Dict[str, Any]]],
+        date_files_dict: Dict[Any, List[str]],
+        checksums: Optional[Dict[str, str]] = None
+    ) -> str:
+        """
+        Hashes the performance records (in query order) and every feature file the dataset is
+        built from: its stored SHA-256 when checksums has one, else its (path, mtime, size).
+        """
+        checksums = checksums or {}
+        digest = hashlib.sha256()
+        for year in sorted(performance_data):
+            digest.update(json.dumps([year, performance_data[year]], default=str).encode())
+        for year in sorted(date_files_dict):
+            for path in date_files_dict[year]:
+                if path in checksums:
+                    digest.update(json.dumps([year, str(path), checksums[path]]).encode())
+                    continue
+                try:
+                    stat = os.stat(path)
+                    file_signature = [year, str(path), stat.st_mtime_ns, stat.st_size]
+                except (OSError, TypeError):
+                    file_signature = [year, str(path), None, None]
+                digest.update(json.dumps(file_signature).encode())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def get(self, key: str, fingerprint: str) -> Optional[Tuple[pd.DataFrame, pd.Series]]:
+        """
+        Returns a copy of the cached dataset if it was built from data with this fingerprint.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == fingerprint:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return entry[2].copy(), entry[3].copy()
+            if entry is not None:
+                self._remove(key)
+
+        dataset = self._load(key, fingerprint)
+        with self._lock:
+            if dataset is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+
+        self._remember(key, fingerprint, *dataset)
+        return dataset[0].copy(), dataset[1].copy()
+
+    def put(self, key: str, fingerprint: str, X: pd.DataFrame, Y: pd.Series) -> None:
+        """
+        Stores a freshly built dataset in memory and on disk.  A dataset that cannot be
+        stored is only logged: caching must never fail a training run.
+        """
+        self._remember(key, fingerprint, X.copy(), Y.copy())
+        if not self.directory:
+            return
+        try:
+            self._save(key, fingerprint, X, Y)
+        except Exception as e:
+            logger.warning("Could not store dataset %s on disk: %s", key, e)
+
+    def _remember(self, key: str, fingerprint: str, X: pd.DataFrame, Y: pd.Series) -> None:
+        size = int(X.memory_usage(deep=True).sum() + Y.memory_usage(deep=True))
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (fingerprint, size, X, Y)
+            self.current_bytes += size
+
+            while self._entries and (
+                len(self._entries) > self.max_entries or self.current_bytes > self.max_bytes
+            ):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _save(self, key: str, fingerprint: str, X: pd.DataFrame, Y: pd.Series) -> None:
+        arrays, columns = {}, []
+        for idx, (name, values) in enumerate(list(X.items()) + [(Y.name, Y)]):
+            array, null_mask = encode_column(str(name), values)
+            arrays[f"c{idx}"] = array
+            if null_mask is not None:
+                arrays[f"n{idx}"] = null_mask
+            columns.append(name)
+
+        meta = {"fingerprint": fingerprint, "columns": columns, "n_rows": len(X)}
+        arrays["meta"] = np.array(json.dumps(meta))
+
+        os.makedirs(self.directory, exist_ok=True)
+        # np.savez appends .npz to names without it; write the temp file under its final suffix
+        tmp_path = self._path(key) + f".{os.getpid()}.tmp.npz"
+        try:
+            np.savez(tmp_path, **arrays)
+            os.replace(tmp_path, self._path(key))
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _load(self, key: str, fingerprint: str) -> Optional[Tuple[pd.DataFrame, pd.Series]]:
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as stored:
+                meta = json.loads(str(stored["meta"]))
+                if meta["fingerprint"] != fingerprint:
+                    os.remove(path)
+                    return None
+
+                values = [
+                    decode_column(stored[f"c{idx}"], stored[f"n{idx}"] if f"n{idx}" in stored else None)
+                    for idx in range(len(meta["columns"]))
+                ]
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Ignoring unreadable cached dataset %s: %s", path, e)
+            return None
+
+        feature_names = meta["columns"][:-1]
+        X = pd.DataFrame(dict(zip(feature_names, values[:-1])), columns=feature_names, index=pd.RangeIndex(meta["n_rows"]))
+        Y = pd.Series(values[-1], name=meta["columns"][-1])
+        return X, Y
+
+    def _remove(self, key: str) -> None:
+        _, size, _, _ = self._entries.pop(key)
+        self.current_bytes -= size
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+        if self.directory:
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "current_bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "max_entries": self.max_entries,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+dataset_cache = DatasetCache(
+    directory=settings.DATASET_CACHE_DIR or os.path.join(BASE_DIR, "services", DATASET_CACHE_DIR_NAME),
+    max_bytes=settings.DATASET_CACHE_MAX_BYTES,
+    max_entries=settings.DATASET_CACHE_MAX_ENTRIES,
+)
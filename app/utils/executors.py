@@ -0,0 +1,102 @@
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from app.config import settings
+
+
+class BoundedExecutor:
+    """
+    Thread pool with a fixed worker budget used to run blocking work from async routes,
+    so the event loop keeps serving other requests.  Tracks how many calls are waiting
+    for a worker (queue depth) and how many are running.
+
+    The thread pool is created on first use and again after shutdown, so the application
+    can start more than once in a process (e.g. several TestClient contexts).
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name)
+            return self._executor
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Runs func(*args, **kwargs) on a worker thread and awaits its result.
+        Exceptions raised by func are re-raised in the caller.
+        """
+        call = functools.partial(func, *args, **kwargs)
+
+        with self._lock:
+            self.queued += 1
+        try:
+            future = self._get_executor().submit(self._track, call)
+        except RuntimeError:
+            with self._lock:
+                self.queued -= 1
+            raise
+        future.add_done_callback(self._on_done)
+
+        return await asyncio.wrap_future(future)
+
+    def _track(self, call: Callable) -> Any:
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+        try:
+            return call()
+        finally:
+            with self._lock:
+                self.running -= 1
+
+    def _on_done(self, future) -> None:
+        with self._lock:
+            if future.cancelled():
+                # Cancelled before a worker picked it up
+                self.queued -= 1
+            elif future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "max_workers": self.max_workers,
+                "queued": self.queued,
+                "running": self.running,
+                "completed": self.completed,
+                "failed": self.failed,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+# Database queries and file reads
+io_executor = BoundedExecutor("io", settings.IO_EXECUTOR_WORKERS)
+
+# Training, model loading and prediction
+cpu_executor = BoundedExecutor("cpu", settings.CPU_EXECUTOR_WORKERS or os.cpu_count() or 1)
+
+
+def executor_stats() -> Dict[str, Dict[str, Any]]:
+    return {"io": io_executor.stats(), "cpu": cpu_executor.stats()}
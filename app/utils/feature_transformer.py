@@ -0,0 +1,145 @@
+from typing import Any, Dict, List, Union
+import numpy as np
+import pandas as pd
+
+
+class FeatureTransformer:
+    """
+    Compiled form of the feature-engineering JSON written by train_model.
+
+    The scale vectors, category -> output position lookups and output positions are
+    computed once, so turning raw person data into the model input is a handful of
+    NumPy operations instead of a chain of per-column pandas assignments.  The output
+    matches the pandas pipeline: min/max normalization with NaN filled by 0, one-hot
+    encoding by equality, original categorical columns dropped and the result aligned
+    to feature_order with 0 for absent columns.
+    """
+
+    def __init__(self, base_feature: List[str], normalization_params: Dict[str, Dict[str, float]],
+                 one_hot_mappings: Dict[str, List[Any]], feature_order: List[str]):
+        self.base_feature = list(base_feature or [])
+        self.feature_order = list(feature_order or [])
+        self.normalization_params = normalization_params or {}
+        self.one_hot_mappings = dict(one_hot_mappings or {})
+        self.n_features = len(self.feature_order)
+        self.compiled = False
+
+    def compile(self) -> "FeatureTransformer":
+        """
+        Precomputes the lookup tables.  Runs once, on first use, so a transformer can be
+        created together with the model without paying for it on every load.
+        """
+        if self.compiled:
+            return self
+
+        normalization_params = self.normalization_params
+        one_hot_mappings = self.one_hot_mappings
+        output_position = {name: idx for idx, name in enumerate(self.feature_order)}
+
+        # Numerical columns: (x - min) / (max - min) written to their output position
+        numeric_columns = [col for col in normalization_params if col in output_position]
+        self.numeric_columns = numeric_columns
+        self.numeric_positions = np.array([output_position[col] for col in numeric_columns], dtype=np.intp)
+        self.mins = np.array([normalization_params[col]['min'] for col in numeric_columns], dtype=np.float64)
+        self.ranges = np.array(
+            [normalization_params[col]['max'] - normalization_params[col]['min'] for col in numeric_columns],
+            dtype=np.float64
+        )
+
+        # Categorical columns: category -> output position of its one-hot column
+        self.category_positions: Dict[str, Dict[Any, int]] = {}
+        for col, categories in one_hot_mappings.items():
+            lookup = {}
+            for category in categories:
+                position = output_position.get(f"{col}_{category}")
+                if position is not None:
+                    lookup[category] = position
+            self.category_positions[col] = lookup
+
+        # Remaining feature_order columns are copied through unchanged when present
+        produced = set(numeric_columns) | {
+            f"{col}_{category}" for col, categories in one_hot_mappings.items() for category in categories
+        }
+        self.passthrough = [
+            (name, idx) for idx, name in enumerate(self.feature_order)
+            if name not in produced and name not in one_hot_mappings
+        ]
+
+        self.compiled = True
+        return self
+
+    @classmethod
+    def from_details(cls, feature_details: Dict[str, Any]) -> "FeatureTransformer":
+        """
+        Builds a transformer from a feature-engineering details dictionary.
+        """
+        return cls(
+            base_feature=feature_details.get("base_feature"),
+            normalization_params=feature_details.get("normalization_params"),
+            one_hot_mappings=feature_details.get("one_hot_mappings"),
+            feature_order=feature_details.get("feature_order"),
+        )
+
+    def transform(self, data: Union[Dict[str, Any], List[Dict[str, Any]], pd.DataFrame]) -> np.ndarray:
+        """
+        Transforms one record (dict), a list of records or a DataFrame into the model input.
+
+        Returns:
+            np.ndarray: Float matrix of shape (n_rows, len(feature_order)).
+        """
+        if not self.compiled:
+            self.compile()
+
+        if isinstance(data, dict):
+            data = [data]
+
+        if isinstance(data, pd.DataFrame):
+            n_rows = len(data)
+
+            def column(name):
+                return data[name].to_numpy() if name in data.columns else None
+        else:
+            n_rows = len(data)
+
+            def column(name):
+                if not any(name in record for record in data):
+                    return None
+                values = [record.get(name) for record in data]
+                return np.array([np.nan if value is None else value for value in values], dtype=object)
+
+        output = np.zeros((n_rows, self.n_features), dtype=np.float64)
+
+        if self.numeric_columns:
+            numeric = np.full((n_rows, len(self.numeric_columns)), np.nan, dtype=np.float64)
+            for idx, col in enumerate(self.numeric_columns):
+                values = column(col)
+                if values is not None:
+                    numeric[:, idx] = values.astype(np.float64)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                scaled = (numeric - self.mins) / self.ranges
+            scaled[np.isnan(scaled)] = 0
+            output[:, self.numeric_positions] = scaled
+
+        for col, lookup in self.category_positions.items():
+            values = column(col)
+            if values is None or not lookup:
+                continue
+            positions = np.fromiter((lookup.get(value, -1) if _hashable(value) else -1 for value in values),
+                                    dtype=np.intp, count=n_rows)
+            rows = np.nonzero(positions >= 0)[0]
+            output[rows, positions[rows]] = 1.0
+
+        for name, idx in self.passthrough:
+            values = column(name)
+            if values is not None:
+                output[:, idx] = values.astype(np.float64)
+
+        return output
+
+
+def _hashable(value: Any) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
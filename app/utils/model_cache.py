@@ -0,0 +1,117 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.config import settings
+
+
+class ModelCache:
+    """
+    Bounded LRU cache of loaded models and their feature-engineering metadata.
+
+    Entries are keyed by model_id and validated against the (path, mtime, size)
+    signature of the artifacts they were loaded from, so a replaced model file is
+    reloaded on the next lookup instead of being served stale.  The on-disk size
+    of the artifacts is used as the memory estimate of an entry.
+    """
+
+    def __init__(self, max_bytes: int, max_entries: int):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, Tuple[tuple, int, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def artifact_signature(*paths: str) -> Optional[tuple]:
+        """
+        Builds the validation signature of the given artifact files.
+
+        Returns:
+            tuple | None: ((path, mtime_ns, size), ...) or None if any file is missing.
+        """
+        signature = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except (OSError, TypeError):
+                return None
+            signature.append((str(path), stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def get(self, model_id: int, signature: Optional[tuple]) -> Optional[Dict[str, Any]]:
+        """
+        Returns the cached value for model_id if its artifacts still match the signature.
+        """
+        with self._lock:
+            entry = self._entries.get(model_id)
+            if entry is None or signature is None or entry[0] != signature:
+                self.misses += 1
+                if entry is not None:
+                    self._remove(model_id)
+                return None
+
+            self._entries.move_to_end(model_id)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, model_id: int, signature: Optional[tuple], value: Dict[str, Any]) -> None:
+        """
+        Stores a loaded value, evicting least recently used entries to stay within budget.
+        """
+        if signature is None:
+            return
+
+        size = sum(item[2] for item in signature)
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+
+        with self._lock:
+            if model_id in self._entries:
+                self._remove(model_id)
+
+            self._entries[model_id] = (signature, size, value)
+            self.current_bytes += size
+
+            while self._entries and (
+                self.current_bytes > self.max_bytes or len(self._entries) > self.max_entries
+            ):
+                evicted_id = next(iter(self._entries))
+                self._remove(evicted_id)
+                self.evictions += 1
+
+    def invalidate(self, model_id: int) -> None:
+        with self._lock:
+            if model_id in self._entries:
+                self._remove(model_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "current_bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _remove(self, model_id: int) -> None:
+        _, size, _ = self._entries.pop(model_id)
+        self.current_bytes -= size
+
+
+model_cache = ModelCache(
+    max_bytes=settings.MODEL_CACHE_MAX_BYTES,
+    max_entries=settings.MODEL_CACHE_MAX_ENTRIES,
+)
@@ -1,4 +1,4 @@
-from app.models.AI import decision_tree,LSTM,MLP,svm,xgboost_model
+from app.models.AI.registry import get_model_family, resolve_model_class
 from app.utils.public_method import load_json
 import numpy as np
 
@@ -8,7 +8,7 @@ def find_model(model_address:str):
         json_card_model = load_json(model_address)
         if json_card_model is None:
 
-            raise "There is no model card."
+            raise ValueError("There is no model card.")
 
         type_model = json_card_model.get("architecture",None)
         main_address = json_card_model.get('address',None)
@@ -16,41 +16,17 @@ def find_model(model_address:str):
         num_features = json_card_model.get("num_features",None)
         if type_model is None or main_address is None or number_of_label is None or num_features is None:
 
-            raise "The information about this model is not complete!"
-        
-        elif type_model == "DecisionTree":
-             
-            model = decision_tree.DecisionTreeModel()
-            model.load_model(main_address)
-        
-        elif type_model == "SVM":
-            
-            model = svm.SVMModel()
-            model.load_model(main_address)
-             
-        
-        elif type_model == "XGB":
-            model =  xgboost_model.XGBoostModel()
-            model.load_model(main_address)
+            raise ValueError("The information about this model is not complete!")
 
+        try:
+            family = get_model_family(type_model)
+        except ValueError:
+            raise ValueError(f"The architecture name {type_model} is unfamiliar")
 
-        elif type_model == "LSTM":
-            model = LSTM.LSTMModel(
-                        model=LSTM.LSTM,       # Pass the LSTM class
-                        input_size=num_features,    # Number of features per timestep
-                        output_size=number_of_label,  # Number of output classes
-                    )
-            model.load_model(main_address)
-
-            
-        elif type_model == "MLP":
-            model = MLP.MLPModel()
-            model.load_model(main_address)
-            
-        else: 
-
-            raise f"The architecture name {type_model} is unfifamiliar"
-        
+        # Only the family of this model is imported (LSTM pulls in torch, XgBoost xgboost)
+        model_class = resolve_model_class(type_model)
+        model = model_class(**(family.card_kwargs(json_card_model) if family.card_kwargs else {}))
+        model.load_model(main_address)
 
         return model,number_of_label
 
@@ -1,14 +1,52 @@
 import pandas as pd
-from typing import Dict, Tuple
+import numpy as np
+from typing import Callable, Dict, List, Optional, Tuple
 import json
 import joblib
 from pathlib import Path
 from app.models.AI.ModelDetails import ModelDetails  # Assuming ModelDetails is in app.models
+from app.models.files.data_file import DataFile
+from app.models.files.person_row_index import PersonRowIndex
+from app.services.file_service import read_row_at_offset
+from app.services.columnar_file_service import open_columns, read_rows
+from app.utils.model_cache import model_cache
+from app.utils.feature_transformer import FeatureTransformer
+from app.utils.single_flight import SingleFlight
+
+# Concurrent requests for the same model or person share one load or file scan
+model_loads = SingleFlight("model_loads")
+person_lookups = SingleFlight("person_lookups")
+
+def read_person_rows(file_path: str, select: Callable[[np.ndarray], np.ndarray]) -> pd.DataFrame:
+    """
+    Reads the rows of a feature file whose person_id matches a selector.
+
+    The person_id column is memory-mapped from the columnar sidecar when the file has one,
+    so only the selected rows are materialized; otherwise the CSV is parsed.
+
+    Args:
+        file_path (str): Path of the feature CSV file.
+        select (Callable): Maps an array of person IDs to a boolean mask of wanted rows.
+
+    Returns:
+        pd.DataFrame: The selected rows.
+    """
+    columns = open_columns(file_path, ['person_id'])
+    if columns is not None:
+        rows = read_rows(file_path, np.flatnonzero(select(columns['person_id'])))
+        # None when the sidecar went stale after open_columns
+        if rows is not None:
+            return rows
+
+    df = pd.read_csv(file_path)
+    return df[select(df['person_id'].to_numpy())]
+
 
 def find_person_feature_last_exam(person_id: int, files_by_year: Dict[int, list]) -> Tuple[Dict, bool]:
     """
     Finds the row corresponding to the given person_id in the newest available CSV file,
-    searching from the most recent year to older years.
+    searching from the most recent year to older years.  Concurrent lookups of the same
+    person in the same files share one scan.
 
     Args:
         person_id (int): The ID of the person to search for.
@@ -17,6 +55,12 @@ def find_person_feature_last_exam(person_id: int, files_by_year: Dict[int, list]
     Returns:
         Tuple[Dict, bool]: A tuple containing the data (as a dictionary) of the found row and a boolean flag indicating success.
     """
+    key = (person_id, tuple((year, tuple(files_by_year[year])) for year in sorted(files_by_year)))
+    data, found = person_lookups.do(key, _scan_person_feature_last_exam, person_id, files_by_year)
+    return dict(data), found
+
+
+def _scan_person_feature_last_exam(person_id: int, files_by_year: Dict[int, list]) -> Tuple[Dict, bool]:
     # Sort the years in descending order
     sorted_years = sorted(files_by_year.keys(), reverse=True)
 
@@ -27,11 +71,8 @@ def find_person_feature_last_exam(person_id: int, files_by_year: Dict[int, list]
 
         # Iterate through each file and search for the person_id
         for file_path in files:
-            # Read the CSV file into a pandas DataFrame
-            df = pd.read_csv(file_path)
-
-            # Check if the person_id is in the DataFrame
-            person_row = df[df['person_id'] == person_id]
+            # Read the rows of the person (columnar sidecar when available, CSV otherwise)
+            person_row = read_person_rows(file_path, lambda ids: ids == person_id)
 
             if not person_row.empty:
                 # Convert the row to a dictionary and return it with the success flag
@@ -41,6 +82,78 @@ def find_person_feature_last_exam(person_id: int, files_by_year: Dict[int, list]
     return {}, False
 
 
+def find_person_feature_in_exam(db, exam_id: int, person_id: int) -> Tuple[Dict, bool]:
+    """
+    Finds the newest row of a person among the files of an exam.
+
+    Uses PersonRowIndex (one indexed query and one row read) when every file of the exam
+    is indexed, and falls back to scanning the files with find_person_feature_last_exam otherwise.
+
+    Returns:
+        Tuple[Dict, bool]: The row as a dictionary and a flag indicating success.
+    """
+    if DataFile.is_exam_fully_indexed(db, exam_id):
+        location = PersonRowIndex.find_row(db, exam_id, person_id)
+        if location is None:
+            return {}, False
+        file_path, row_number, byte_offset = location
+
+        rows = read_rows(file_path, [row_number])
+        if rows is not None:
+            return rows.to_dict(orient='records')[0], True
+        return read_row_at_offset(file_path, byte_offset), True
+
+    files_by_year = DataFile.get_files_by_exam_id(db, exam_id)
+    return find_person_feature_last_exam(person_id, files_by_year)
+
+
+def find_persons_feature_last_exam(person_ids: Optional[List[int]], files_by_year: Dict[int, list]) -> Tuple[pd.DataFrame, List[int]]:
+    """
+    Batch version of find_person_feature_last_exam: finds the newest row of every requested
+    person while reading each CSV file at most once.
+
+    Args:
+        person_ids (Optional[List[int]]): The IDs of the persons to search for.
+            None selects every person that appears in the exam files.
+        files_by_year (Dict[int, list]): A dictionary with years as keys and lists of file paths as values.
+
+    Returns:
+        Tuple[pd.DataFrame, List[int]]: One row per found person (including the 'person_id' column),
+            and the list of requested person IDs that were not found in any file.
+    """
+    remaining = None if person_ids is None else set(person_ids)
+    found_frames = []
+    found_ids = set()
+
+    for year in sorted(files_by_year.keys(), reverse=True):
+        for file_path in files_by_year[year]:
+            if remaining is not None and not remaining:
+                break
+
+            if remaining is not None:
+                wanted = list(remaining)
+                rows = read_person_rows(file_path, lambda ids: np.isin(ids, wanted))
+            else:
+                seen = list(found_ids)
+                rows = read_person_rows(file_path, lambda ids: ~np.isin(ids, seen))
+
+            # Keep the first row per person, matching the single-person lookup
+            rows = rows.drop_duplicates(subset='person_id', keep='first')
+            if rows.empty:
+                continue
+
+            found_frames.append(rows)
+            new_ids = set(rows['person_id'].tolist())
+            found_ids |= new_ids
+            if remaining is not None:
+                remaining -= new_ids
+
+    persons_df = pd.concat(found_frames, ignore_index=True) if found_frames else pd.DataFrame()
+    not_found = [] if person_ids is None else [pid for pid in person_ids if pid not in found_ids]
+
+    return persons_df, not_found
+
+
 
 
 def find_essential_parameter(model_id: int, db):
@@ -52,6 +165,23 @@ def find_essential_parameter(model_id: int, db):
     # Step 2: Extract feature engineering details address
     feature_engineering_details_address = model_card.feature_engineering_details_address
 
+    # Serve from the in-process cache while the artifacts on disk are unchanged
+    signature = model_cache.artifact_signature(model_card.address, feature_engineering_details_address)
+    cached = model_cache.get(model_id, signature)
+    if cached is not None:
+        return dict(cached)
+
+    # Concurrent cache misses for the same artifacts wait on one load
+    result = model_loads.do((model_id, signature), _load_model_artifacts, model_id, model_card, signature)
+    return dict(result)
+
+
+def _load_model_artifacts(model_id: int, model_card: ModelDetails, signature: Optional[tuple]) -> dict:
+    """
+    Loads the model and its feature engineering details and stores them in the model cache.
+    """
+    feature_engineering_details_address = model_card.feature_engineering_details_address
+
     # Step 3: Read the JSON file at the feature engineering details address
     feature_details_path = Path(feature_engineering_details_address)
     try:
@@ -79,12 +209,17 @@ def find_essential_parameter(model_id: int, db):
         raise RuntimeError(f"An error occurred while loading the model: {e}")
 
     # Step 5: Return the required values
-    return {
+    result = {
         "name_object_predict_in_card":model_card.name_object_predict,
         "base_feature": base_feature,
         "normalization_params": normalization_params,
         "one_hot_mappings": one_hot_mappings,
         "feature_order": feature_order,
         "model": model,
-        "number_of_labels": model_card.number_of_labels
+        "number_of_labels": model_card.number_of_labels,
+        # Compiled on first use and cached together with the model
+        "feature_transformer": FeatureTransformer.from_details(feature_details)
     }
+    model_cache.put(model_id, signature, result)
+
+    return result
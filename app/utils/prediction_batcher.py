@@ -0,0 +1,193 @@
+import asyncio
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from app.config import settings
+from app.database import SessionLocal
+from app.logger import logger
+from app.services.prediction_service import predict_job_utils, predict_job_many_utils
+from app.utils.executors import BoundedExecutor, cpu_executor
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram.  Bucket counts are cumulative, keyed by their upper bound, as
+    in Prometheus.
+    """
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = sorted(bounds)
+        self._counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        buckets, cumulative = {}, 0
+        for bound, count in zip([*self.bounds, "+Inf"], self._counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {"count": self.count, "sum": self.total, "buckets": buckets}
+
+
+class _Batch:
+    def __init__(self):
+        self.requests: List[Tuple[dict, asyncio.Future, float]] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class PredictionBatcher:
+    """
+    Groups concurrent single-person predictions for the same model and target into one
+    vectorized predict.
+
+    The first request for a (model_id, name_object_predict) opens a batch; the batch runs
+    on the CPU executor once window_seconds have passed or max_batch_size requests joined,
+    and each caller gets its own row of the result.  If the batched predict fails (e.g. one
+    request lacks a feature), its requests are predicted one by one so every caller gets
+    its own result or error.  Callers check enabled (PREDICTION_BATCHING) first.
+
+    A batch outlives the requests that joined it, so it runs on a session of its own from
+    session_factory rather than on one of theirs.
+
+    State is only touched from the event loop, so no lock is needed.
+    """
+
+    BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+    QUEUE_WAIT_MS_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+    def __init__(
+        self,
+        executor: BoundedExecutor,
+        enabled: bool,
+        window_seconds: float,
+        max_batch_size: int,
+        predict_one: Callable = predict_job_utils,
+        predict_many: Callable = predict_job_many_utils,
+        session_factory: Callable = SessionLocal
+    ):
+        self.executor = executor
+        self.enabled = enabled
+        self.window_seconds = window_seconds
+        self.max_batch_size = max(1, max_batch_size)
+        self.predict_one = predict_one
+        self.predict_many = predict_many
+        self.session_factory = session_factory
+        self._batches: Dict[Tuple[int, str], _Batch] = {}
+        # The event loop only keeps weak references to tasks; running batches live here
+        self._tasks: Set[asyncio.Task] = set()
+        self.batch_size = Histogram(self.BATCH_SIZE_BUCKETS)
+        self.queue_wait_ms = Histogram(self.QUEUE_WAIT_MS_BUCKETS)
+        self.fallbacks = 0
+
+    async def predict(self, name_object_predict: str, data_person: dict, model_id: int) -> str:
+        """
+        Same contract as predict_job_utils, without the session: returns the predicted range
+        or raises its errors.
+        """
+        loop = asyncio.get_running_loop()
+        key = (model_id, name_object_predict)
+        batch = self._batches.get(key)
+        if batch is None:
+            batch = self._batches[key] = _Batch()
+            batch.timer = loop.call_later(self.window_seconds, self._flush, key)
+
+        future = loop.create_future()
+        batch.requests.append((data_person, future, time.perf_counter()))
+        if len(batch.requests) >= self.max_batch_size:
+            self._flush(key)
+
+        return await future
+
+    def _flush(self, key: Tuple[int, str]) -> None:
+        batch = self._batches.pop(key, None)
+        if batch is None:
+            return
+        batch.timer.cancel()
+        task = asyncio.ensure_future(self._run(key, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, key: Tuple[int, str], batch: _Batch) -> None:
+        model_id, name_object_predict = key
+        rows = [data_person for data_person, _, _ in batch.requests]
+        try:
+            started, fell_back, outcomes = await self.executor.run(
+                self._predict_rows, name_object_predict, rows, model_id
+            )
+        except Exception as e:
+            # One exception per caller: raising a shared instance from every caller would
+            # chain and rewrite its traceback
+            started, fell_back = time.perf_counter(), False
+            outcomes = [(None, self._batch_error(model_id, e)) for _ in rows]
+
+        self.batch_size.observe(len(rows))
+        self.fallbacks += fell_back
+        for (_, future, enqueued), (result, error) in zip(batch.requests, outcomes):
+            self.queue_wait_ms.observe(max(0.0, started - enqueued) * 1000)
+            if future.done():  # The caller went away
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    @staticmethod
+    def _batch_error(model_id: int, error: Exception) -> RuntimeError:
+        wrapped = RuntimeError(f"Batched prediction for model {model_id} failed: {error}")
+        wrapped.__cause__ = error
+        return wrapped
+
+    def _predict_rows(self, name_object_predict: str, rows: List[dict], model_id: int):
+        """
+        Runs on a worker thread.  Returns when the batch started running, whether it fell
+        back to one predict per row, and one (result, error) pair per row.
+        """
+        started = time.perf_counter()
+        db = self.session_factory()
+        try:
+            fell_back, outcomes = self._predict_with_session(name_object_predict, rows, model_id, db)
+        finally:
+            db.close()
+        return started, fell_back, outcomes
+
+    def _predict_with_session(self, name_object_predict: str, rows: List[dict], model_id: int, db):
+        try:
+            results = self.predict_many(name_object_predict, rows, model_id, db)
+            return False, [(result, None) for result in results]
+        except Exception as e:
+            if len(rows) == 1:
+                return False, [(None, e)]
+
+        logger.warning("Batched prediction of %s requests for model %s failed, predicting them one by one", len(rows), model_id)
+        outcomes = []
+        for row in rows:
+            try:
+                outcomes.append((self.predict_one(name_object_predict, row, model_id, db), None))
+            except Exception as e:
+                outcomes.append((None, e))
+        return True, outcomes
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "window_ms": self.window_seconds * 1000,
+            "max_batch_size": self.max_batch_size,
+            "open_batches": len(self._batches),
+            "fallbacks": self.fallbacks,
+            "batch_size": self.batch_size.snapshot(),
+            "queue_wait_ms": self.queue_wait_ms.snapshot(),
+        }
+
+
+prediction_batcher = PredictionBatcher(
+    cpu_executor,
+    enabled=settings.PREDICTION_BATCHING,
+    window_seconds=settings.PREDICTION_BATCH_WINDOW_MS / 1000,
+    max_batch_size=settings.PREDICTION_BATCH_MAX_SIZE,
+)
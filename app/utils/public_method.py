@@ -55,8 +55,8 @@ def number_validation(job_efficiency_rank, improvement_rank, satisfaction_score,
 
 
 def try_clean_stringified_dict(value: str) -> Any:
-    # جایگزینی np.float64(...) با مقدار داخلش
-    value = re.sub(r"np\.float64\(([^)]+)\)", r"\1", value)
+    # جایگزینی np.float64(...)، np.int64(...) و مانند آن با مقدار داخلش
+    value = re.sub(r"np\.(?:float|int|uint)\d*\(([^)]+)\)", r"\1", value)
 
     # جایگزینی nan و inf با None
     value = re.sub(r"\bnan\b", "None", value, flags=re.IGNORECASE)
@@ -72,6 +72,9 @@ def sanitize_value(value: Any) -> Any:
     if isinstance(value, np.generic):
         value = value.item()
 
+    if isinstance(value, np.ndarray):
+        value = value.tolist()
+
     if isinstance(value, float):
         if math.isnan(value) or math.isinf(value):
             return None
@@ -9,6 +9,12 @@ class ModelName(str, Enum):
     DecisionTree = "DecisionTree"
 
 
+class SearchStrategy(str, Enum):
+    EXHAUSTIVE = "exhaustive"
+    RANDOMIZED = "randomized"
+    SUCCESSIVE_HALVING = "successive_halving"
+
+
 
 
 
@@ -0,0 +1,50 @@
+import argparse
+import json
+import subprocess
+import sys
+
+# Runs in a fresh interpreter: imports the app, optionally every model family, and reports
+# wall time, peak RSS and whether the heavy libraries were imported
+PROBE = """
+import json, resource, sys, time
+started = time.perf_counter()
+import app.main
+if {eager}:
+    from app.models.AI.registry import MODEL_FAMILIES, resolve_model_class
+    for name in MODEL_FAMILIES:
+        resolve_model_class(name)
+print(json.dumps({{
+    "seconds": time.perf_counter() - started,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "loaded": [name for name in ("torch", "xgboost", "sklearn") if name in sys.modules],
+}}))
+"""
+
+
+def measure(eager: bool, repeat: int) -> dict:
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(eager=eager)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    runs.sort(key=lambda run: run["seconds"])
+    return runs[len(runs) // 2]
+
+
+def benchmark_import(repeat=3):
+    lazy = measure(eager=False, repeat=repeat)
+    eager = measure(eager=True, repeat=repeat)
+    print(f"{'':<24}{'import (s)':>12}{'max RSS (MB)':>14}  libraries loaded")
+    for label, run in (("lazy registry", lazy), ("all families imported", eager)):
+        print(f"{label:<24}{run['seconds']:>12.2f}{run['max_rss_mb']:>14.0f}  {', '.join(run['loaded']) or '-'}")
+    print(f"✅ Saved {eager['seconds'] - lazy['seconds']:.2f}s and {eager['max_rss_mb'] - lazy['max_rss_mb']:.0f} MB per worker at startup.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the import time and memory of the API with lazily and eagerly imported model families.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per variant; the median is reported.")
+    args = parser.parse_args()
+
+    benchmark_import(repeat=args.repeat)
@@ -1,6 +1,5 @@
 from starlette.datastructures import UploadFile
 import os
-import io
 
 from app.models.files.data_file import DataFile
 from app.database import SessionLocal
@@ -16,10 +15,10 @@ for shamsi_year in range(1393, 1404):
 
     try:
         with open(filepath, "rb") as f:
-            file_content = f.read()
+            # add_file streams the file in chunks, no need to read it into memory
             upload_file = UploadFile(
                 filename=filename,
-                file=io.BytesIO(file_content),
+                file=f,
                 # content_type="text/csv"
             )
 
@@ -1,7 +1,7 @@
-import csv
+import pandas as pd
 from sqlalchemy.orm import Session
 from app.database import SessionLocal
-from app.models.job_performance.job_performance import JobPerformance
+from app.services.job_performance_ingest_service import ingest_performances
 
 # مسیر فایل CSV
 CSV_PATH = "output_csv/all_labels.csv"
@@ -9,28 +9,21 @@ CSV_PATH = "output_csv/all_labels.csv"
 def load_performances():
     db: Session = SessionLocal()
     try:
-        with open(CSV_PATH, newline='') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                person_id = int(row["ID"])
-                job_efficiency_rank = int(row["Work Impact"])
-                improvement_rank = int(row["Career Growth"])
-                satisfaction_score = float(row["Job Satisfaction"])
-                job_id = 1
-                shamsi_year = int(row["Shamsi Year"])  # فرض: "1402"
-                created_at = f"{shamsi_year}/01/01"  # مثلاً '1402/01/01'
+        labels = pd.read_csv(CSV_PATH)
+        records = pd.DataFrame({
+            "person_id": labels["ID"],
+            "job_efficiency_rank": labels["Work Impact"],
+            "improvement_rank": labels["Career Growth"],
+            "satisfaction_score": labels["Job Satisfaction"],
+            "job_id": 1,
+            "created_at": labels["Shamsi Year"].astype(str) + "/01/01",  # مثلاً '1402/01/01'
+        })
 
-                JobPerformance.add_performance(
-                    db,
-                    person_id,
-                    job_efficiency_rank,
-                    improvement_rank,
-                    satisfaction_score,
-                    job_id,
-                    created_at
-                )
-        db.commit()
-        print("✅ Done importing job performances.")
+        result = ingest_performances(db, records)
+        print(f"✅ Done importing job performances: {result['inserted']} inserted, "
+              f"{result['updated']} updated, {result['rejected']} rejected.")
+        for reject in result["rejects"]:
+            print(f"   row {reject['row']}: {'; '.join(reject['errors'])}")
     except Exception as e:
         print("❌ Error:", e)
         db.rollback()
@@ -0,0 +1,30 @@
+import argparse
+from app.database import SessionLocal
+from app.models.files.data_file import DataFile
+
+
+def rebuild_person_index(exam_id=None, full=False):
+    db = SessionLocal()
+    try:
+        moved = DataFile.move_to_blob_store(db, exam_id=exam_id)
+        print(f"✅ Moved {moved} file(s) to the blob store.")
+        converted = DataFile.rebuild_columnar(db, exam_id=exam_id, full=full)
+        print(f"✅ Wrote columnar copies of {converted} file(s).")
+        indexed = DataFile.rebuild_row_index(db, exam_id=exam_id, full=full)
+        print(f"✅ Indexed {indexed} file(s).")
+        hashed = DataFile.rebuild_checksums(db, exam_id=exam_id, full=full)
+        print(f"✅ Recorded checksums of {hashed} file(s).")
+    except Exception as e:
+        print("❌ Error:", e)
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move exam feature files already on disk to the blob store and build their columnar copies, person row index and checksums.")
+    parser.add_argument("--exam-id", type=int, default=None, help="Only index files of this exam.")
+    parser.add_argument("--full", action="store_true", help="Rebuild columnar copies, index and checksums from scratch.")
+    args = parser.parse_args()
+
+    rebuild_person_index(exam_id=args.exam_id, full=args.full)
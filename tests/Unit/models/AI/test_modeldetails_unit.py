@@ -1,4 +1,6 @@
+import json
 import pytest
+import numpy as np
 from datetime import datetime
 from app.models.AI.ModelDetails import ModelDetails
 
@@ -86,3 +88,29 @@ def test_delete_model_by_id(db_session, sample_card_info):
     # Verify that the record is actually deleted
     found = ModelDetails.find_model_by_id(db_session, record.id)
     assert found is None
+
+
+def test_add_record_sanitizes_metrics(db_session, sample_card_info):
+    """Test that numpy metrics are stored as plain JSON with NaN/inf replaced by None."""
+    sample_card_info["accuracy_results"] = {"mean": np.float64(0.8), "std": np.float64(np.nan)}
+    sample_card_info["t_test_results_accuracy"] = {"t_stat": np.float64(np.inf), "p_value": np.float64(0.5)}
+    sample_card_info["confidence_level_f1_score"] = np.float64(np.nan)
+    sample_card_info["num_all_samples"] = np.int64(1000)
+    record = ModelDetails.add_record(db_session, sample_card_info)
+    db_session.expire(record)
+
+    assert record.accuracy_results == {"mean": 0.8, "std": None}
+    assert record.t_test_results_accuracy == {"t_stat": None, "p_value": 0.5}
+    assert record.confidence_level_f1_score is None
+    assert record.num_all_samples == 1000
+    json.dumps(record.accuracy_results, allow_nan=False)
+
+
+def test_find_recent_model_ids_newest_first(db_session, sample_card_info):
+    """Test that recent model IDs are ordered by evaluation date, newest first."""
+    ids = []
+    for day in (3, 1, 2):
+        sample_card_info["model_evaluation_date"] = datetime(2030, 1, day)
+        ids.append(ModelDetails.add_record(db_session, sample_card_info).id)
+
+    assert ModelDetails.find_recent_model_ids(db_session, 2) == [ids[0], ids[2]]
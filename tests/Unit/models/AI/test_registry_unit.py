@@ -0,0 +1,42 @@
+import subprocess
+import sys
+import pytest
+
+from app.models.AI.registry import get_model_family, resolve_model_class
+from app.models.AI.decision_tree import DecisionTreeModel
+from app.models.AI.svm import SVMModel
+from app.utils.train_helper_method import ModelName
+
+
+@pytest.mark.parametrize("name", ["SVM", "SVMModel", ModelName.SVM])
+def test_model_name_and_card_architecture_resolve_to_the_same_class(name):
+    assert resolve_model_class(name) is SVMModel
+
+
+def test_legacy_card_alias_resolves():
+    assert get_model_family("XGB") is get_model_family("XgBoost")
+
+
+def test_every_model_name_is_registered():
+    for model_name in ModelName:
+        assert resolve_model_class(model_name).__name__ == get_model_family(model_name).class_name
+
+
+def test_unknown_model_raises():
+    with pytest.raises(ValueError, match="Unsupported model"):
+        resolve_model_class("RandomForest")
+
+
+def test_families_are_imported_on_first_use():
+    probe = (
+        "import sys\n"
+        "from app.utils import model_loader\n"
+        "from app.models.AI.registry import resolve_model_class\n"
+        "assert 'torch' not in sys.modules and 'xgboost' not in sys.modules\n"
+        "resolve_model_class('DecisionTree')\n"
+        "assert 'torch' not in sys.modules and 'xgboost' not in sys.modules\n"
+        "resolve_model_class('XgBoost')\n"
+        "assert 'xgboost' in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", probe], check=True)
+    assert resolve_model_class("DecisionTree") is DecisionTreeModel
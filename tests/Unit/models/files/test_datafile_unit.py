@@ -1,3 +1,4 @@
+import os
 import pytest
 from io import BytesIO
 from datetime import datetime
@@ -67,3 +68,49 @@ def test_get_files_by_exam_id(db_session):
     
     assert 1401 in files_by_year
     assert "/path/file2.txt" in files_by_year[1401]
+
+def test_add_file_shares_blob_between_exams(monkeypatch, db_session, tmp_path):
+    """Test that the same content uploaded for two exams is stored and indexed once."""
+    from fastapi import UploadFile
+    from app.models.files.exam_info import ExamDetails
+    from app.models.files.person_row_index import PersonRowIndex
+    from app.services import file_service
+
+    monkeypatch.setattr(file_service, "UPLOAD_DIR", str(tmp_path))
+    db_session.add_all([ExamDetails(id=1, title="exam 1", creator_name="me"),
+                        ExamDetails(id=2, title="exam 2", creator_name="me")])
+    db_session.commit()
+    content = b"person_id,value\n1,10\n2,20\n"
+
+    first = DataFile.add_file(db_session, UploadFile(filename="a.csv", file=BytesIO(content)), 1, "1402/01/01")
+    build_offsets = MagicMock(side_effect=file_service.build_person_row_offsets)
+    monkeypatch.setattr(file_service, "build_person_row_offsets", build_offsets)
+    second = DataFile.add_file(db_session, UploadFile(filename="b.csv", file=BytesIO(content)), 2, "1402/01/01")
+
+    assert first.path == second.path
+    assert first.sha256 == second.sha256
+    assert (first.name, second.name) == ("a.csv", "b.csv")
+    build_offsets.assert_not_called()
+    assert PersonRowIndex.find_row(db_session, 2, 2)[0] == second.path
+
+def test_move_to_blob_store(monkeypatch, db_session, tmp_path):
+    """Test that per-exam copies of the same content are replaced by one blob."""
+    from app.services import file_service
+
+    monkeypatch.setattr(file_service, "UPLOAD_DIR", str(tmp_path))
+    paths = []
+    for exam_id in (1, 2):
+        path = tmp_path / f"exam_{exam_id}" / "features.csv"
+        path.parent.mkdir()
+        path.write_text("person_id,value\n1,10\n")
+        paths.append(str(path))
+        db_session.add(DataFile(name="features.csv", path=str(path),
+                                created_at=JalaliDatetime(1402, 1, 1).todatetime(), exam_id=exam_id))
+    db_session.commit()
+
+    assert DataFile.move_to_blob_store(db_session) == 2
+    assert DataFile.move_to_blob_store(db_session) == 0
+
+    blob_paths = {data_file.path for data_file in db_session.query(DataFile).all()}
+    assert len(blob_paths) == 1 and file_service.is_blob_path(blob_paths.pop())
+    assert not any(os.path.exists(path) for path in paths)
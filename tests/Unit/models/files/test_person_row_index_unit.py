@@ -0,0 +1,87 @@
+import pandas as pd
+from khayyam import JalaliDatetime
+from app.models.files.data_file import DataFile
+from app.models.files.exam_info import ExamDetails
+from app.models.files.person_row_index import PersonRowIndex
+from app.utils.predict_helper_method import find_person_feature_in_exam
+
+
+def add_data_file(db_session, tmp_path, name, year, data, exam_id=1):
+    """Write a CSV and register it as an (unindexed) DataFile."""
+    path = tmp_path / name
+    pd.DataFrame(data).to_csv(path, index=False)
+    data_file = DataFile(
+        name=name,
+        path=str(path),
+        created_at=JalaliDatetime(year, 1, 1).todatetime(),
+        exam_id=exam_id
+    )
+    db_session.add(data_file)
+    db_session.commit()
+    return data_file
+
+
+def test_index_keeps_newest_year(db_session, tmp_path):
+    db_session.add(ExamDetails(id=1, title="exam", creator_name="me"))
+    old = add_data_file(db_session, tmp_path, "old.csv", 1401, {"person_id": [1, 2], "value": [10, 20]})
+    new = add_data_file(db_session, tmp_path, "new.csv", 1402, {"person_id": [2, 3], "value": [200, 300]})
+
+    # Index the newer file first: the older file must not overwrite person 2
+    DataFile.build_row_index(db_session, new)
+    DataFile.build_row_index(db_session, old)
+
+    assert DataFile.is_exam_fully_indexed(db_session, 1)
+    assert PersonRowIndex.find_row(db_session, 1, 2)[0] == new.path
+    assert PersonRowIndex.find_row(db_session, 1, 1)[0] == old.path
+    assert PersonRowIndex.find_row(db_session, 1, 4) is None
+
+
+def test_find_person_feature_in_exam_uses_index(db_session, tmp_path, monkeypatch):
+    db_session.add(ExamDetails(id=1, title="exam", creator_name="me"))
+    add_data_file(db_session, tmp_path, "old.csv", 1401, {"person_id": [1, 2], "value": [10, 20]})
+    add_data_file(db_session, tmp_path, "new.csv", 1402, {"person_id": [2, 3], "value": [200, 300]})
+
+    assert DataFile.rebuild_row_index(db_session, exam_id=1) == 2
+
+    def fail_scan(*args, **kwargs):
+        raise AssertionError("indexed lookups must not scan files")
+    monkeypatch.setattr("app.utils.predict_helper_method.find_person_feature_last_exam", fail_scan)
+
+    data, found = find_person_feature_in_exam(db_session, 1, 2)
+    assert found is True
+    assert data == {"person_id": 2, "value": 200}
+
+    data, found = find_person_feature_in_exam(db_session, 1, 5)
+    assert found is False
+    assert data == {}
+
+
+def test_find_person_feature_in_exam_reads_columnar_row(db_session, tmp_path):
+    db_session.add(ExamDetails(id=1, title="exam", creator_name="me"))
+    add_data_file(db_session, tmp_path, "new.csv", 1402, {"person_id": [2, 3], "value": [200, 300]})
+
+    assert DataFile.rebuild_columnar(db_session, exam_id=1) == 1
+    assert DataFile.rebuild_row_index(db_session, exam_id=1) == 1
+
+    data, found = find_person_feature_in_exam(db_session, 1, 3)
+    assert found is True
+    assert data == {"person_id": 3, "value": 300}
+
+
+def test_find_person_feature_in_exam_falls_back_to_scan(db_session, tmp_path):
+    db_session.add(ExamDetails(id=1, title="exam", creator_name="me"))
+    add_data_file(db_session, tmp_path, "old.csv", 1401, {"person_id": [1, 2], "value": [10, 20]})
+
+    data, found = find_person_feature_in_exam(db_session, 1, 1)
+    assert found is True
+    assert data["value"] == 10
+
+
+def test_full_rebuild(db_session, tmp_path):
+    db_session.add(ExamDetails(id=1, title="exam", creator_name="me"))
+    add_data_file(db_session, tmp_path, "old.csv", 1401, {"person_id": [1, 2], "value": [10, 20]})
+
+    assert DataFile.rebuild_row_index(db_session, exam_id=1) == 1
+    assert DataFile.rebuild_row_index(db_session, exam_id=1) == 0
+    assert DataFile.rebuild_row_index(db_session, exam_id=1, full=True) == 1
+    assert db_session.query(PersonRowIndex).count() == 2
@@ -1,4 +1,5 @@
 import pytest
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 from sqlalchemy.orm import Session
 from datetime import datetime
@@ -68,11 +69,16 @@ def test_get_performance_by_jobs_and_date(mock_session):
         job_id=102,
         created_at=datetime(2023, 6, 15)
     )
-    mock_records = [record1, record2]
+    # The query selects year, job, person and the requested metric, ordered by year
+    mock_rows = [
+        SimpleNamespace(jalali_year=record.jalali_year, job_id=record.job_id,
+                        person_id=record.person_id, performance_value=record.job_efficiency_rank)
+        for record in [record1, record2]
+    ]
 
     # Configure the mock query
     mock_query = MagicMock()
-    mock_query.filter.return_value.all.return_value = mock_records
+    mock_query.filter.return_value.order_by.return_value.all.return_value = mock_rows
     mock_session.query.return_value = mock_query
 
     # Invoke the method under test
@@ -109,3 +115,18 @@ def test_invalid_performance_metric(mock_session):
             job_id=101,
             performance_metric="invalid_metric"
         )
+
+
+def test_jalali_year_follows_created_at():
+    record = JobPerformance(
+        person_id=1,
+        job_efficiency_rank=8.0,
+        improvement_rank=7.5,
+        satisfaction_score=9.0,
+        job_id=101,
+        created_at=JalaliDatetime(1401, 12, 29).todatetime()
+    )
+    assert record.jalali_year == 1401
+
+    record.created_at = JalaliDatetime(1402, 1, 1).todatetime()
+    assert record.jalali_year == 1402
@@ -0,0 +1,116 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services import columnar_file_service
+
+
+@pytest.fixture
+def feature_csv(tmp_path):
+    path = tmp_path / "features.csv"
+    pd.DataFrame({
+        "person_id": [1, 2, 3],
+        "age": [30.5, np.nan, 41.0],
+        "years": [1, 2, 3],
+        "city": ["Tehran", None, "Shiraz"],
+        "manager": [True, False, True],
+    }).to_csv(path, index=False)
+    return str(path)
+
+
+def test_sidecar_roundtrip_matches_read_csv(feature_csv):
+    columnar_file_service.write_columnar(feature_csv)
+
+    expected = pd.read_csv(feature_csv)
+    actual = columnar_file_service.load_feature_frame(feature_csv)
+
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_open_columns_is_memory_mapped(feature_csv):
+    columnar_file_service.write_columnar(feature_csv)
+
+    columns = columnar_file_service.open_columns(feature_csv, ["person_id"])
+
+    assert list(columns) == ["person_id"]
+    assert isinstance(columns["person_id"], np.memmap)
+    assert columns["person_id"].tolist() == [1, 2, 3]
+
+
+def test_read_selected_rows(feature_csv):
+    columnar_file_service.write_columnar(feature_csv)
+
+    rows = columnar_file_service.read_rows(feature_csv, [1])
+
+    record = rows.to_dict(orient="records")[0]
+    assert record["person_id"] == 2
+    assert np.isnan(record["age"])
+    assert np.isnan(record["city"])
+
+
+def test_stale_sidecar_is_ignored(feature_csv):
+    columnar_file_service.write_columnar(feature_csv)
+    with open(feature_csv, "a") as f:
+        f.write("4,50.0,4,Tabriz,False\n")
+
+    assert columnar_file_service.read_rows(feature_csv) is None
+    assert len(columnar_file_service.load_feature_frame(feature_csv)) == 4
+
+
+def test_no_sidecar(tmp_path):
+    path = tmp_path / "plain.csv"
+    pd.DataFrame({"person_id": [1]}).to_csv(path, index=False)
+
+    assert columnar_file_service.open_columns(str(path)) is None
+    assert not os.path.exists(columnar_file_service.get_sidecar_path(str(path)))
+
+
+def test_fresh_sidecar_is_kept_by_later_writers(feature_csv):
+    sidecar_path = columnar_file_service.write_columnar(feature_csv)
+    inode = os.stat(sidecar_path).st_ino
+
+    columnar_file_service.write_columnar(feature_csv)
+
+    assert os.stat(sidecar_path).st_ino == inode
+    assert sorted(os.listdir(os.path.dirname(sidecar_path))) == ["features.csv", "features.csv.columns"]
+
+
+def test_stale_sidecar_is_replaced(feature_csv):
+    columnar_file_service.write_columnar(feature_csv)
+    with open(feature_csv, "a") as f:
+        f.write("4,50.0,4,Tabriz,False\n")
+
+    columnar_file_service.write_columnar(feature_csv)
+
+    assert len(columnar_file_service.read_rows(feature_csv)) == 4
+    assert sorted(os.listdir(os.path.dirname(feature_csv))) == ["features.csv", "features.csv.columns"]
+
+
+def test_concurrent_writers_and_readers(feature_csv):
+    errors = []
+
+    def write():
+        try:
+            columnar_file_service.write_columnar(feature_csv)
+        except Exception as e:
+            errors.append(e)
+
+    def read():
+        try:
+            for _ in range(20):
+                rows = columnar_file_service.load_feature_frame(feature_csv)
+                assert rows["person_id"].tolist() == [1, 2, 3]
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write) for _ in range(8)] + [threading.Thread(target=read) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    pd.testing.assert_frame_equal(columnar_file_service.read_rows(feature_csv), pd.read_csv(feature_csv))
+    assert sorted(os.listdir(os.path.dirname(feature_csv))) == ["features.csv", "features.csv.columns"]
@@ -1,3 +1,4 @@
+import hashlib
 import os
 import pytest
 from fastapi import UploadFile
@@ -49,3 +50,72 @@ def test_save_file_to_disk(temp_upload_dir):
 
     with open(expected_path, "rb") as f:
         assert f.read() == test_content
+
+def test_store_upload_streams_in_chunks(temp_upload_dir):
+    """
+    Test that store_upload writes the content in chunks and reports its size and SHA-256.
+    """
+    test_content = b"person_id,value\n" + b"1,10\n" * 1000
+    file = UploadFile(filename="features.csv", file=BytesIO(test_content))
+
+    stored = file_service.store_upload(file, "exam_1")
+    # Copy again with a chunk size that does not divide the content
+    size, sha256 = file_service.stream_to_file(BytesIO(test_content), stored.path + ".copy", chunk_size=7)
+
+    assert stored.path == os.path.join(temp_upload_dir, "exam_1", "features.csv")
+    assert stored.size == size == len(test_content)
+    assert stored.sha256 == sha256 == hashlib.sha256(test_content).hexdigest()
+    assert file_service.file_sha256(stored.path) == stored.sha256
+    assert sorted(os.listdir(os.path.dirname(stored.path))) == ["features.csv", "features.csv.copy"]
+
+def test_store_blob_keeps_one_copy_per_content(temp_upload_dir):
+    """
+    Test that identical content is stored once, under its SHA-256.
+    """
+    content = b"person_id,value\n1,10\n"
+
+    first = file_service.store_blob(BytesIO(content))
+    second = file_service.store_blob(BytesIO(content), chunk_size=4)
+    other = file_service.store_blob(BytesIO(content + b"2,20\n"))
+
+    assert first == second
+    assert first.path == file_service.get_blob_path(hashlib.sha256(content).hexdigest())
+    assert file_service.is_blob_path(first.path)
+    assert other.path != first.path
+    # No temporary files are left behind
+    assert os.listdir(os.path.join(temp_upload_dir, file_service.BLOB_DIR_NAME, first.sha256[:2])) == [first.sha256]
+
+def test_load_person_row_offsets_is_cached(tmp_path, monkeypatch):
+    """
+    Test that row offsets are computed once per file and recomputed when it changes.
+    """
+    csv_path = tmp_path / "features.csv"
+    csv_path.write_text("person_id,value\n1,10\n2,20\n")
+    expected = file_service.build_person_row_offsets(str(csv_path))
+
+    assert file_service.load_person_row_offsets(str(csv_path)) == expected
+    assert os.path.exists(str(csv_path) + file_service.ROW_OFFSETS_SUFFIX)
+
+    def fail(file_path):
+        raise AssertionError("offsets should come from the cache")
+    monkeypatch.setattr(file_service, "build_person_row_offsets", fail)
+    assert file_service.load_person_row_offsets(str(csv_path)) == expected
+
+    monkeypatch.undo()
+    csv_path.write_text("person_id,value\n3,30\n")
+    assert set(file_service.load_person_row_offsets(str(csv_path))) == {3}
+
+def test_build_person_row_offsets_and_read_row(tmp_path):
+    """
+    Test that row offsets point at the first row of every person and can be read back.
+    """
+    csv_path = tmp_path / "features.csv"
+    csv_path.write_text("person_id,value,city\n1,10,Tehran\n2,20,Shiraz\n\n1,11,Tabriz\n")
+
+    offsets = file_service.build_person_row_offsets(str(csv_path))
+
+    assert set(offsets) == {1, 2}
+    assert offsets[1][0] == 0
+    assert offsets[2][0] == 1
+    assert file_service.read_row_at_offset(str(csv_path), offsets[2][1]) == {"person_id": 2, "value": 20, "city": "Shiraz"}
+    assert file_service.read_row_at_offset(str(csv_path), offsets[1][1])["value"] == 10
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.model_selection import GridSearchCV
+from sklearn.tree import DecisionTreeClassifier
+from app.services import hyperparameter_search_service
+from app.services.hyperparameter_search_service import search_hyperparameters
+from app.utils.train_helper_method import SearchStrategy
+
+PARAM_GRID = {"max_depth": [1, 2, 4, 8], "min_samples_leaf": [1, 5, 10]}
+
+
+@pytest.fixture
+def data():
+    rng = np.random.RandomState(0)
+    X = pd.DataFrame(rng.rand(300, 4), columns=list("abcd"))
+    Y = pd.Series((X["a"] + 0.3 * X["b"] > 0.6).astype(int) + (X["c"] > 0.8).astype(int))
+    return X, Y
+
+
+def test_exhaustive_matches_grid_search(data):
+    X, Y = data
+    estimator = DecisionTreeClassifier(random_state=0)
+
+    best_params, n_fits = search_hyperparameters(estimator, X, Y, PARAM_GRID, SearchStrategy.EXHAUSTIVE, n_jobs=2)
+
+    reference = GridSearchCV(estimator, PARAM_GRID, cv=5, scoring="accuracy").fit(X, Y)
+    assert best_params == reference.best_params_
+    assert n_fits == 12 * 5
+
+
+def test_randomized_fits_n_iter_candidates(data):
+    X, Y = data
+    np.random.seed(1)
+    first = search_hyperparameters(DecisionTreeClassifier(random_state=0), X, Y, PARAM_GRID,
+                                   SearchStrategy.RANDOMIZED, n_iter=4)
+    np.random.seed(1)
+    second = search_hyperparameters(DecisionTreeClassifier(random_state=0), X, Y, PARAM_GRID,
+                                    SearchStrategy.RANDOMIZED, n_iter=4)
+
+    assert first == second
+    assert first[1] == 4 * 5
+
+
+def test_successive_halving_fits_fewer_models(data):
+    X, Y = data
+    best_params, n_fits = search_hyperparameters(DecisionTreeClassifier(random_state=0), X, Y, PARAM_GRID,
+                                                 SearchStrategy.SUCCESSIVE_HALVING)
+
+    assert set(best_params) == set(PARAM_GRID)
+    # 12 candidates on 33 rows, 4 on 99 and 2 on all 300
+    assert n_fits == (12 + 4 + 2) * 5
+
+
+def test_successive_halving_subsamples_keep_every_class(data, monkeypatch):
+    X, _ = data
+    # A rare class of 10 rows in 300 often misses an unstratified 33-row subsample
+    Y = pd.Series(np.r_[np.zeros(150, dtype=int), np.ones(140, dtype=int), np.full(10, 2)])
+    rung_labels = []
+    evaluate = hyperparameter_search_service._evaluate_candidates
+
+    def recording_evaluate(estimator, X, Y, *args):
+        rung_labels.append(Y)
+        return evaluate(estimator, X, Y, *args)
+
+    monkeypatch.setattr(hyperparameter_search_service, "_evaluate_candidates", recording_evaluate)
+    np.random.seed(0)
+    search_hyperparameters(DecisionTreeClassifier(random_state=0), X, Y, PARAM_GRID,
+                           SearchStrategy.SUCCESSIVE_HALVING, num_classes=3)
+
+    # 33 and 99 rows, plus the rows that top the rare class up to cv=5
+    assert [len(labels) for labels in rung_labels] == [36, 101, 300]
+    for labels in rung_labels:
+        assert labels.value_counts().min() >= 5
+    # Every rung keeps the rows of the previous one
+    assert set(rung_labels[0].index) <= set(rung_labels[1].index) <= set(rung_labels[2].index)
+
+
+def test_time_budget_stops_search(data):
+    X, Y = data
+    best_params, n_fits = search_hyperparameters(DecisionTreeClassifier(random_state=0), X, Y, PARAM_GRID,
+                                                 SearchStrategy.EXHAUSTIVE, time_budget=1e-9)
+
+    assert best_params == {}
+    assert n_fits == 0
@@ -0,0 +1,74 @@
+import asyncio
+import threading
+import numpy as np
+
+from app.services import model_warmup_service
+from app.services.model_warmup_service import ModelWarmup, synthetic_person, warm_up_model
+from app.utils.executors import BoundedExecutor
+
+
+def test_synthetic_person_covers_every_base_feature():
+    result = {
+        "base_feature": ["age", "gender", "score"],
+        "normalization_params": {"age": {"min": 20, "max": 80}},
+        "one_hot_mappings": {"gender": ["F", "M"]},
+    }
+    assert synthetic_person(result) == {"age": 20, "gender": "F", "score": 0}
+
+
+def test_warm_up_model_runs_one_predict(mocker):
+    model = mocker.Mock()
+    model.predict.return_value = np.array([1])
+    mocker.patch.object(model_warmup_service, "SessionLocal")
+    mocker.patch.object(model_warmup_service, "find_essential_parameter", return_value={
+        "name_object_predict_in_card": "satisfaction_score",
+        "base_feature": ["age", "gender"],
+        "normalization_params": {"age": {"min": 20, "max": 80}},
+        "one_hot_mappings": {"gender": ["F", "M"]},
+        "feature_order": ["age", "gender_F", "gender_M"],
+        "model": model,
+        "number_of_labels": 4,
+    })
+
+    warm_up_model(7)
+
+    np.testing.assert_array_almost_equal(model.predict.call_args[0][0], np.array([[0.0, 1, 0]]))
+
+
+def test_run_warms_pinned_and_recent_models_in_parallel(monkeypatch):
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def fake_warm_up(model_id):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        threading.Event().wait(0.05)
+        with lock:
+            running[0] -= 1
+        if model_id == 3:
+            raise FileNotFoundError("model file missing")
+
+    monkeypatch.setattr(model_warmup_service, "warm_up_model", fake_warm_up)
+    executor = BoundedExecutor("test", max_workers=4)
+    warmup = ModelWarmup(executor, recent_models=3, pinned_model_ids=[9, 2], concurrency=2)
+    monkeypatch.setattr(warmup, "select_model_ids", lambda: [9, 2, 5, 3])
+
+    assert not warmup.ready
+    asyncio.run(warmup.run())
+    executor.shutdown()
+
+    stats = warmup.stats()
+    assert warmup.ready and stats["status"] == "done"
+    assert {model_id: state["status"] for model_id, state in stats["models"].items()} == {
+        "9": "ready", "2": "ready", "5": "ready", "3": "failed"
+    }
+    assert "missing" in stats["models"]["3"]["error"]
+    assert peak[0] == 2
+
+
+def test_select_model_ids_puts_pinned_models_first(monkeypatch):
+    monkeypatch.setattr(model_warmup_service, "SessionLocal", lambda: type("DB", (), {"close": lambda self: None})())
+    monkeypatch.setattr(model_warmup_service.ModelDetails, "find_recent_model_ids", lambda db, limit: [5, 9, 4][:limit])
+    warmup = ModelWarmup(None, recent_models=3, pinned_model_ids=[9, 2, 9], concurrency=1)
+
+    assert warmup.select_model_ids() == [9, 2, 5, 4]
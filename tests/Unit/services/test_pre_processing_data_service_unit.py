@@ -69,14 +69,34 @@ def test_fetch_file_data(mock_get_files, mock_db, mock_file_data):
 def test_process_file(mock_read_csv, mock_performance_data, mock_csv_data):
     """Test processing a file."""
     mock_read_csv.return_value = mock_csv_data
-    combined_features, combined_labels = process_file("mock_file_1401.csv", mock_performance_data["1401"], [], [])
+    features, labels = process_file("mock_file_1401.csv", mock_performance_data["1401"])
 
-    assert len(combined_features) == 2
-    assert len(combined_labels) == 2
-    assert combined_labels == [85, 90]
+    assert len(features) == 2
+    assert list(features.columns) == ["feature1", "feature2"]
+    assert labels.tolist() == [85, 90]
     mock_read_csv.assert_called_once_with("mock_file_1401.csv")
 
 
+@patch("pandas.read_csv")
+def test_process_file_keeps_first_row_per_person(mock_read_csv):
+    """Records follow their own order, reuse the person's first row and skip unknown persons."""
+    mock_read_csv.return_value = pd.DataFrame({
+        "person_id": [2, 1, 2],
+        "feature1": [20, 10, 99],
+    })
+    records = [
+        {"person_id": 2, "performance_value": 5},
+        {"person_id": 3, "performance_value": 6},
+        {"person_id": 1, "performance_value": 7},
+        {"person_id": 2, "performance_value": 8},
+    ]
+
+    features, labels = process_file("mock_file.csv", records)
+
+    assert features["feature1"].tolist() == [20, 10, 20]
+    assert labels.tolist() == [5, 7, 8]
+
+
 def test_find_all_similar_job():
     """Test finding similar jobs."""
     assert find_all_similar_job("job1") == ["job1"]
@@ -85,7 +105,9 @@ def test_find_all_similar_job():
 @patch("app.services.pre_processing_data_service.process_file")
 def test_process_data(mock_process_file, mock_performance_data, mock_file_data):
     """Test processing data aggregation."""
-    mock_process_file.side_effect = lambda file_path, records, feats, labels: (feats + [[10, 20]], labels + [85])
+    mock_process_file.side_effect = lambda file_path, records: (
+        pd.DataFrame({"feature1": [10], "feature2": [20]}), pd.Series([85])
+    )
 
     X, Y = process_data(mock_performance_data, mock_file_data, "job_efficiency_rank")
 
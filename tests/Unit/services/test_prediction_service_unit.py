@@ -1,7 +1,7 @@
 import pytest
 import numpy as np
 import pandas as pd
-from app.services.prediction_service import predict_job_utils
+from app.services.prediction_service import predict_job_utils, predict_job_batch_utils, predict_job_many_utils
 
 pytest_plugins = ["pytest_mock"]
 
@@ -97,4 +97,93 @@ def test_normalization_and_encoding(mocker):
     assert result == "Medium"
     expected_input = np.array([[(50-20)/(80-20), 1.0]])
     actual_input = mock_model.predict.call_args[0][0]
-    np.testing.assert_array_almost_equal(actual_input, expected_input)
\ No newline at end of file
+    np.testing.assert_array_almost_equal(actual_input, expected_input)
+
+def test_batch_prediction_calls_model_once(mocker):
+    """Test that a batch is encoded row by row and predicted in a single model call."""
+    mock_model = mocker.Mock()
+    mock_model.predict.return_value = np.array([0, 1, 2])
+    mocker.patch(
+        'app.services.prediction_service.find_essential_parameter',
+        return_value={
+            "name_object_predict_in_card": "correct_object",
+            "base_feature": ["age", "gender"],
+            "normalization_params": {"age": {"min": 20, "max": 80}},
+            "one_hot_mappings": {"gender": ["F", "M"]},
+            "feature_order": ["age", "gender_F", "gender_M"],
+            "model": mock_model,
+            "number_of_labels": 4,
+        }
+    )
+
+    persons_df = pd.DataFrame({
+        "person_id": [10, 11, 12],
+        "age": [20, 50, 80],
+        "gender": ["F", "M", "X"],
+    })
+    results = predict_job_batch_utils("correct_object", persons_df, 1, None)
+
+    assert results == {10: "0 تا 25", 11: "25 تا 50", 12: "50 تا 75"}
+    mock_model.predict.assert_called_once()
+    expected_input = np.array([[0.0, 1, 0], [0.5, 0, 1], [1.0, 0, 0]])
+    np.testing.assert_array_almost_equal(mock_model.predict.call_args[0][0], expected_input)
+
+def test_batch_prediction_name_object_mismatch(mocker):
+    """Test ValueError when the batch target doesn't match the model's learned object."""
+    mocker.patch(
+        'app.services.prediction_service.find_essential_parameter',
+        return_value={
+            "name_object_predict_in_card": "wrong_object",
+            "base_feature": [],
+            "normalization_params": {},
+            "one_hot_mappings": {},
+            "feature_order": [],
+            "model": None,
+            "number_of_labels": 2,
+        }
+    )
+    with pytest.raises(ValueError, match="not learned by this model"):
+        predict_job_batch_utils("correct_object", pd.DataFrame({"person_id": [1], "age": [3]}), 1, None)
+
+def test_many_predictions_keep_request_order(mocker):
+    """Test that micro-batched requests are predicted in one call and answered in order."""
+    mock_model = mocker.Mock()
+    mock_model.predict.return_value = np.array([2, 0])
+    mocker.patch(
+        'app.services.prediction_service.find_essential_parameter',
+        return_value={
+            "name_object_predict_in_card": "correct_object",
+            "base_feature": ["age"],
+            "normalization_params": {"age": {"min": 20, "max": 80}},
+            "one_hot_mappings": {},
+            "feature_order": ["age"],
+            "model": mock_model,
+            "number_of_labels": 4,
+        }
+    )
+
+    results = predict_job_many_utils("correct_object", [{"age": 80}, {"age": 20}], 1, None)
+
+    assert results == ["50 تا 75", "0 تا 25"]
+    mock_model.predict.assert_called_once()
+    np.testing.assert_array_almost_equal(mock_model.predict.call_args[0][0], np.array([[1.0], [0.0]]))
+
+def test_many_predictions_check_each_request_for_missing_features(mocker):
+    """Test that one request's features don't cover for another request missing them."""
+    mock_model = mocker.Mock()
+    mocker.patch(
+        'app.services.prediction_service.find_essential_parameter',
+        return_value={
+            "name_object_predict_in_card": "correct_object",
+            "base_feature": ["age", "dept"],
+            "normalization_params": {},
+            "one_hot_mappings": {},
+            "feature_order": ["age", "dept"],
+            "model": mock_model,
+            "number_of_labels": 4,
+        }
+    )
+
+    with pytest.raises(ValueError, match="missing the required feature: age"):
+        predict_job_many_utils("correct_object", [{"dept": 1}, {"age": 30, "dept": 1}], 1, None)
+    mock_model.predict.assert_not_called()
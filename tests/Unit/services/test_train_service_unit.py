@@ -0,0 +1,98 @@
+import os
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+import pytest
+from app.models.AI.decision_tree import DecisionTreeModel
+from app.services.train_service import split_worker_budget, train_model
+
+
+@pytest.mark.parametrize("n_jobs, n_iterations, expected", [
+    (1, 5, (1, 1)),
+    (4, 5, (4, 1)),
+    (32, 5, (5, 6)),
+    (3, 1, (1, 3)),
+])
+def test_split_worker_budget(n_jobs, n_iterations, expected):
+    assert split_worker_budget(n_jobs, n_iterations) == expected
+
+
+def make_data():
+    rng = np.random.RandomState(0)
+    X = pd.DataFrame({
+        "age": rng.randint(20, 60, 120),
+        "score": rng.rand(120),
+        "city": rng.choice(["a", "b", "c"], 120),
+    })
+    Y = pd.Series(rng.rand(120) * 100)
+    return X, Y
+
+
+def make_tied_data():
+    # Few distinct values, so tree splits tie and the fits draw from the global RNG
+    rng = np.random.RandomState(1)
+    X = pd.DataFrame({
+        "age": rng.randint(20, 60, 300),
+        "score": rng.randint(0, 5, 300),
+        "other": rng.randint(0, 5, 300),
+        "city": rng.choice(["a", "b", "c"], 300),
+    })
+    Y = pd.Series(rng.rand(300) * 100)
+    return X, Y
+
+
+def run_train_model(tmp_path, n_jobs, data=make_data, **kwargs):
+    X, Y = data()
+    kwargs.setdefault("param_grid", {"max_depth": [2, 4]})
+    with patch("app.services.train_service.ModelDetails.add_record") as mock_add_record:
+        train_model(
+            DecisionTreeModel, X, Y, 1, 1, str(tmp_path / f"models_{n_jobs}"), 3, "satisfaction_score", None,
+            n_iterations=3, n_jobs=n_jobs, **kwargs
+        )
+    return mock_add_record.call_args.args[1]
+
+
+# Card of the sequential train_model before iterations and folds ran in parallel, on
+# make_tied_data with max_depth in [2, 4, None]
+SEQUENTIAL_BASELINE = {
+    "accuracy_results": 0.3333333333333333,
+    "f1_score_results": 0.31356837606837606,
+    "precision_results": 0.30952380952380953,
+    "recall_results": 0.32083333333333336,
+    "split_test": 60,
+}
+
+
+@pytest.mark.parametrize("n_jobs", [1, 4, 8])
+def test_parallel_training_matches_sequential_baseline(tmp_path, n_jobs):
+    card = run_train_model(tmp_path, n_jobs=n_jobs, data=make_tied_data, param_grid={"max_depth": [2, 4, None]})
+
+    for key in ["accuracy_results", "f1_score_results", "precision_results", "recall_results"]:
+        assert card[key]["mean"] == SEQUENTIAL_BASELINE[key]
+    assert card["split_test"] == SEQUENTIAL_BASELINE["split_test"]
+
+
+def test_search_strategy_recorded_in_card(tmp_path):
+    card = run_train_model(tmp_path, n_jobs=2, param_grid=None, search_strategy="randomized", search_n_iter=2)
+
+    assert card["search_strategy"] == "randomized"
+    assert card["search_n_fits"] == 3 * 2 * 5
+
+
+def test_untuned_training_records_no_search(tmp_path):
+    card = run_train_model(tmp_path, n_jobs=1, param_grid=None)
+
+    assert card["search_strategy"] is None
+    assert card["search_n_fits"] == 0
+
+
+@pytest.mark.parametrize("reuse_best_iteration, expected_encodings", [(True, 3), (False, 4)])
+def test_reuse_best_iteration_skips_final_fit(tmp_path, reuse_best_iteration, expected_encodings):
+    from app.services import train_service
+
+    with patch("app.services.train_service.enhance_dataset", wraps=train_service.enhance_dataset) as mock_enhance:
+        card = run_train_model(tmp_path, n_jobs=1, reuse_best_iteration=reuse_best_iteration)
+
+    assert mock_enhance.call_count == expected_encodings
+    assert os.path.exists(card["address"])
+    assert os.path.exists(card["feature_engineering_details_address"])
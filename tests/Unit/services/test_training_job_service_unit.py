@@ -0,0 +1,143 @@
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import patch
+import pytest
+from app.models.AI.training_job import TrainingJob
+from app.models.AI.svm import SVMModel
+from app.models.files.exam_info import ExamDetails
+from app.services.training_job_service import (
+    TrainingJobPool, fail_interrupted_training_jobs, resolve_model_class, run_training_job
+)
+from sqlalchemy.orm import sessionmaker
+
+
+@pytest.fixture
+def queued_job(db_session):
+    db_session.add(ExamDetails(id=1, title="exam", creator_name="me"))
+    db_session.commit()
+    return TrainingJob.create(db_session, "SVM", "satisfaction_score", "satisfaction_score", 3, 7, 1)
+
+
+@pytest.fixture
+def worker_session(db_session, monkeypatch):
+    """Give run_training_job its own sessions on the test database."""
+    monkeypatch.setattr(
+        "app.services.training_job_service.SessionLocal",
+        sessionmaker(bind=db_session.get_bind(), expire_on_commit=False)
+    )
+
+
+def test_create_is_queued(queued_job):
+    assert queued_job.status == TrainingJob.STATUS_QUEUED
+    assert queued_job.model_details_id is None
+    assert queued_job.elapsed_seconds() >= 0
+
+
+def test_resolve_model_class():
+    assert resolve_model_class("SVM") is SVMModel
+    with pytest.raises(ValueError):
+        resolve_model_class("UNKNOWN")
+
+
+@patch("app.services.training_job_service.train_model")
+@patch("app.services.training_job_service.make_dataset")
+def test_run_training_job_done(mock_make_dataset, mock_train_model, db_session, queued_job, worker_session):
+    mock_make_dataset.return_value = ("X", "Y")
+    mock_train_model.return_value = SimpleNamespace(id=42)
+
+    assert run_training_job(queued_job.id, "/models") == 42
+
+    mock_make_dataset.assert_called_once()
+    assert mock_make_dataset.call_args.args[:3] == (7, 1, "satisfaction_score")
+    assert mock_train_model.call_args.args[0] is SVMModel
+
+    job = TrainingJob.find_by_id(db_session, queued_job.id)
+    db_session.refresh(job)
+    assert job.status == TrainingJob.STATUS_DONE
+    assert job.model_details_id == 42
+    assert job.started_at is not None and job.finished_at is not None
+
+
+@patch("app.services.training_job_service.make_dataset", side_effect=ValueError("no rows"))
+def test_run_training_job_failed(mock_make_dataset, db_session, queued_job, worker_session):
+    assert run_training_job(queued_job.id, "/models") is None
+
+    job = TrainingJob.find_by_id(db_session, queued_job.id)
+    db_session.refresh(job)
+    assert job.status == TrainingJob.STATUS_FAILED
+    assert job.error == "no rows"
+
+
+class FakeProcessPool:
+    """Stand-in for ProcessPoolExecutor; the first `broken` pools created are broken."""
+    created = []
+    broken = 0
+
+    def __init__(self, **kwargs):
+        self.is_broken = len(FakeProcessPool.created) < FakeProcessPool.broken
+        self.shut_down = False
+        FakeProcessPool.created.append(self)
+
+    def submit(self, func, *args):
+        if self.is_broken:
+            raise BrokenProcessPool("A child process terminated abruptly")
+        future = Future()
+        future.set_result(None)
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+@pytest.fixture
+def fake_process_pool(monkeypatch):
+    FakeProcessPool.created = []
+    monkeypatch.setattr("app.services.training_job_service.ProcessPoolExecutor", FakeProcessPool)
+    return FakeProcessPool
+
+
+def test_broken_pool_is_replaced_on_submit(db_session, queued_job, worker_session, fake_process_pool):
+    fake_process_pool.broken = 1
+    pool = TrainingJobPool(max_workers=1)
+
+    assert pool.submit(queued_job.id, "/models") is True
+
+    assert len(fake_process_pool.created) == 2
+    assert fake_process_pool.created[0].shut_down
+    assert pool._get_executor() is fake_process_pool.created[1]
+    db_session.refresh(queued_job)
+    assert queued_job.status == TrainingJob.STATUS_QUEUED
+
+
+def test_job_is_failed_when_no_pool_accepts_it(db_session, queued_job, worker_session, fake_process_pool):
+    fake_process_pool.broken = 2
+    pool = TrainingJobPool(max_workers=1)
+
+    assert pool.submit(queued_job.id, "/models") is False
+
+    db_session.refresh(queued_job)
+    assert queued_job.status == TrainingJob.STATUS_FAILED
+    assert "worker pool" in queued_job.error
+
+
+def test_jobs_interrupted_by_a_restart_are_failed(db_session, queued_job, worker_session):
+    running = TrainingJob.create(db_session, "SVM", "satisfaction_score", "satisfaction_score", 3, 7, 1)
+    TrainingJob.mark_running(db_session, running.id)
+    done = TrainingJob.create(db_session, "SVM", "satisfaction_score", "satisfaction_score", 3, 7, 1)
+    TrainingJob.mark_done(db_session, done.id, None)
+    started_at = datetime.now()
+    submitted_after_start = TrainingJob.create(db_session, "SVM", "satisfaction_score", "satisfaction_score", 3, 7, 1)
+
+    assert fail_interrupted_training_jobs(started_at) == 2
+
+    db_session.expire_all()
+    statuses = {job.id: job.status for job in db_session.query(TrainingJob)}
+    assert statuses == {
+        queued_job.id: TrainingJob.STATUS_FAILED,
+        running.id: TrainingJob.STATUS_FAILED,
+        done.id: TrainingJob.STATUS_DONE,
+        submitted_after_start.id: TrainingJob.STATUS_QUEUED,
+    }
+    assert TrainingJob.find_by_id(db_session, queued_job.id).error == "Interrupted by an API restart"
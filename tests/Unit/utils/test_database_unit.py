@@ -0,0 +1,52 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+from app import database
+from app.config import settings
+
+
+@pytest.fixture
+def pool_settings(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 1)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 0)
+    monkeypatch.setattr(settings, "DB_POOL_TIMEOUT", 0.1)
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 0)
+    return settings
+
+
+def test_pool_metrics_count_waits_and_timeouts(tmp_path, pool_settings):
+    engine = database.build_engine(f"sqlite:///{tmp_path / 'pool.db'}")
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        assert database.pool_stats(engine)["in_use"] == 1
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+
+    stats = database.pool_stats(engine)
+    assert stats["pool"] == "MeteredQueuePool"
+    assert (stats["size"], stats["in_use"], stats["idle"]) == (1, 0, 1)
+    assert (stats["checkouts"], stats["waits"], stats["timeouts"]) == (2, 1, 1)
+    assert stats["max_checkout_ms"] >= 100
+
+    # The counters survive the pool being recreated
+    engine.dispose()
+    assert database.pool_stats(engine)["checkouts"] == 2
+
+
+def test_in_memory_sqlite_keeps_default_pool(pool_settings):
+    engine = database.build_engine("sqlite:///:memory:")
+    assert "checkouts" not in database.pool_stats(engine)
+
+
+def test_statement_timeout_interrupts_slow_sqlite_query(tmp_path, pool_settings):
+    pool_settings.DB_STATEMENT_TIMEOUT_MS = 50
+    engine = database.build_engine(f"sqlite:///{tmp_path / 'timeout.db'}")
+    endless = text("WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) SELECT count(*) FROM n")
+
+    with engine.connect() as connection:
+        with pytest.raises(OperationalError, match="interrupted"):
+            connection.execute(endless)
+        connection.rollback()
+        # The connection stays usable for fast statements
+        assert connection.execute(text("SELECT 1")).scalar() == 1
@@ -0,0 +1,87 @@
+import os
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+from app.utils.dataset_cache import DatasetCache
+from app.services.pre_processing_data_service import make_dataset
+
+
+def make_frame():
+    X = pd.DataFrame({
+        "age": [30, 41, 25],
+        "score": [0.5, np.nan, 0.9],
+        "city": ["a", None, "c"],
+    })
+    Y = pd.Series([1.0, 2.0, 3.0], name="satisfaction_score")
+    return X, Y
+
+
+def test_memory_then_disk_hit(tmp_path):
+    cache = DatasetCache(str(tmp_path), max_bytes=10 ** 6, max_entries=4)
+    X, Y = make_frame()
+    cache.put("key", "fp", X, Y)
+
+    cached_X, cached_Y = cache.get("key", "fp")
+    pd.testing.assert_frame_equal(cached_X, X)
+    assert cache.stats()["memory_hits"] == 1
+
+    # A new process starts with an empty memory tier and reads the .npz file
+    cache.clear()
+    disk_X, disk_Y = cache.get("key", "fp")
+    pd.testing.assert_frame_equal(disk_X, X)
+    pd.testing.assert_series_equal(disk_Y, Y)
+    assert cache.stats()["disk_hits"] == 1
+
+
+def test_changed_fingerprint_is_a_miss(tmp_path):
+    cache = DatasetCache(str(tmp_path), max_bytes=10 ** 6, max_entries=4)
+    cache.put("key", "old", *make_frame())
+    cache.clear()
+
+    assert cache.get("key", "new") is None
+    assert not (tmp_path / "key.npz").exists()
+    assert cache.stats()["misses"] == 1
+
+
+def test_fingerprint_follows_files_and_records(tmp_path):
+    path = tmp_path / "features.csv"
+    path.write_text("person_id,x\n1,2\n")
+    records = {1401: [{"job_id": 1, "person_id": 1, "performance_value": 5}]}
+    files = {1401: [str(path)]}
+
+    before = DatasetCache.fingerprint(records, files)
+    assert DatasetCache.fingerprint(records, files) == before
+
+    path.write_text("person_id,x\n1,3\n1,4\n")
+    assert DatasetCache.fingerprint(records, files) != before
+
+    records[1401][0]["performance_value"] = 6
+    assert DatasetCache.fingerprint(records, files) != before
+
+
+def test_fingerprint_prefers_stored_checksum(tmp_path):
+    path = tmp_path / "features.csv"
+    path.write_text("person_id,x\n1,2\n")
+    records = {1401: [{"job_id": 1, "person_id": 1, "performance_value": 5}]}
+    files = {1401: [str(path)]}
+
+    before = DatasetCache.fingerprint(records, files, {str(path): "a" * 64})
+    # Touching the file without changing its recorded content keeps the fingerprint
+    os.utime(path, ns=(0, 0))
+    assert DatasetCache.fingerprint(records, files, {str(path): "a" * 64}) == before
+    assert DatasetCache.fingerprint(records, files, {str(path): "b" * 64}) != before
+
+
+@patch("app.services.pre_processing_data_service.fetch_file_checksums", return_value={})
+@patch("app.services.pre_processing_data_service.fetch_file_data", return_value={1401: []})
+@patch("app.services.pre_processing_data_service.fetch_performance_data",
+       return_value={1401: [{"job_id": 1, "person_id": 1, "performance_value": 5}]})
+@patch("app.services.pre_processing_data_service.process_data")
+def test_make_dataset_reuses_cached_dataset(mock_process_data, mock_performance, mock_files, mock_checksums):
+    mock_process_data.return_value = make_frame()
+
+    first = make_dataset(1, 1, "satisfaction_score", None)
+    second = make_dataset(1, 1, "satisfaction_score", None)
+
+    mock_process_data.assert_called_once()
+    pd.testing.assert_frame_equal(first[0], second[0])
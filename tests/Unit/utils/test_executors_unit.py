@@ -0,0 +1,78 @@
+import asyncio
+import threading
+import pytest
+
+from app.utils.executors import BoundedExecutor
+
+
+def test_run_returns_result_off_the_event_loop_thread():
+    executor = BoundedExecutor("test", max_workers=2)
+    loop_thread = threading.get_ident()
+
+    async def main():
+        return await executor.run(lambda x, y=0: (x + y, threading.get_ident()), 1, y=2)
+
+    value, worker_thread = asyncio.run(main())
+    executor.shutdown()
+
+    assert value == 3
+    assert worker_thread != loop_thread
+    assert executor.stats()["completed"] == 1
+
+
+def test_exceptions_propagate_and_are_counted():
+    executor = BoundedExecutor("test", max_workers=1)
+
+    def boom():
+        raise ValueError("bad input")
+
+    async def main():
+        await executor.run(boom)
+
+    with pytest.raises(ValueError, match="bad input"):
+        asyncio.run(main())
+    executor.shutdown()
+
+    assert executor.stats()["failed"] == 1
+
+
+def test_queue_depth_is_reported():
+    executor = BoundedExecutor("test", max_workers=1)
+    release = threading.Event()
+    snapshots = []
+
+    async def main():
+        first = asyncio.ensure_future(executor.run(release.wait))
+        second = asyncio.ensure_future(executor.run(lambda: None))
+        while executor.stats()["running"] == 0:
+            await asyncio.sleep(0.01)
+        snapshots.append(executor.stats())
+        release.set()
+        await asyncio.gather(first, second)
+
+    asyncio.run(main())
+    executor.shutdown()
+
+    assert snapshots[0]["running"] == 1
+    assert snapshots[0]["queued"] == 1
+    stats = executor.stats()
+    assert stats["queued"] == 0
+    assert stats["running"] == 0
+    assert stats["completed"] == 2
+
+
+def test_executor_reopens_after_shutdown():
+    executor = BoundedExecutor("test", max_workers=1)
+
+    async def main():
+        return await executor.run(lambda: "ok")
+
+    assert asyncio.run(main()) == "ok"
+    executor.shutdown()
+    # A second application startup in the same process reuses the module-level executors
+    assert asyncio.run(main()) == "ok"
+    executor.shutdown()
+
+    stats = executor.stats()
+    assert stats["completed"] == 2
+    assert stats["queued"] == 0
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+from app.utils.feature_transformer import FeatureTransformer
+
+
+FEATURE_DETAILS = {
+    "base_feature": ["age", "score", "gender", "city"],
+    "normalization_params": {"age": {"min": 20, "max": 80}, "score": {"min": 5, "max": 5}},
+    "one_hot_mappings": {"gender": ["F", "M"], "city": ["Tehran", "Shiraz"]},
+    "feature_order": ["age", "score", "gender_F", "gender_M", "city_Tehran", "city_Shiraz"],
+}
+
+
+def pandas_reference(data_df, details):
+    """The per-column pandas pipeline the transformer replaces."""
+    data_df = data_df.copy()
+    for col, params in details["normalization_params"].items():
+        data_df[col] = ((data_df[col] - params['min']) / (params['max'] - params['min'])).fillna(0)
+    for col, categories in details["one_hot_mappings"].items():
+        for category in categories:
+            data_df[f"{col}_{category}"] = (data_df[col] == category).astype(int)
+    data_df = data_df.drop(columns=list(details["one_hot_mappings"].keys()))
+    return data_df.reindex(columns=details["feature_order"], fill_value=0).to_numpy(dtype=float)
+
+
+def test_transform_single_record():
+    transformer = FeatureTransformer.from_details(FEATURE_DETAILS)
+    output = transformer.transform({"age": 50, "score": 5, "gender": "M", "city": "Shiraz"})
+
+    np.testing.assert_array_almost_equal(output, np.array([[0.5, 0.0, 0, 1, 0, 1]]))
+
+
+def test_transform_matches_pandas_pipeline():
+    data_df = pd.DataFrame({
+        "age": [20, 35, np.nan, 80],
+        "score": [5, 5, 5, 5],
+        "gender": ["F", "M", "X", np.nan],
+        "city": ["Tehran", "Shiraz", "Tehran", "Tabriz"],
+    })
+    transformer = FeatureTransformer.from_details(FEATURE_DETAILS)
+
+    expected = pandas_reference(data_df, FEATURE_DETAILS)
+    np.testing.assert_array_almost_equal(transformer.transform(data_df), expected)
+    np.testing.assert_array_almost_equal(transformer.transform(data_df.to_dict(orient='records')), expected)
+
+
+def test_unknown_category_and_missing_columns_are_zero():
+    transformer = FeatureTransformer.from_details(FEATURE_DETAILS)
+    output = transformer.transform([{"age": 80, "gender": "unknown"}])
+
+    np.testing.assert_array_almost_equal(output, np.array([[1.0, 0, 0, 0, 0, 0]]))
+
+
+def test_compiles_once():
+    transformer = FeatureTransformer.from_details(FEATURE_DETAILS)
+    assert transformer.compiled is False
+
+    transformer.transform({"age": 20, "score": 5, "gender": "F", "city": "Tehran"})
+    lookups = transformer.category_positions
+    transformer.transform({"age": 20, "score": 5, "gender": "F", "city": "Tehran"})
+
+    assert transformer.compiled is True
+    assert transformer.category_positions is lookups
+    assert lookups["gender"] == {"F": 2, "M": 3}
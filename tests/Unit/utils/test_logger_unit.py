@@ -0,0 +1,62 @@
+import asyncio
+import logging
+from logging.handlers import QueueHandler
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app import main
+from app.logger import logger, request_logger
+
+
+class CountingRepr:
+    """Counts how often it is turned into a string."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __str__(self):
+        self.calls += 1
+        return "value"
+
+
+def test_records_go_through_the_queue():
+    assert [type(handler) for handler in logger.handlers] == [QueueHandler]
+
+
+def test_filtered_out_messages_are_never_formatted():
+    level = logger.level
+    logger.setLevel(logging.INFO)
+    value = CountingRepr()
+    try:
+        logger.debug("Final input for prediction:\n%s", value)
+    finally:
+        logger.setLevel(level)
+
+    assert value.calls == 0
+
+
+def call_middleware(status_code):
+    request = Request({"type": "http", "method": "GET", "path": "/model/predict", "headers": [], "query_string": b""})
+
+    async def call_next(_):
+        return Response(status_code=status_code)
+
+    return asyncio.run(main.log_requests(request, call_next))
+
+
+def test_request_log_is_sampled_but_server_errors_are_always_logged(monkeypatch, caplog):
+    caplog.set_level(logging.INFO, logger=request_logger.name)
+
+    monkeypatch.setattr(main.settings, "LOG_REQUEST_SAMPLE_RATE", 0.0)
+    call_middleware(200)
+    call_middleware(503)
+    monkeypatch.setattr(main.settings, "LOG_REQUEST_SAMPLE_RATE", 1.0)
+    call_middleware(201)
+
+    records = [record for record in caplog.records if record.name == request_logger.name]
+    assert [record.getMessage().split(" in ")[0] for record in records] == [
+        "GET /model/predict -> 503",
+        "GET /model/predict -> 201",
+    ]
+    assert records[0].levelno == logging.WARNING
@@ -0,0 +1,117 @@
+import os
+import json
+import joblib
+import pytest
+
+from app.utils.model_cache import ModelCache
+from app.utils import predict_helper_method
+from app.utils.predict_helper_method import find_essential_parameter
+from app.models.AI.ModelDetails import ModelDetails
+
+
+def write_artifact(path, size):
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    return str(path)
+
+
+def test_signature_missing_file_is_none(tmp_path):
+    assert ModelCache.artifact_signature(str(tmp_path / "missing.joblib")) is None
+
+
+def test_get_put_hit_and_miss(tmp_path):
+    cache = ModelCache(max_bytes=1000, max_entries=4)
+    path = write_artifact(tmp_path / "m.joblib", 10)
+    signature = ModelCache.artifact_signature(path)
+
+    assert cache.get(1, signature) is None
+    cache.put(1, signature, {"model": "m"})
+    assert cache.get(1, signature) == {"model": "m"}
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["current_bytes"] == 10
+
+
+def test_changed_artifact_invalidates_entry(tmp_path):
+    cache = ModelCache(max_bytes=1000, max_entries=4)
+    path = write_artifact(tmp_path / "m.joblib", 10)
+    cache.put(1, ModelCache.artifact_signature(path), {"model": "old"})
+
+    write_artifact(path, 20)
+    new_signature = ModelCache.artifact_signature(path)
+
+    assert cache.get(1, new_signature) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_lru_eviction_by_bytes(tmp_path):
+    cache = ModelCache(max_bytes=25, max_entries=10)
+    sig_1 = ModelCache.artifact_signature(write_artifact(tmp_path / "1.joblib", 10))
+    sig_2 = ModelCache.artifact_signature(write_artifact(tmp_path / "2.joblib", 10))
+    sig_3 = ModelCache.artifact_signature(write_artifact(tmp_path / "3.joblib", 10))
+
+    cache.put(1, sig_1, {"model": 1})
+    cache.put(2, sig_2, {"model": 2})
+    cache.get(1, sig_1)  # 1 becomes most recently used
+    cache.put(3, sig_3, {"model": 3})
+
+    assert cache.get(2, sig_2) is None
+    assert cache.get(1, sig_1) == {"model": 1}
+    assert cache.get(3, sig_3) == {"model": 3}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_eviction_by_entries(tmp_path):
+    cache = ModelCache(max_bytes=1000, max_entries=1)
+    sig_1 = ModelCache.artifact_signature(write_artifact(tmp_path / "1.joblib", 1))
+    sig_2 = ModelCache.artifact_signature(write_artifact(tmp_path / "2.joblib", 1))
+
+    cache.put(1, sig_1, {"model": 1})
+    cache.put(2, sig_2, {"model": 2})
+
+    assert cache.get(1, sig_1) is None
+    assert cache.get(2, sig_2) == {"model": 2}
+
+
+def test_oversized_entry_is_not_cached(tmp_path):
+    cache = ModelCache(max_bytes=5, max_entries=4)
+    signature = ModelCache.artifact_signature(write_artifact(tmp_path / "big.joblib", 10))
+    cache.put(1, signature, {"model": "big"})
+    assert cache.stats()["entries"] == 0
+
+
+class DummyModelCard:
+    def __init__(self, feature_engineering_details_address, address):
+        self.feature_engineering_details_address = feature_engineering_details_address
+        self.address = address
+        self.name_object_predict = "dummy_predict"
+        self.number_of_labels = 3
+
+
+class DummyModel:
+    pass
+
+
+def test_find_essential_parameter_loads_model_once(monkeypatch, tmp_path):
+    json_file = tmp_path / "feature.json"
+    with open(json_file, "w") as f:
+        json.dump({"base_feature": [], "normalization_params": {}, "one_hot_mappings": {}, "feature_order": []}, f)
+    model_file = tmp_path / "model.joblib"
+    joblib.dump(DummyModel(), model_file)
+
+    card = DummyModelCard(str(json_file), str(model_file))
+    monkeypatch.setattr(ModelDetails, "find_model_by_id", lambda db, model_id: card)
+    monkeypatch.setattr(predict_helper_method, "model_cache", ModelCache(max_bytes=10**6, max_entries=4))
+
+    calls = []
+    real_load = joblib.load
+    monkeypatch.setattr(joblib, "load", lambda path: calls.append(path) or real_load(path))
+
+    first = find_essential_parameter(7, db={})
+    second = find_essential_parameter(7, db={})
+
+    assert len(calls) == 1
+    assert first["model"] is second["model"]
+    assert predict_helper_method.model_cache.stats()["hits"] == 1
@@ -15,33 +15,33 @@ def test_get_prediction_range():
 
 
 # Test when the model card is missing or invalid
-# def test_find_model_invalid_json():
-#     with patch("app.utils.model_loader.load_json", return_value=None):
-#         with pytest.raises(Exception, match="There is no model card."):
-#             find_model("invalid_path.json")
-
-
-# # Test when required information is missing in the model card
-# def test_find_model_incomplete_json():
-#     incomplete_json = {
-#         "architecture": "DecisionTree",  # Missing other required fields
-#     }
-#     with patch("app.utils.model_loader.load_json", return_value=incomplete_json):
-#         with pytest.raises(Exception, match="The information about this model is not complete!"):
-#             find_model("incomplete_model.json")
-
-
-# # Test when an unsupported architecture type is provided
-# def test_find_model_unsupported_architecture():
-#     unsupported_json = {
-#         "architecture": "RandomForest",
-#         "address": "/path/to/model",
-#         "number_of_labels": 3,
-#         "num_features": 10
-#     }
-#     with patch("app.utils.model_loader.load_json", return_value=unsupported_json):
-#         with pytest.raises(Exception, match="The architecture name RandomForest is unfamiliar"):
-#             find_model("unsupported_architecture.json")
+def test_find_model_invalid_json():
+    with patch("app.utils.model_loader.load_json", return_value=None):
+        with pytest.raises(Exception, match="There is no model card."):
+            find_model("invalid_path.json")
+
+
+# Test when required information is missing in the model card
+def test_find_model_incomplete_json():
+    incomplete_json = {
+        "architecture": "DecisionTree",  # Missing other required fields
+    }
+    with patch("app.utils.model_loader.load_json", return_value=incomplete_json):
+        with pytest.raises(Exception, match="The information about this model is not complete!"):
+            find_model("incomplete_model.json")
+
+
+# Test when an unsupported architecture type is provided
+def test_find_model_unsupported_architecture():
+    unsupported_json = {
+        "architecture": "RandomForest",
+        "address": "/path/to/model",
+        "number_of_labels": 3,
+        "num_features": 10
+    }
+    with patch("app.utils.model_loader.load_json", return_value=unsupported_json):
+        with pytest.raises(Exception, match="The architecture name RandomForest is unfamiliar"):
+            find_model("unsupported_architecture.json")
 
 
 # Test for valid DecisionTree model loading
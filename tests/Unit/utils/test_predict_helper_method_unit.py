@@ -1,12 +1,13 @@
 # test_unit_functions.py
 import json
+import time
 import joblib
 import pandas as pd
 import pytest
 from pathlib import Path
 
 # Import the functions to test:
-from app.utils.predict_helper_method import find_person_feature_last_exam, find_essential_parameter
+from app.utils.predict_helper_method import find_person_feature_last_exam, find_persons_feature_last_exam, find_essential_parameter
 from app.models.AI.ModelDetails import ModelDetails  # For monkeypatching
 
 # ---------------------------
@@ -50,6 +51,59 @@ def test_find_person_feature_not_found(monkeypatch):
     assert found is False
     assert data == {}
 
+def test_find_person_feature_falls_back_to_csv_when_sidecar_goes_stale(monkeypatch):
+    import numpy as np
+    from app.utils import predict_helper_method
+    monkeypatch.setattr(pd, "read_csv", fake_read_csv)
+    # The sidecar was up to date for open_columns but replaced before read_rows
+    monkeypatch.setattr(predict_helper_method, "open_columns", lambda path, columns: {"person_id": np.array([1, 2])})
+    monkeypatch.setattr(predict_helper_method, "read_rows", lambda path, rows: None)
+
+    data, found = find_person_feature_last_exam(1, {2022: ["file1.csv"]})
+    assert found is True
+    assert data["value"] == 10
+
+def test_find_persons_feature_batch(monkeypatch):
+    calls = []
+    def counting_read_csv(file_path):
+        calls.append(file_path)
+        return fake_read_csv(file_path)
+    monkeypatch.setattr(pd, "read_csv", counting_read_csv)
+    files_by_year = {2022: ["file1.csv"], 2021: ["file2.csv"]}
+
+    persons_df, not_found = find_persons_feature_last_exam([1, 3, 5], files_by_year)
+    assert sorted(persons_df["person_id"].tolist()) == [1, 3]
+    assert persons_df.set_index("person_id").loc[3, "value"] == 30
+    assert not_found == [5]
+    # each file is read at most once
+    assert calls == ["file1.csv", "file2.csv"]
+
+def test_find_persons_feature_stops_when_all_found(monkeypatch):
+    calls = []
+    def counting_read_csv(file_path):
+        calls.append(file_path)
+        return fake_read_csv(file_path)
+    monkeypatch.setattr(pd, "read_csv", counting_read_csv)
+    files_by_year = {2022: ["file1.csv"], 2021: ["file2.csv"]}
+
+    persons_df, not_found = find_persons_feature_last_exam([1, 2], files_by_year)
+    assert len(persons_df) == 2
+    assert not_found == []
+    assert calls == ["file1.csv"]
+
+def test_find_persons_feature_all_persons_newest_wins(monkeypatch):
+    def read_csv(file_path):
+        if file_path == "new.csv":
+            return pd.DataFrame({"person_id": [1], "value": [100]})
+        return pd.DataFrame({"person_id": [1, 2], "value": [10, 20]})
+    monkeypatch.setattr(pd, "read_csv", read_csv)
+    files_by_year = {1402: ["new.csv"], 1401: ["old.csv"]}
+
+    persons_df, not_found = find_persons_feature_last_exam(None, files_by_year)
+    values = persons_df.set_index("person_id")["value"].to_dict()
+    assert values == {1: 100, 2: 20}
+    assert not_found == []
+
 # ---------------------------
 # Unit Tests for find_essential_parameter
 # ---------------------------
@@ -171,3 +225,40 @@ def test_find_essential_parameter_joblib_other_error(monkeypatch, tmp_path):
     
     with pytest.raises(RuntimeError, match="An error occurred while loading the model"):
         find_essential_parameter(1, db={})
+
+
+def test_find_essential_parameter_coalesces_concurrent_loads(monkeypatch, tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+    from app.utils import predict_helper_method
+    from app.utils.model_cache import model_cache
+
+    json_file = tmp_path / "dummy_feature.json"
+    json_file.write_text(json.dumps({"base_feature": [], "normalization_params": {}, "one_hot_mappings": {}, "feature_order": []}))
+    model_file = tmp_path / "dummy_model.joblib"
+    model_file.write_bytes(b"model")
+    dummy_card = DummyModelCard(str(json_file), str(model_file), "dummy_predict", 3)
+    monkeypatch.setattr(ModelDetails, "find_model_by_id", lambda db, model_id: dummy_card)
+
+    loads = []
+    coalesced_before = predict_helper_method.model_loads.stats()["coalesced"]
+
+    def slow_load(path):
+        # Hold the load until the second caller is waiting on it
+        for _ in range(500):
+            if predict_helper_method.model_loads.stats()["coalesced"] > coalesced_before:
+                break
+            time.sleep(0.01)
+        loads.append(path)
+        return DummyModel()
+
+    monkeypatch.setattr(joblib, "load", slow_load)
+    model_cache.invalidate(4242)
+    try:
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            results = list(pool.map(lambda _: find_essential_parameter(4242, db={}), range(2)))
+    finally:
+        model_cache.invalidate(4242)
+
+    assert len(loads) == 1
+    assert results[0]["model"] is results[1]["model"]
+    assert results[0] is not results[1]
@@ -0,0 +1,190 @@
+import asyncio
+import numpy as np
+import pytest
+from unittest.mock import Mock
+
+from app.utils.executors import BoundedExecutor
+from app.utils.prediction_batcher import Histogram, PredictionBatcher
+
+
+def make_batcher(window_seconds=0.05, max_batch_size=8):
+    calls = []
+
+    def predict_many(name_object_predict, rows, model_id, db):
+        calls.append((model_id, [row["x"] for row in rows]))
+        if any(row["x"] < 0 for row in rows):
+            raise ValueError("negative input")
+        return [f"{model_id}:{row['x']}" for row in rows]
+
+    def predict_one(name_object_predict, row, model_id, db):
+        return predict_many(name_object_predict, [row], model_id, db)[0]
+
+    executor = BoundedExecutor("test", max_workers=2)
+    batcher = PredictionBatcher(executor, True, window_seconds, max_batch_size, predict_one, predict_many, Mock)
+    return batcher, executor, calls
+
+
+def test_concurrent_requests_share_one_predict_per_model():
+    batcher, executor, calls = make_batcher()
+
+    async def main():
+        return await asyncio.gather(*(
+            batcher.predict("target", {"x": x}, model_id) for model_id in (1, 2) for x in range(3)
+        ))
+
+    results = asyncio.run(main())
+    executor.shutdown()
+
+    assert results == ["1:0", "1:1", "1:2", "2:0", "2:1", "2:2"]
+    assert sorted(calls) == [(1, [0, 1, 2]), (2, [0, 1, 2])]
+    stats = batcher.stats()
+    assert stats["batch_size"]["count"] == 2 and stats["batch_size"]["sum"] == 6
+    assert stats["queue_wait_ms"]["count"] == 6
+    assert stats["open_batches"] == 0
+
+
+def test_full_batch_runs_without_waiting_for_the_window():
+    batcher, executor, calls = make_batcher(window_seconds=60, max_batch_size=2)
+
+    async def main():
+        return await asyncio.wait_for(
+            asyncio.gather(*(batcher.predict("target", {"x": x}, 1) for x in range(4))), timeout=5
+        )
+
+    assert asyncio.run(main()) == ["1:0", "1:1", "1:2", "1:3"]
+    executor.shutdown()
+    assert calls == [(1, [0, 1]), (1, [2, 3])]
+
+
+def test_failed_batch_falls_back_to_one_predict_per_request():
+    batcher, executor, calls = make_batcher()
+
+    async def main():
+        return await asyncio.gather(
+            batcher.predict("target", {"x": 1}, 1),
+            batcher.predict("target", {"x": -1}, 1),
+            return_exceptions=True
+        )
+
+    ok, error = asyncio.run(main())
+    executor.shutdown()
+
+    assert ok == "1:1"
+    assert isinstance(error, ValueError)
+    assert calls == [(1, [1, -1]), (1, [1]), (1, [-1])]
+    assert batcher.stats()["fallbacks"] == 1
+
+
+def test_each_batch_runs_on_its_own_session():
+    sessions = []
+
+    def session_factory():
+        sessions.append(Mock())
+        return sessions[-1]
+
+    seen = []
+
+    def predict_many(name_object_predict, rows, model_id, db):
+        seen.append(db)
+        return ["ok"] * len(rows)
+
+    executor = BoundedExecutor("test", max_workers=2)
+    batcher = PredictionBatcher(executor, True, 0.05, 8, None, predict_many, session_factory)
+
+    async def main():
+        return await asyncio.gather(*(batcher.predict("target", {"x": x}, model_id) for model_id in (1, 2) for x in range(2)))
+
+    assert asyncio.run(main()) == ["ok"] * 4
+    executor.shutdown()
+    assert len(sessions) == 2 and sorted(map(id, seen)) == sorted(map(id, sessions))
+    for session in sessions:
+        session.close.assert_called_once()
+
+
+def test_request_missing_a_feature_fails_alone_in_a_batch(mocker):
+    """A request missing a feature must not be filled in from another request of its batch."""
+    mock_model = mocker.Mock()
+    mock_model.predict.side_effect = lambda model_input: np.zeros(len(model_input))
+    mocker.patch(
+        'app.services.prediction_service.find_essential_parameter',
+        return_value={
+            "name_object_predict_in_card": "target",
+            "base_feature": ["age", "dept"],
+            "normalization_params": {"age": {"min": 20, "max": 80}, "dept": {"min": 0, "max": 4}},
+            "one_hot_mappings": {},
+            "feature_order": ["age", "dept"],
+            "model": mock_model,
+            "number_of_labels": 4,
+        }
+    )
+    executor = BoundedExecutor("test", max_workers=2)
+    batcher = PredictionBatcher(executor, True, 0.05, 8, session_factory=Mock)
+
+    async def main():
+        return await asyncio.gather(
+            batcher.predict("target", {"dept": 1}, 1),
+            batcher.predict("target", {"age": 30, "dept": 1}, 1),
+            return_exceptions=True
+        )
+
+    error, ok = asyncio.run(main())
+    executor.shutdown()
+
+    assert isinstance(error, ValueError) and "missing the required feature: age" in str(error)
+    assert ok == "0 تا 25"
+    assert batcher.stats()["fallbacks"] == 1
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram([1, 5])
+    for value in (0.5, 1, 3, 10):
+        histogram.observe(value)
+
+    assert histogram.snapshot() == {"count": 4, "sum": 14.5, "buckets": {"1": 2, "5": 3, "+Inf": 4}}
+
+
+def test_batch_failure_gives_each_caller_its_own_error():
+    def broken_session_factory():
+        raise ConnectionError("database unavailable")
+
+    executor = BoundedExecutor("test", max_workers=2)
+    batcher = PredictionBatcher(executor, True, 0.05, 8, None, None, broken_session_factory)
+
+    async def main():
+        return await asyncio.gather(*(batcher.predict("target", {"x": x}, 1) for x in range(3)), return_exceptions=True)
+
+    errors = asyncio.run(main())
+    executor.shutdown()
+
+    assert all(isinstance(error, RuntimeError) for error in errors)
+    assert len({id(error) for error in errors}) == 3
+    assert len({id(error.__cause__) for error in errors}) == 1
+    assert isinstance(errors[0].__cause__, ConnectionError)
+
+
+def test_running_batches_are_referenced_until_done():
+    release = asyncio.Event()
+    snapshots = []
+
+    async def main():
+        batcher, executor, _ = make_batcher()
+        original_run = batcher._run
+
+        async def slow_run(key, batch):
+            snapshots.append(len(batcher._tasks))
+            await release.wait()
+            await original_run(key, batch)
+
+        batcher._run = slow_run
+        pending = asyncio.ensure_future(batcher.predict("target", {"x": 1}, 1))
+        while not snapshots:
+            await asyncio.sleep(0.01)
+        release.set()
+        result = await pending
+        executor.shutdown()
+        return result, len(batcher._tasks)
+
+    result, tasks_left = asyncio.run(asyncio.wait_for(main(), timeout=5))
+    assert result == "1:1"
+    assert snapshots == [1]
+    assert tasks_left == 0
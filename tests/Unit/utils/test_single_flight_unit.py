@@ -0,0 +1,53 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+
+from app.utils.single_flight import SingleFlight
+
+
+def run_concurrently(flight, key, func, callers=4):
+    """Start callers threads on flight.do(key, func) and release func once all are waiting."""
+    release = threading.Event()
+
+    def blocking():
+        release.wait(5)
+        return func()
+
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        futures = [pool.submit(flight.do, key, blocking) for _ in range(callers)]
+        while flight.stats()["coalesced"] < callers - 1:
+            threading.Event().wait(0.001)
+        release.set()
+        return [future.exception() or future.result() for future in futures]
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight("test")
+    calls = []
+
+    results = run_concurrently(flight, "model-1", lambda: calls.append(1) or {"loaded": True})
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert flight.stats() == {"name": "test", "in_flight": 0, "executed": 1, "coalesced": 3}
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    flight = SingleFlight("test")
+
+    def boom():
+        raise FileNotFoundError("model file missing")
+
+    errors = run_concurrently(flight, "model-1", boom)
+    assert all(isinstance(error, FileNotFoundError) for error in errors)
+
+    # The failure is not remembered: the next call runs again
+    assert flight.do("model-1", lambda: "loaded") == "loaded"
+    assert flight.stats()["executed"] == 2
+
+
+def test_different_keys_do_not_wait_on_each_other():
+    flight = SingleFlight("test")
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("b", lambda: 2) == 2
+    assert flight.stats()["coalesced"] == 0
@@ -3,6 +3,8 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.models.files.exam_info import ExamDetails
 from app.models.files.data_file import DataFile
+from app.models.files.person_row_index import PersonRowIndex
+from app.models.AI.training_job import TrainingJob
 from app.models.AI.ModelDetails import ModelDetails
 from app.models.class_a import ClassA
 from app.models.class_b import ClassB
@@ -18,7 +20,7 @@ TestingSessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
 def db_session():
     """Fixture to create and drop the database for each test."""
     # Create tables in the correct order
-    Base.metadata.create_all(engine, tables=[ ClassA.__table__, ClassB.__table__,ExamDetails.__table__, DataFile.__table__, ModelDetails.__table__])
+    Base.metadata.create_all(engine, tables=[ ClassA.__table__, ClassB.__table__,ExamDetails.__table__, DataFile.__table__, PersonRowIndex.__table__, ModelDetails.__table__, TrainingJob.__table__])
 
     # Create a new session
     session = TestingSessionLocal()
@@ -32,3 +34,13 @@ def db_session():
 
     # Drop all tables after the test
     Base.metadata.drop_all(engine)
+
+
+@pytest.fixture(autouse=True)
+def isolated_dataset_cache(tmp_path, monkeypatch):
+    """Keep cached training datasets inside the test's temporary directory."""
+    from app.utils.dataset_cache import dataset_cache
+    monkeypatch.setattr(dataset_cache, "directory", str(tmp_path / "dataset_cache"))
+    dataset_cache.clear()
+    yield
+    dataset_cache.clear()
@@ -0,0 +1,191 @@
+import asyncio
+from datetime import datetime
+import pytest
+from khayyam import JalaliDatetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app import database
+from app.database import Base, AsyncSessionLocal, build_async_engine, to_async_url
+from app.models.AI.ModelDetails import ModelDetails, ModelSortField
+from app.models.files.data_file import DataFile
+from app.models.files.exam_info import ExamDetails
+from app.models.job_performance.job_performance import JobPerformance
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    """A file SQLite database with sample rows, shared by a sync and an async engine."""
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+
+    db.add(ExamDetails(id=1, title="exam", creator_name="me"))
+    for year in (1401, 1402):
+        db.add(DataFile(name=f"{year}.csv", path=f"/data/{year}.csv",
+                        created_at=JalaliDatetime(year, 1, 1).todatetime(), exam_id=1))
+    for person_id, (job_id, year) in enumerate([(1, 1401), (1, 1402), (2, 1402)], start=1):
+        db.add(JobPerformance(person_id=person_id, job_efficiency_rank=10 * person_id, improvement_rank=1,
+                              satisfaction_score=2, job_id=job_id, created_at=JalaliDatetime(year, 2, 1).todatetime()))
+    for version, name in (("1.0", "satisfaction_score"), ("1.1", "improvement_rank")):
+        db.add(ModelDetails(
+            name_object_predict=name, address="model.joblib", feature_engineering_details_address="fe.json",
+            architecture="SVM", accuracy_results={"mean": 0.9}, f1_score_results={}, precision_results={},
+            recall_results={}, t_test_results_accuracy={}, t_test_results_f1_score={},
+            confidence_level_accuracy=0.95, confidence_level_f1_score=0.95, num_all_samples=10, num_features=3,
+            split_test=0.2, n_splits_t_test=5, number_of_labels=3, model_evaluation_date=datetime(2024, 1, 1),
+            version=version, exam_id=1, job_id=7
+        ))
+    db.commit()
+    db.close()
+    engine.dispose()
+    return url
+
+
+def run_async(url, query):
+    """Run query(async_session) on a fresh async engine and return its result."""
+    async def run():
+        engine = build_async_engine(url)
+        try:
+            async with AsyncSessionLocal(bind=engine) as db:
+                return await query(db)
+        finally:
+            await engine.dispose()
+    return asyncio.run(run())
+
+
+def test_async_url_uses_asyncio_drivers():
+    assert to_async_url("sqlite:///app.db").drivername == "sqlite+aiosqlite"
+    assert to_async_url("postgresql://u:p@db:5432/app").drivername == "postgresql+asyncpg"
+    assert to_async_url("postgresql+psycopg2://u:p@db/app").drivername == "postgresql+asyncpg"
+    with pytest.raises(ValueError):
+        to_async_url("mysql://u:p@db/app")
+
+
+def test_async_queries_match_sync_versions(database_url):
+    sync_db = sessionmaker(bind=create_engine(database_url))()
+
+    async def queries(db):
+        return (
+            await ModelDetails.find_model_by_id_async(db, 1),
+            await ModelDetails.find_models_by_exam_and_job_id_async(db, 1, 7),
+            await ModelDetails.find_models_by_exam_and_job_id_object_predict_async(db, 1, 7, "improvement_rank"),
+            await ExamDetails.get_exam_list_async(db),
+            await DataFile.get_files_by_exam_id_async(db, 1),
+            await JobPerformance.get_performance_by_job_and_date_async(db, 1, "job_efficiency_rank"),
+            await JobPerformance.get_performance_by_jobs_and_date_async(db, [1, 2], "job_efficiency_rank"),
+            await JobPerformance.get_performance_by_person_and_year_async(db, 3, 1402),
+        )
+
+    (model, models, filtered, exams, files, by_job, by_jobs, by_person) = run_async(database_url, queries)
+
+    assert model.version == "1.0"
+    assert [m.version for m in models] == [m.version for m in ModelDetails.find_models_by_exam_and_job_id(sync_db, 1, 7)]
+    assert [m.version for m in filtered] == ["1.1"]
+    assert [tuple(row) for row in exams] == [tuple(row) for row in ExamDetails.get_exam_list(sync_db)]
+    assert files == DataFile.get_files_by_exam_id(sync_db, 1) == {1401: ["/data/1401.csv"], 1402: ["/data/1402.csv"]}
+    assert by_job == JobPerformance.get_performance_by_job_and_date(sync_db, 1, "job_efficiency_rank")
+    assert by_jobs == JobPerformance.get_performance_by_jobs_and_date(sync_db, [1, 2], "job_efficiency_rank")
+    assert by_person == JobPerformance.get_performance_by_person_and_year(sync_db, 3, 1402)
+    assert by_jobs[1402] == [
+        {"job_id": 1, "person_id": 2, "performance_value": 20.0},
+        {"job_id": 2, "person_id": 3, "performance_value": 30.0},
+    ]
+    sync_db.close()
+
+
+def test_async_getter_rejects_unknown_metric(database_url):
+    with pytest.raises(ValueError):
+        run_async(database_url, lambda db: JobPerformance.get_performance_by_job_and_date_async(db, 1, "salary"))
+
+
+def test_get_async_db_uses_lazy_engine(database_url, monkeypatch):
+    monkeypatch.setattr(database, "DATABASE_URL", database_url)
+    monkeypatch.setattr(database, "_async_engine", None)
+
+    async def fetch():
+        sessions = database.get_async_db()
+        db = await sessions.__anext__()
+        try:
+            return await ExamDetails.get_exam_list_async(db), database.async_pool_stats()
+        finally:
+            await sessions.aclose()
+            await database.dispose_async_engine()
+
+    exams, stats = asyncio.run(fetch())
+    assert [tuple(row) for row in exams] == [(1, "exam")]
+    assert stats["pool"] == "MeteredAsyncQueuePool" and stats["checkouts"] >= 1
+    assert database.async_pool_stats() is None
+
+
+@pytest.mark.parametrize("order_by", list(ModelSortField))
+@pytest.mark.parametrize("descending", [False, True])
+def test_search_models_pages_by_keyset(database_url, order_by, descending):
+    engine = create_engine(database_url)
+    db = sessionmaker(bind=engine)()
+    accuracies = [0.7, None, 0.95, 0.7, 0.8]
+    for i, accuracy in enumerate(accuracies):
+        db.add(ModelDetails(
+            name_object_predict="job_performance", address="model.joblib", feature_engineering_details_address="fe.json",
+            architecture="SVM", accuracy_results={"mean": accuracy, "std": 0.1}, f1_score_results={"mean": 0.5},
+            precision_results={}, recall_results={}, t_test_results_accuracy={}, t_test_results_f1_score={},
+            confidence_level_accuracy=None, confidence_level_f1_score=None, num_all_samples=10, num_features=3,
+            split_test=0.2, n_splits_t_test=5, number_of_labels=3, model_evaluation_date=datetime(2024, 3, 5 - i % 3),
+            version=f"2.{i}", exam_id=1, job_id=8
+        ))
+    db.commit()
+    models = ModelDetails.find_models_by_exam_and_job_id(db, 1, 8)
+    db.close()
+    engine.dispose()
+
+    def sort_value(model):
+        if order_by == ModelSortField.ID:
+            return model.id
+        if order_by == ModelSortField.EVALUATION_DATE:
+            return model.model_evaluation_date
+        mean = getattr(model, f"{order_by.value}_results").get("mean")
+        return -1.0 if mean is None else mean
+
+    expected = sorted(((sort_value(m), m.id) for m in models), reverse=descending)
+
+    async def all_pages(db):
+        pages, after = [], None
+        while True:
+            rows = await ModelDetails.search_models_async(
+                db, [ModelDetails.version.label("version")], job_id=8,
+                order_by=order_by, descending=descending, after=after, limit=2
+            )
+            pages.append(rows)
+            if len(rows) < 2:
+                return pages
+            after = (rows[-1].sort_key, rows[-1].id)
+
+    pages = run_async(database_url, all_pages)
+    assert [len(rows) for rows in pages] == [2, 2, 1]
+    assert [row.id for rows in pages for row in rows] == [model_id for _, model_id in expected]
+    assert set(pages[0][0]._mapping) == {"version", "id", "sort_key"}
+
+
+def test_model_search_pages_only_on_request(database_url):
+    from fastapi import Response
+    from app.api.search_model import NEXT_CURSOR_HEADER, search_models_page
+
+    async def search(db, limit=None, cursor=None):
+        response = Response()
+        rows = await search_models_page(
+            db, response, "model_id,version", limit, ModelSortField.ID, False, cursor, job_id=7
+        )
+        return rows, response.headers.get(NEXT_CURSOR_HEADER)
+
+    async def pages(db):
+        everything = await search(db)
+        first = await search(db, limit=1)
+        second = await search(db, cursor=first[1])
+        return everything, first, second
+
+    everything, first, second = run_async(database_url, pages)
+    # Without limit or cursor, every model is returned and no cursor is sent
+    assert [row["version"] for row in everything[0]] == ["1.0", "1.1"]
+    assert everything[1] is None
+    assert [row["version"] for row in first[0]] == ["1.0"] and first[1]
+    assert [row["version"] for row in second[0]] == ["1.1"] and second[1] is None
@@ -0,0 +1,82 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.models.job_performance.job_performance import JobPerformance
+from app.services.job_performance_ingest_service import ingest_performances, parse_performance_csv
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    """In-memory SQLite database with every table, dropped after the test."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(engine)
+
+
+def record(person_id, created_at="1402/01/01", score=50, job_id=1):
+    return {
+        "person_id": person_id,
+        "job_efficiency_rank": score,
+        "improvement_rank": score,
+        "satisfaction_score": score,
+        "job_id": job_id,
+        "created_at": created_at,
+    }
+
+
+def test_ingest_inserts_then_updates(db_session):
+    result = ingest_performances(db_session, [record(1), record(2), record(1, "1403/05/10")])
+    assert (result["inserted"], result["updated"], result["rejected"]) == (3, 0, 0)
+
+    result = ingest_performances(db_session, [record(1, "1402/12/29", score=90, job_id=2), record(3)])
+    assert (result["inserted"], result["updated"], result["rejected"]) == (1, 1, 0)
+
+    rows = db_session.query(JobPerformance).filter_by(person_id=1, jalali_year=1402).all()
+    assert len(rows) == 1
+    assert rows[0].satisfaction_score == 90
+    assert rows[0].job_id == 2
+    assert db_session.query(JobPerformance).count() == 4
+
+
+def test_ingest_reports_rejected_rows(db_session):
+    records = [
+        record(1),
+        record(2, score=101),
+        record(3, created_at="not a date"),
+        {**record(4), "person_id": "abc"},
+        {**record(5), "job_id": 1.5},
+        record(1, "1402/06/01"),  # Same person and year as the first row
+    ]
+    result = ingest_performances(db_session, records)
+
+    assert (result["inserted"], result["rejected"]) == (1, 5)
+    rejects = {reject["row"]: reject["errors"] for reject in result["rejects"]}
+    assert sorted(rejects) == [1, 2, 3, 4, 5]
+    assert len(rejects[1]) == 3  # Every metric is out of bounds
+    assert "created_at" in rejects[2][0]
+    assert "person_id" in rejects[3][0]
+    assert "job_id must be an integer" in rejects[4]
+    assert "same Jalali year" in rejects[5][0]
+    assert db_session.query(JobPerformance).count() == 1
+
+
+def test_ingest_csv(db_session):
+    content = (
+        "person_id,job_efficiency_rank,improvement_rank,satisfaction_score,job_id,created_at\n"
+        "1,10,20,30,1,1401-01-01\n"
+        "2,,20,30,1,1401-01-01\n"
+    ).encode()
+    result = ingest_performances(db_session, parse_performance_csv(content))
+    assert (result["inserted"], result["rejected"]) == (1, 1)
+    assert result["rejects"][0]["row"] == 1
+
+
+def test_ingest_requires_every_column(db_session):
+    with pytest.raises(ValueError, match="created_at"):
+        ingest_performances(db_session, [{key: value for key, value in record(1).items() if key != "created_at"}])